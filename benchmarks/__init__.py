@@ -0,0 +1,16 @@
+# coding: utf-8
+"""
+Benchmark suite of GeLaTo.
+
+The cases (see benchmarks.cases) cover the construction of the 1d symbols,
+gelatize on the forms of the tests, GltExpr.__call__ and the numeric
+sampling of symbols. The wall time and the peak memory of every case are
+written to a JSON file, and two files can be compared, e.g. before and after
+a commit.
+
+Usage::
+
+  python3 -m benchmarks list [-k 'gelatize/2d/*']
+  python3 -m benchmarks run [-k 'symbols/*'] [-o results.json] [--repeat 3] [--slow]
+  python3 -m benchmarks compare base.json new.json [--threshold 1.2]
+"""
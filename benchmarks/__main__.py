@@ -0,0 +1,89 @@
+# coding: utf-8
+"""
+Command line of the benchmark suite, see benchmarks.
+
+The disk cache of the symbol tables is disabled while running the cases,
+unless GELATO_DISK_CACHE is set, so that the timings do not depend on
+previous runs.
+"""
+
+import argparse
+import os
+import sys
+
+#==============================================================================
+def _list(args):
+    from .harness import get_cases
+
+    for case in get_cases(args.k, slow=True):
+        print('{}{}'.format(case.name, ' (slow)' if case.slow else ''))
+
+    return 0
+
+def _run(args):
+    os.environ.setdefault('GELATO_DISK_CACHE', '0')
+
+    from .harness import get_cases, run, save
+
+    cases = get_cases(args.k, slow=args.slow)
+    if not cases:
+        print('no benchmark matches {}'.format(args.k))
+        return 1
+
+    results = run(cases, repeat=args.repeat)
+
+    if args.o:
+        save(results, args.o)
+        print('results written to {}'.format(args.o))
+
+    return 0
+
+def _compare(args):
+    from .harness import load, compare
+
+    rows, regressions = compare(load(args.base), load(args.new),
+                                threshold=args.threshold)
+
+    print('{:<48s} {:>8s} {:>8s}'.format('case', 'time', 'memory'))
+    for name, t, m in rows:
+        flag = ' <' if name in regressions else ''
+        print('{:<48s} {:>8.2f} {:>8.2f}{}'.format(name, t, m, flag))
+
+    if regressions:
+        print('{} regression(s) above {}'.format(len(regressions), args.threshold))
+        return 1
+
+    return 0
+
+#==============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python3 -m benchmarks',
+                                     description='Benchmark suite of GeLaTo.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    p = commands.add_parser('list', help='list the cases')
+    p.add_argument('-k', nargs='+', metavar='PATTERN',
+                   help='fnmatch patterns of the case names')
+    p.set_defaults(func=_list)
+
+    p = commands.add_parser('run', help='run the cases')
+    p.add_argument('-k', nargs='+', metavar='PATTERN',
+                   help='fnmatch patterns of the case names')
+    p.add_argument('-o', metavar='FILE', help='JSON results file')
+    p.add_argument('--repeat', type=int, default=3)
+    p.add_argument('--slow', action='store_true', help='include the slow cases')
+    p.set_defaults(func=_run)
+
+    p = commands.add_parser('compare', help='compare two results files')
+    p.add_argument('base')
+    p.add_argument('new')
+    p.add_argument('--threshold', type=float, default=1.2,
+                   help='ratio of time or memory reported as a regression')
+    p.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,237 @@
+# coding: utf-8
+"""
+The benchmark cases. Every case builds its inputs in its setup function and
+returns the function to measure, see benchmarks.harness.
+
+The names are grouped as
+
+    symbols/<name>/p=<p>             construction of the 1d symbols
+    gelatize/<dim>d/<form>/<variant> gelatize on the forms of the tests
+    call/<dim>d/<form>               GltExpr.__call__ in a loop
+    numeric/<name>                   numeric sampling on large grids
+"""
+
+import numpy as np
+
+from sympy import Symbol
+
+from sympde.core import Constant
+from sympde.calculus import grad, dot, div, inner
+from sympde.topology import dx1, dx2
+from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import Mapping, PolarMapping
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+from gelato import gelatize, GltExpr
+from gelato import Mass, Stiffness, Advection
+from gelato import iter_symbol_parts
+from gelato.numeric import glt_symbol, sample_fourier_grid
+
+from .harness import benchmark
+
+#==============================================================================
+# SYMBOLS
+#==============================================================================
+P_MAX = 20
+
+def _symbol_case(cls, p):
+    def setup():
+        t = Symbol('t')
+        return lambda: cls(p, t)
+
+    return setup
+
+for _cls in [Mass, Stiffness, Advection]:
+    for _p in range(1, P_MAX+1):
+        benchmark('symbols/{}/p={}'.format(_cls.__name__.lower(), _p))(_symbol_case(_cls, _p))
+
+#==============================================================================
+# FORMS
+#==============================================================================
+def scalar_form(dim, kind, mapped=False):
+    """
+    Returns a scalar form of the tests and the mapping of its domain, or
+    None. kind is one of 'mass', 'laplace', 'advection_diffusion',
+    'constants'.
+    """
+    domain  = Domain('Omega', dim=dim)
+    mapping = None
+
+    if mapped:
+        mapping = Mapping('M', dim)
+        domain  = mapping(domain)
+
+    V = ScalarFunctionSpace('V', domain)
+    u,v = elements_of(V, names='u,v')
+
+    if kind == 'mass':
+        expr = u*v
+
+    elif kind == 'laplace':
+        expr = dot(grad(v), grad(u))
+
+    elif kind == 'advection_diffusion':
+        expr = dot(grad(v), grad(u)) + dx1(u)*v
+        if dim > 1:
+            expr += dx2(u)*v
+
+    elif kind == 'constants':
+        c = [Constant('c{}'.format(i)) for i in range(4)]
+        expr = c[0]*v*u + c[1]*dx1(u)*v + c[2]*dx1(v)*u + c[3]*dx1(v)*dx1(u)
+
+    else:
+        raise ValueError('> Unknown form {}'.format(kind))
+
+    return BilinearForm((u,v), integral(domain, expr)), mapping
+
+def vector_form(dim, mapped=False):
+    """Returns the form c div(u) div(v) + grad(u):grad(v) on a vector space."""
+    domain  = Domain('Omega', dim=dim)
+    mapping = None
+
+    if mapped:
+        mapping = Mapping('M', dim)
+        domain  = mapping(domain)
+
+    V = VectorFunctionSpace('V', domain)
+    u,v = elements_of(V, names='u,v')
+
+    c = Constant('c')
+
+    if mapped:
+        expr = c*div(v)*div(u)
+    else:
+        expr = c*div(v)*div(u) + inner(grad(v), grad(u))
+
+    return BilinearForm((u,v), integral(domain, expr)), mapping
+
+#==============================================================================
+# GELATIZE
+#==============================================================================
+def _gelatize_case(build, dim, variant):
+    def setup():
+        a, mapping = build()
+
+        if variant == 'symbolic':
+            return lambda: gelatize(a)
+
+        if variant == 'evaluated':
+            return lambda: gelatize(a, degrees=[3]*dim, n_elements=[16]*dim,
+                                    evaluate=True)
+
+        if variant == 'mapping':
+            return lambda: gelatize(a, mapping=mapping, human=True)
+
+        raise ValueError('> Unknown variant {}'.format(variant))
+
+    return setup
+
+_forms = []
+for _dim in [1, 2, 3]:
+    for _kind in ['mass', 'laplace', 'advection_diffusion']:
+        _forms.append((_dim, _kind, False, False))
+
+    if _dim > 1:
+        _forms.append((_dim, 'vector', False, False))
+
+_forms.append((1, 'constants', False, False))
+
+# ... mapped forms, the 3d form is slow
+_forms.append((2, 'laplace', True, False))
+_forms.append((2, 'vector',  True, False))
+_forms.append((3, 'laplace', True, True))
+# ...
+
+for _dim, _kind, _mapped, _slow in _forms:
+    if _kind == 'vector':
+        _build = (lambda d, m: lambda: vector_form(d, mapped=m))(_dim, _mapped)
+    else:
+        _build = (lambda d, k, m: lambda: scalar_form(d, k, mapped=m))(_dim, _kind, _mapped)
+
+    _variants = ['mapping'] if _mapped else ['symbolic', 'evaluated']
+    for _variant in _variants:
+        name = 'gelatize/{}d/{}/{}'.format(_dim, _kind, _variant)
+        benchmark(name, repeat=1 if _slow else None,
+                  slow=_slow)(_gelatize_case(_build, _dim, _variant))
+
+#==============================================================================
+# GltExpr.__call__
+#==============================================================================
+N_CALLS = 100
+
+def _call_case(dim, kind):
+    def setup():
+        a, mapping = scalar_form(dim, kind)
+        glt = GltExpr(a)
+
+        ts = np.linspace(0., np.pi, N_CALLS)
+        names = ['tx', 'ty', 'tz'][:dim]
+
+        def func():
+            for t in ts:
+                glt(degrees=[3]*dim, n_elements=[16]*dim,
+                    **{name: float(t) for name in names})
+
+        return func
+
+    return setup
+
+for _dim in [1, 2, 3]:
+    benchmark('call/{}d/laplace'.format(_dim))(_call_case(_dim, 'laplace'))
+
+#==============================================================================
+# NUMERIC SAMPLING
+#==============================================================================
+@benchmark('numeric/glt_symbol/p=5/4M')
+def _glt_symbol():
+    t = np.linspace(0., np.pi, 2**22)
+    return lambda: glt_symbol(5, t, 2)
+
+@benchmark('numeric/glt_symbol/p=32/4M')
+def _glt_symbol_sinc():
+    t = np.linspace(0., np.pi, 2**22)
+    return lambda: glt_symbol(32, t, 2)
+
+@benchmark('numeric/fourier_grid/p=5/1M')
+def _fourier_grid():
+    return lambda: sample_fourier_grid(5, 2, 2**20)
+
+@benchmark('numeric/kernel/2d/1024x1024')
+def _kernel():
+    a, mapping = scalar_form(2, 'advection_diffusion')
+    f = GltExpr(a).compile(degrees=[3,3], n_elements=[64,64])
+
+    t = np.linspace(0., np.pi, 1024)
+    return lambda: f(tx=t[:,None], ty=t[None,:])
+
+@benchmark('numeric/sweep/2d/p=1..5')
+def _sweep():
+    a, mapping = scalar_form(2, 'laplace')
+    glt = GltExpr(a)
+    glt.separable_symbol()
+
+    return lambda: glt.sweep([1, 2, 3, 4, 5], [16, 32, 64], tx=256, ty=256)
+
+@benchmark('numeric/mapped/2d/256x256x32x32')
+def _mapped():
+    P = PolarMapping('P', 2, c1=0., c2=0., rmin=0.5, rmax=1.)
+
+    domain = P(Domain('Omega', dim=2))
+    V = ScalarFunctionSpace('V', domain)
+    u,v = elements_of(V, names='u,v')
+
+    a = BilinearForm((u,v), integral(domain, dot(grad(v), grad(u))))
+    glt = GltExpr(a)
+    glt.separable_symbol(P)
+
+    xs = [np.linspace(0., 1., 256)]*2
+    ts = [np.linspace(-np.pi, np.pi, 32)]*2
+
+    def func():
+        for re, im in iter_symbol_parts(glt, [3,3], [64,64], ts, xs, mapping=P):
+            pass
+
+    return func
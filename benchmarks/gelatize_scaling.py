@@ -0,0 +1,195 @@
+# coding: utf-8
+"""
+Regression benchmark for gelatize: the time must grow linearly with the size
+of the expression, even when the number of distinct 1d forms grows with it.
+
+A 3d form has at most 12 distinct 1d forms (mass, stiffness, advection and
+its transpose on every axis), whatever its number of terms. The per-atom
+subs of the former implementation then also scales linearly. The measured
+tensor expressions are therefore sums of k terms c_i * F_x(w_i) * F_y(w_i) *
+F_z(w_i), with 1d forms of distinct weights w_i, hence 3k distinct atoms to
+substitute. For every k, the number of nodes, the time spent in the
+substitution phases of gelatize (single traversal) and in the former per-atom
+subs are reported, followed by the fitted exponents of time ~ size**exponent.
+The script fails when the exponent of the single traversal exceeds the
+maximum.
+
+The time of sympde's TensorExpr on forms of k terms c_i * d(u) * d(v) is
+reported separately.
+
+Usage::
+
+  python3 benchmarks/gelatize_scaling.py [--sizes 16 32 64 128] [--max-exponent 1.3] [--no-baseline]
+"""
+
+import argparse
+import os
+import sys
+import time
+from itertools import product
+
+import numpy as np
+
+from sympy import Symbol
+from sympy import preorder_traversal
+from sympy.core.cache import clear_cache
+
+from sympde.core import Constant
+from sympde.topology import dx1, dx2, dx3
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+from sympde.expr import TensorExpr
+from sympde.expr import Mass as MassForm
+from sympde.expr import Stiffness as StiffnessForm
+from sympde.expr import Advection as AdvectionForm
+from sympde.expr import AdvectionT as AdvectionTForm
+from sympde.expr import Basic1dForm
+
+# ... the script runs from a source tree, without installing gelato
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# ...
+
+from gelato.expr import _gelatize_tensor, _glt_variables, _form_rules
+from gelato.glt import BasicGlt
+
+#==============================================================================
+def make_form(k):
+    """Returns a 3d bilinear form with k terms."""
+    domain = Domain('Omega', dim=3)
+    V = ScalarFunctionSpace('V', domain)
+    u,v = elements_of(V, names='u,v')
+
+    ops   = [lambda w: w, dx1, dx2, dx3]
+    pairs = list(product(ops, ops))
+
+    expr = 0
+    for i in range(k):
+        du, dv = pairs[i % len(pairs)]
+        expr += Constant('c{}'.format(i)) * du(u) * dv(v)
+
+    return BilinearForm((u,v), integral(domain, expr))
+
+def make_tensor(k):
+    """
+    Returns a 3d tensor expression of k terms, with 3k distinct weighted 1d
+    forms.
+    """
+    kinds = [MassForm, StiffnessForm, AdvectionForm, AdvectionTForm]
+
+    expr = 0
+    for i in range(k):
+        w = Symbol('w{}'.format(i))
+        c = Constant('c{}'.format(i))
+
+        expr += c * kinds[i % 4](0, w) * kinds[(i+1) % 4](1, w) * kinds[(i+2) % 4](2, w)
+
+    return expr
+
+def gelatize_subs(expr, dim, degrees=None, n_elements=None, evaluate=False):
+    """
+    The substitution phases of gelatize before the single traversal, with a
+    subs on the whole expression for every atom.
+    """
+    ps, ns, ts = _glt_variables(dim)
+
+    rules = _form_rules(expr.atoms(Basic1dForm), ps, ns, ts, evaluate=evaluate)
+    for form, symbol in rules.items():
+        expr = expr.subs(form, symbol)
+
+    if not( n_elements is None ):
+        for n,v in zip(ns, n_elements):
+            expr = expr.subs(n, v)
+
+    if not( degrees is None ):
+        d = dict(zip(ps, degrees))
+        for atom in expr.atoms(BasicGlt):
+            p,t  = atom.args[:]
+            expr = expr.subs(atom, atom.func(d[p], t))
+
+    return expr
+
+def n_nodes(expr):
+    return sum(1 for i in preorder_traversal(expr))
+
+def timeit(func, expr, repeat, **kwargs):
+    times = []
+    for i in range(repeat):
+        clear_cache()
+        tb = time.perf_counter()
+        func(expr, 3, **kwargs)
+        times.append(time.perf_counter() - tb)
+
+    return min(times)
+
+def run(sizes, repeat=3, baseline=True, **kwargs):
+    results = []
+    for k in sizes:
+        expr  = make_tensor(k)
+        atoms = len(expr.atoms(Basic1dForm))
+
+        t = timeit(_gelatize_tensor, expr, repeat, **kwargs)
+        t_subs = timeit(gelatize_subs, expr, 1, **kwargs) if baseline else None
+
+        results.append((k, n_nodes(expr), atoms, t, t_subs))
+
+    return results
+
+def run_tensor(sizes):
+    results = []
+    for k in sizes:
+        a = make_form(k)
+
+        tb = time.perf_counter()
+        TensorExpr(a)
+        results.append((k, time.perf_counter() - tb))
+
+    return results
+
+def exponent(sizes, times):
+    return np.polyfit(np.log(sizes), np.log(times), 1)[0]
+
+#==============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[16, 32, 64, 128])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-exponent', type=float, default=1.3)
+    parser.add_argument('--no-baseline', action='store_true',
+                        help='do not time the per-atom subs')
+    args = parser.parse_args(argv)
+
+    ok = True
+    for kwargs in [{}, {'degrees': [2,2,2], 'n_elements': [16,16,16]}]:
+        results = run(args.sizes, repeat=args.repeat,
+                      baseline=not( args.no_baseline ), **kwargs)
+
+        print('> gelatize {}'.format(kwargs))
+        for k, size, atoms, t, t_subs in results:
+            line = '  terms = {:4d}   nodes = {:6d}   atoms = {:4d}   time = {:.4f} s'.format(
+                   k, size, atoms, t)
+            if not( t_subs is None ):
+                line += '   (subs: {:.4f} s)'.format(t_subs)
+
+            print(line)
+
+        sizes = [r[1] for r in results]
+        e = exponent(sizes, [r[3] for r in results])
+        line = '  exponent = {:.2f}'.format(e)
+        if not( args.no_baseline ):
+            line += '   (subs: {:.2f})'.format(exponent(sizes, [r[4] for r in results]))
+
+        print(line)
+
+        ok = ok and e <= args.max_exponent
+
+    print('> TensorExpr')
+    for k, t in run_tensor(args.sizes):
+        print('  terms = {:4d}   time = {:.4f} s'.format(k, t))
+
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,203 @@
+# coding: utf-8
+"""
+Registry, measurement and comparison of the benchmark cases.
+
+A case is a setup function, registered with the benchmark decorator, which
+builds its inputs and returns the function to measure. The setup is called
+before every run and is not measured. Every run starts with empty caches
+(see clear_caches), so that the results do not depend on the order of the
+cases.
+
+The wall time is the minimum over the runs. The peak memory is measured by
+tracemalloc on a separate run, since tracing slows down the execution.
+"""
+
+import datetime
+import fnmatch
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+from collections import OrderedDict
+from collections import namedtuple
+
+import numpy as np
+
+__all__ = ('Case',
+           'benchmark',
+           'get_cases',
+           'clear_caches',
+           'measure',
+           'run',
+           'metadata',
+           'save',
+           'load',
+           'compare')
+
+#==============================================================================
+Case = namedtuple('Case', ['name', 'setup', 'repeat', 'slow'])
+
+_cases = OrderedDict()
+
+def benchmark(name, repeat=None, slow=False):
+    """
+    Registers a setup function as the case of the given name, e.g.
+    'gelatize/2d/laplace'. repeat overrides the number of runs, and slow
+    cases only run on demand.
+    """
+    def decorator(setup):
+        if name in _cases:
+            raise ValueError('> Duplicated benchmark {}'.format(name))
+
+        _cases[name] = Case(name, setup, repeat, slow)
+        return setup
+
+    return decorator
+
+def get_cases(patterns=None, slow=False):
+    """
+    Returns the registered cases whose name matches one of the fnmatch
+    patterns, or all the cases. The slow cases are included if slow is True.
+    """
+    from . import cases
+
+    selected = [c for c in _cases.values() if slow or not c.slow]
+    if not patterns:
+        return selected
+
+    return [c for c in selected
+            if any(fnmatch.fnmatch(c.name, p) for p in patterns)]
+
+#==============================================================================
+def clear_caches():
+    """Empties the sympy cache and the in-memory caches of gelato."""
+    from sympy.core.cache import clear_cache
+
+    from gelato.glt    import rational_table, clear_symbol_cache
+    from gelato.tables import exact_table, series_coefficients
+
+    clear_cache()
+    clear_symbol_cache()
+
+    rational_table.cache_clear()
+    exact_table.cache_clear()
+    series_coefficients.cache_clear()
+
+    gc.collect()
+
+def measure(case, repeat=3):
+    """
+    Runs a case and returns a dictionary with the minimum and median wall
+    times, in seconds, and the peak memory traced by tracemalloc, in bytes.
+    """
+    repeat = case.repeat or repeat
+
+    times = []
+    for i in range(repeat):
+        clear_caches()
+        func = case.setup()
+
+        tb = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - tb)
+
+    # ... peak memory, on its own run
+    clear_caches()
+    func = case.setup()
+
+    tracemalloc.start()
+    try:
+        func()
+        current, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+    # ...
+
+    return OrderedDict([('time',        min(times)),
+                        ('median',      float(np.median(times))),
+                        ('repeat',      repeat),
+                        ('peak_memory', peak)])
+
+def run(cases, repeat=3, verbose=True):
+    """Measures the cases, returns an ordered dictionary name -> result."""
+    results = OrderedDict()
+    for case in cases:
+        results[case.name] = measure(case, repeat=repeat)
+
+        if verbose:
+            r = results[case.name]
+            print('{:<48s} {:>10.4f} s {:>12.1f} KiB'.format(case.name, r['time'],
+                                                             r['peak_memory'] / 1024),
+                  flush=True)
+
+    return results
+
+#==============================================================================
+def _git_commit():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=root,
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                             universal_newlines=True, timeout=10)
+
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    return out.stdout.strip() or None
+
+def metadata():
+    """Returns the commit, the date and the versions of the environment."""
+    import sympy
+    import sympde
+    import gelato
+
+    return OrderedDict([('commit',   _git_commit()),
+                        ('date',     datetime.datetime.now().isoformat(timespec='seconds')),
+                        ('python',   platform.python_version()),
+                        ('platform', platform.platform()),
+                        ('numpy',    np.__version__),
+                        ('sympy',    sympy.__version__),
+                        ('sympde',   getattr(sympde, '__version__', None)),
+                        ('gelato',   gelato.__version__)])
+
+def save(results, filename):
+    """Writes the results and the metadata to a JSON file."""
+    data = OrderedDict([('metadata', metadata()),
+                        ('results',  results)])
+
+    with open(filename, 'w') as f:
+        json.dump(data, f, indent=2)
+
+def load(filename):
+    """Reads a JSON file written by save."""
+    with open(filename) as f:
+        return json.load(f, object_pairs_hook=OrderedDict)
+
+#==============================================================================
+def compare(base, new, threshold=1.2):
+    """
+    Compares two results files, loaded with load. Returns a list of
+    (name, time ratio, memory ratio) for the common cases, and the names of
+    the cases whose time or memory grew by more than threshold.
+    """
+    base = base['results']
+    new  = new['results']
+
+    rows        = []
+    regressions = []
+    for name in new:
+        if not( name in base ):
+            continue
+
+        t = new[name]['time'] / max(base[name]['time'], 1e-9)
+        m = new[name]['peak_memory'] / max(base[name]['peak_memory'], 1)
+
+        rows.append((name, t, m))
+        if t > threshold or m > threshold:
+            regressions.append(name)
+
+    return rows, regressions
@@ -0,0 +1,75 @@
+# coding: utf-8
+"""
+Import-time benchmark: import gelato, and gelato.numeric, must stay within a
+time budget and must not load the heavy dependencies.
+
+Every module is imported in a fresh interpreter, where the import is timed.
+The minimum over the runs is reported, with the heavy modules found in
+sys.modules after the import. gelato.numeric loads numpy, which dominates
+its time.
+
+Usage::
+
+  python3 benchmarks/import_time.py [--repeat 5] [--budget 0.25]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+#==============================================================================
+# modules which must be loaded lazily
+HEAVY = ('sympy', 'sympde', 'scipy', 'matplotlib')
+
+_script = """
+import sys, time
+tb = time.perf_counter()
+{}
+t = time.perf_counter() - tb
+print(t)
+print(' '.join(m for m in {!r} if m in sys.modules))
+"""
+
+def import_time(statement, repeat=5):
+    """
+    Returns the minimum time of a statement in a fresh interpreter, and the
+    heavy modules it loads.
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env  = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([root, env.get('PYTHONPATH', '')])
+
+    times = []
+    for i in range(repeat):
+        out = subprocess.run([sys.executable, '-c', _script.format(statement, HEAVY)],
+                             stdout=subprocess.PIPE, env=env, check=True,
+                             universal_newlines=True)
+        lines = out.stdout.split('\n')
+
+        times.append(float(lines[0]))
+        modules = lines[1].split()
+
+    return min(times), modules
+
+#==============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=0.25,
+                        help='maximum import time, in seconds')
+    args = parser.parse_args(argv)
+
+    ok = True
+    for statement in ['import gelato', 'import gelato.numeric']:
+        t, modules = import_time(statement, repeat=args.repeat)
+
+        print('> {:<24s} time = {:.4f} s   heavy modules = {}'.format(statement, t,
+                                                                     modules or None))
+
+        ok = ok and t <= args.budget and not modules
+
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
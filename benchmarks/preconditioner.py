@@ -0,0 +1,122 @@
+# coding: utf-8
+"""
+Benchmark of the GLT preconditioners: CG iterations and wall time.
+
+The test matrices are the sums of Kronecker products of the banded Toeplitz
+matrices of the 1d symbols of a form, assembled with scipy.sparse by
+gelato.assemble. For every number of elements, CG is run without
+preconditioner and with the tau, circulant and Kronecker preconditioners
+built from the gelatized form.
+
+On this constant coefficient matrix, the Kronecker preconditioner is the exact
+inverse and CG converges in one iteration. The preconditioners are therefore
+also run on the variable coefficient matrix D A D, D being the diagonal of
+sqrt(c) at uniform points of the unit cube, with
+c(x) = 1 + x_1 + ... + x_d. Its GLT symbol is c(x) times the symbol of the
+form, so none of the preconditioners is exact there.
+
+Usage::
+
+  python3 benchmarks/preconditioner.py [--dim 2] [--degree 3] [--sizes 32 64 128 256]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.sparse import diags
+from scipy.sparse.linalg import cg
+
+from sympde.calculus import grad, dot
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+# ... the script runs from a source tree, without installing gelato
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# ...
+
+from gelato import glt_preconditioner
+from gelato import assemble
+
+#==============================================================================
+def make_form(dim):
+    """Returns the bilinear form of -Laplace(u) + u."""
+    domain = Domain('Omega', dim=dim)
+    V = ScalarFunctionSpace('V', domain)
+    u,v = elements_of(V, names='u,v')
+
+    return BilinearForm((u,v), integral(domain, dot(grad(v), grad(u)) + u*v))
+
+def coefficient_scaling(shape):
+    """
+    Returns the diagonal of D, for the matrix D A D of the variable coefficient
+    c(x) = 1 + x_1 + ... + x_d, the unknowns being ordered as in numpy.kron.
+    """
+    xs = np.meshgrid(*[np.linspace(0., 1., n) for n in shape], indexing='ij')
+    c  = 1. + sum(xs)
+
+    return np.sqrt(c).ravel()
+
+def solve(A, b, M=None, maxiter=10000):
+    iterations = [0]
+    def callback(x):
+        iterations[0] += 1
+
+    tb = time.perf_counter()
+    x, info = cg(A, b, M=M, maxiter=maxiter, callback=callback)
+    t = time.perf_counter() - tb
+
+    residual = np.linalg.norm(A @ x - b) / np.linalg.norm(b)
+
+    return iterations[0], t, residual
+
+#==============================================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--dim', type=int, default=2)
+    parser.add_argument('--degree', type=int, default=3)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[32, 64, 128, 256])
+    args = parser.parse_args(argv)
+
+    dim = args.dim
+    p   = args.degree
+    a   = make_form(dim)
+
+    print('> dim = {}, degree = {}'.format(dim, p))
+    for coefficient in ['constant', 'variable']:
+        print('> {} coefficient'.format(coefficient))
+        for n in args.sizes:
+            K = assemble(a, p, n)
+            A = K.tosparse()
+            if coefficient == 'variable':
+                D = diags(coefficient_scaling(K.grid_shape))
+                A = (D @ A @ D).tocsr()
+
+            b = np.random.default_rng(0).random(A.shape[0])
+
+            for kind in [None, 'tau', 'circulant', 'kronecker']:
+                tb = time.perf_counter()
+                P  = None if kind is None else glt_preconditioner(a, p, n, kind=kind)
+                t_setup = time.perf_counter() - tb
+
+                # ... the Kronecker preconditioner inverts the constant
+                #     coefficient matrix exactly
+                label = str(kind)
+                if kind == 'kronecker' and coefficient == 'constant':
+                    label = 'kronecker (exact inverse)'
+                # ...
+
+                iterations, t, residual = solve(A, b, M=P)
+                print('  n = {:4d}   {:25s}   iterations = {:5d}   time = {:.4f} s   '
+                      '(setup: {:.4f} s)   residual = {:.1e}'.format(
+                          n, label, iterations, t, t_setup, residual))
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
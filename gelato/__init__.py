@@ -1,6 +1,68 @@
 # -*- coding: UTF-8 -*-
-from .version  import __version__
-from .expr     import *
-from .glt      import *
-from .printing import *
-from .utils    import *
+"""
+The public names of the submodules are imported on first access, so that
+``import gelato`` does not load sympy, sympde, scipy or matplotlib. Worker
+processes which only evaluate symbols numerically can use gelato.numeric
+without paying for them.
+"""
+
+from importlib import import_module
+
+from .version        import __version__
+
+# ... submodule => public names, in the order of the former star imports
+_exports = (('expr',           ('gelatize', 'GltExpr', 'PhaseRecord',
+                                'GelatizeProfile', 'profile_gelatize')),
+            ('glt',            ('P_MAX', 'd_phi', 'd_phi_r', 'd_phi_rr',
+                                'rational_table', 'SYMBOL_CACHE_SIZE',
+                                'glt_symbol', 'symbol_cache_info',
+                                'clear_symbol_cache', 'BasicGlt', 'Mass',
+                                'Stiffness', 'Advection', 'Bilaplacian',
+                                'GltSymbol', 'glt_pair')),
+            ('separable',      ('GltTerm', 'glt_terms', 'fourier_variables',
+                                'sample_terms', 'sample_fourier_grid_terms',
+                                'outer_product')),
+            ('mapping',        ('abstract_mapping', 'mapping_symbols',
+                                'MappingGrid', 'mapping_grid')),
+            ('trigpoly',       ('TrigPolynomial', 'trig_polynomial')),
+            ('sweep',          ('sweep_symbol',)),
+            ('spectrum',       ('predict_eigenvalues',)),
+            ('nonhermitian',   ('iter_symbol_parts', 'symbol_parts',
+                                'predict_singular_values', 'numerical_range')),
+            ('block',          ('BlockSymbol', 'block_symbol',
+                                'block_eigenvalues',
+                                'predict_block_eigenvalues')),
+            ('assembly',       ('toeplitz_bands', 'toeplitz_matrix',
+                                'KroneckerOperator', 'assemble')),
+            ('toeplitz',       ('ToeplitzOperator', 'toeplitz_operator')),
+            ('preconditioner', ('glt_preconditioner',)),
+            ('parallel',       ('gelatize_many',)),
+            ('printing',       ('LatexPrinter', 'latex')),
+            ('utils',          ('plot_stiffness_symbols',)))
+
+_modules = {name: module for module, names in _exports for name in names}
+# ...
+
+# ... submodules without star exports, imported on first access as well
+_submodules = tuple(module for module, names in _exports) + ('numeric', 'tables',
+                                                            'store', 'kernel',
+                                                            'cache', 'bspline')
+# ...
+
+__all__ = ('__version__',) + tuple(name for module, names in _exports for name in names)
+
+def __getattr__(name):
+    if name in _modules:
+        value = getattr(import_module('.' + _modules[name], __name__), name)
+
+    elif name in _submodules:
+        value = import_module('.' + name, __name__)
+
+    else:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_modules) | set(_submodules))
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module assembles the matrices whose symbols are the GLT symbols.
+
+The 1d symbol of degree p and derivative order k is a trigonometric
+polynomial of degree p, hence the matrix of the 1d factor is banded, with
+2p+1 bands given by the GLT coefficient tables: these are the matrices of
+the mass (k = 0), advection (k = 1) and stiffness (k = 2) forms on a uniform
+periodic mesh, up to the boundary rows. For odd orders the matrix of
+i*f is used, which is real and skew-symmetric, as gelatize writes the
+advection symbol I*Advection.
+
+A multi-dimensional form is a sum of Kronecker products of 1d matrices. It is
+kept as such, the operator being applied axis by axis without forming the
+Kronecker products.
+"""
+
+import numpy as np
+
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator
+
+from sympde.expr import BilinearForm
+
+from .expr      import GltExpr
+from .tables    import series_coefficients
+from .separable import glt_terms, _as_list
+from .spectrum  import _coefficients
+
+__all__ = ('toeplitz_bands',
+           'toeplitz_matrix',
+           'KroneckerOperator',
+           'assemble')
+
+#==============================================================================
+def toeplitz_bands(p, orders):
+    """
+    Returns the Fourier coefficients (a_{-m}, ..., a_m) of the product of the
+    1d symbols of degree p and the given derivative orders, the symbol of an
+    odd order k being multiplied by i.
+
+    p: int
+        spline degree
+
+    orders: int, tuple
+        derivative order(s) of the symbols
+    """
+    if isinstance(orders, int):
+        orders = (orders,)
+
+    bands = np.ones(1)
+    for order in orders:
+        c = series_coefficients(p, order)
+
+        # ... f = sum_k a_k exp(i k t)
+        a = np.zeros(2*p+1)
+        a[p]    = c[0]
+        a[p+1:] = c[1:] / 2
+        if order % 2 == 0:
+            a[:p] = c[:0:-1] / 2
+        else:
+            a[:p] = - c[:0:-1] / 2
+        # ...
+
+        bands = np.convolve(bands, a)
+
+    return bands
+
+def toeplitz_matrix(p, orders, n, periodic=False, format='csr'):
+    """
+    Returns the sparse matrix of size n whose symbol is the product of the
+    1d symbols of degree p and the given derivative orders (see
+    toeplitz_bands). It is assembled in O(n p) operations.
+
+    p: int
+        spline degree
+
+    orders: int, tuple
+        derivative order(s) of the symbols
+
+    n: int
+        size of the matrix
+
+    periodic: bool
+        if True, the circulant matrix is returned
+
+    format: str
+        sparse format of the matrix
+    """
+    a = toeplitz_bands(p, orders)
+    m = len(a) // 2
+
+    # ... T_{j,l} = a_{j-l}
+    rows = np.repeat(np.arange(n), len(a))
+    ks   = np.tile(np.arange(-m, m+1), n)
+    cols = rows - ks
+    data = np.tile(a, n)
+
+    if periodic:
+        cols = cols % n
+
+    else:
+        mask = (cols >= 0) & (cols < n)
+        rows, cols, data = rows[mask], cols[mask], data[mask]
+    # ...
+
+    return sp.coo_matrix((data, (rows, cols)), shape=(n, n)).asformat(format)
+
+#==============================================================================
+class KroneckerOperator(LinearOperator):
+    """
+    A sum of Kronecker products of 1d sparse matrices, as a LinearOperator.
+    The unknowns are ordered as in numpy.kron, the last axis being the
+    fastest.
+
+    terms: list
+        list of (coeff, [A_1, ..., A_d]), A_i being the square matrix of the
+        axis i, or None for the identity
+    """
+
+    def __init__(self, terms):
+        terms = [(c, list(ms)) for c,ms in terms]
+        if not terms:
+            raise ValueError('> Expecting at least one term')
+
+        shape = None
+        for c, ms in terms:
+            s = tuple(None if m is None else m.shape[0] for m in ms)
+            shape = s if shape is None else tuple(j if i is None else i
+                                                  for i,j in zip(s, shape))
+
+        if None in shape:
+            raise ValueError('> Cannot find the size of every axis')
+
+        self._terms = terms
+        self._grid  = shape
+
+        complex_ = any(np.iscomplexobj(np.asarray(c)) for c,ms in terms)
+        complex_ = complex_ or any(np.iscomplexobj(m.data) for c,ms in terms
+                                   for m in ms if not( m is None ))
+        dtype = np.dtype(complex if complex_ else float)
+
+        size = int(np.prod(shape))
+        super().__init__(dtype, (size, size))
+
+    @property
+    def terms(self):
+        return self._terms
+
+    @property
+    def grid_shape(self):
+        """Number of unknowns per axis."""
+        return self._grid
+
+    def _apply(self, x):
+        """x has the shape of the grid, plus a trailing batch axis."""
+        result = 0
+        for c, ms in self._terms:
+            y = x
+            for axis, m in enumerate(ms):
+                if m is None:
+                    continue
+
+                y = np.moveaxis(y, axis, 0)
+                shape = y.shape
+                y = (m @ y.reshape((shape[0], -1))).reshape(shape)
+                y = np.moveaxis(y, 0, axis)
+
+            result = result + c * y
+
+        return result
+
+    def _matmat(self, X):
+        X = np.asarray(X)
+        k = X.shape[1]
+
+        Y = self._apply(X.reshape(self._grid + (k,)))
+
+        return Y.reshape((self.shape[0], k))
+
+    def _matvec(self, x):
+        x = np.asarray(x)
+
+        return self._matmat(x.reshape((-1, 1))).reshape(x.shape)
+
+    def _adjoint(self):
+        return KroneckerOperator([(np.conj(c), [None if m is None else m.T.conj()
+                                                 for m in ms])
+                                  for c,ms in self._terms])
+
+    def tosparse(self, format='csr'):
+        """Returns the assembled sparse matrix. Only for small sizes."""
+        A = 0
+        for c, ms in self._terms:
+            B = None
+            for n, m in zip(self._grid, ms):
+                m = sp.identity(n) if m is None else m
+                B = m if B is None else sp.kron(B, m)
+
+            A = A + c * B
+
+        return sp.csr_matrix(A).asformat(format)
+
+#==============================================================================
+def _operator_terms(glt, degrees, n_elements, values):
+    """
+    Returns the degrees, the numbers of elements and the list of
+    (coeff, factors) of the operator of a form, whose coefficients are
+    evaluated and divided by i for every odd order (see toeplitz_bands).
+    """
+    if isinstance(glt, BilinearForm):
+        glt = GltExpr(glt)
+
+    if glt.fields:
+        raise NotImplementedError('Fields are not available yet')
+
+    dim        = glt.ldim
+    degrees    = [int(i) for i in _as_list(degrees,    dim)]
+    n_elements = [int(i) for i in _as_list(n_elements, dim)]
+
+    terms = glt_terms(glt.separable_symbol(), dim)
+
+    funcs, is_variable = _coefficients(terms, glt, n_elements, values,
+                                       real=False)
+    if is_variable:
+        raise NotImplementedError('Variable coefficients are not available yet')
+
+    operators = []
+    for f, term in zip(funcs, terms):
+        # ... the odd order matrices carry a factor i, removed from the coeff
+        n_odd = sum(order % 2 for orders in term.factors for order in orders)
+
+        c = complex(f(*[0.]*dim)) * (-1j)**n_odd
+        c = c.real if c.imag == 0 else c
+        # ...
+
+        operators.append((c, term.factors))
+
+    return degrees, n_elements, operators
+
+#==============================================================================
+def assemble(glt, degrees, n_elements, periodic=False, **values):
+    """
+    Returns the operator whose symbol is the gelatized form, as a
+    KroneckerOperator. Every term of the symbol is the Kronecker product of
+    the banded matrices of its 1d factors, see toeplitz_matrix, multiplied
+    by its coefficient, where the 1/n, n and n**3 scalings of gelatize are
+    evaluated. Every distinct 1d matrix is assembled once.
+
+    glt: GltExpr, BilinearForm
+        the form, with constant coefficients
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    n_elements: int, list, tuple
+        number of elements for every axis, which is also the size of the 1d
+        matrices
+
+    periodic: bool
+        if True, the 1d matrices are circulant
+
+    values: dict
+        values of the constants, given by name
+
+    Examples
+
+    >>> A = assemble(a, degrees=[3,3], n_elements=[64,64])
+    >>> y = A @ x
+    """
+    degrees, n_elements, terms = _operator_terms(glt, degrees, n_elements,
+                                                 values)
+
+    matrices = {}
+    def _matrix(axis, orders):
+        key = (axis, orders)
+        if not( key in matrices ):
+            matrices[key] = toeplitz_matrix(degrees[axis], orders,
+                                            n_elements[axis],
+                                            periodic=periodic)
+        return matrices[key]
+
+    operators = []
+    for c, factors in terms:
+        ms = [_matrix(axis, orders) if orders else None
+              for axis, orders in enumerate(factors)]
+
+        operators.append((c, ms))
+
+    return KroneckerOperator(operators)
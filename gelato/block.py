@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module evaluates the matrix-valued symbols of forms on vector
+spaces.
+
+For a VectorFunctionSpace, gelatize returns a k x k matrix whose entries are
+scalar symbols. All the separable terms of all the entries are sampled at
+once: the 1d factors are evaluated once, the coefficients once per space
+point, and every entry is a matrix product, written in a contiguous
+(npoints, k, k) array. The eigenvalues are computed by chunks of points with
+the batched numpy.linalg.eigvalsh, or eigvals when the symbol is not
+Hermitian.
+"""
+
+import numpy as np
+
+from sympy import expand
+from sympy import I as sympy_I
+from sympy import Matrix
+from sympy.matrices import MatrixBase
+
+from sympde.expr import BilinearForm
+
+from .expr      import GltExpr
+from .separable import glt_terms, sample_terms, outer_product, _as_list
+from .spectrum  import _coefficients, _sampling, _rearrange, _grid
+
+__all__ = ('BlockSymbol',
+           'block_symbol',
+           'block_eigenvalues',
+           'predict_block_eigenvalues')
+
+# number of entries of the blocks computed at once
+CHUNK_SIZE = 2**20
+
+#==============================================================================
+def _conjugate(expr):
+    # the constants and the space variables are real
+    return expr.xreplace({sympy_I: -sympy_I})
+
+#==============================================================================
+class BlockSymbol(object):
+    """
+    The matrix-valued symbol of a form, with its constants and its number of
+    elements evaluated. A scalar symbol is a 1 x 1 block.
+
+    glt: GltExpr, BilinearForm
+        the form, with real constants
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    n_elements: int, list, tuple
+        number of elements for every axis
+
+    values: dict
+        values of the constants, given by name
+    """
+
+    def __init__(self, glt, degrees, n_elements, **values):
+        if isinstance(glt, BilinearForm):
+            glt = GltExpr(glt)
+
+        if glt.fields:
+            raise NotImplementedError('Fields are not available yet')
+
+        dim        = glt.ldim
+        degrees    = [int(i) for i in _as_list(degrees,    dim)]
+        n_elements = [int(i) for i in _as_list(n_elements, dim)]
+
+        expr = glt.separable_symbol()
+        if not isinstance(expr, MatrixBase):
+            expr = Matrix([[expr]])
+
+        if not( expr.rows == expr.cols ):
+            raise ValueError('> Expecting a square symbol, given {}'.format(expr.shape))
+
+        size = expr.rows
+
+        # ... the terms of all the entries, in a single list
+        terms   = []
+        entries = []
+        for i in range(size):
+            for j in range(size):
+                ts = glt_terms(expr[i,j], dim)
+                entries.append((i, j, len(terms), len(terms) + len(ts)))
+                terms += ts
+        # ...
+
+        funcs, is_variable = _coefficients(terms, glt, n_elements, values,
+                                           parts=True)
+
+        # ... Hermitian if the entry (j,i) is the conjugate of the entry (i,j)
+        hermitian = True
+        for i in range(size):
+            for j in range(i, size):
+                if not( expand(expr[i,j] - _conjugate(expr[j,i])) == 0 ):
+                    hermitian = False
+        # ...
+
+        self._dim         = dim
+        self._size        = size
+        self._degrees     = degrees
+        self._n_elements  = n_elements
+        self._terms       = terms
+        self._entries     = entries
+        self._funcs       = funcs
+        self._is_variable = is_variable
+        self._hermitian   = hermitian
+
+    @property
+    def dim(self):
+        return self._dim
+
+    @property
+    def size(self):
+        """Size k of the blocks."""
+        return self._size
+
+    @property
+    def degrees(self):
+        return self._degrees
+
+    @property
+    def n_elements(self):
+        return self._n_elements
+
+    @property
+    def is_variable(self):
+        """True if the symbol depends on the space variables."""
+        return self._is_variable
+
+    @property
+    def is_hermitian(self):
+        return self._hermitian
+
+    def _coefficients(self, xs):
+        """
+        Returns the real and imaginary parts of the coefficients of the
+        terms, as matrices of shape (number of space points, number of
+        terms), and whether the imaginary parts vanish.
+        """
+        dim = self._dim
+
+        if not self._is_variable:
+            xs = [np.zeros(1)]*dim
+
+        elif xs is None:
+            raise ValueError('> The symbol depends on the space variables, xs must be given')
+
+        xs     = [np.asarray(x, dtype=float) for x in _as_list(xs, dim)]
+        points = np.meshgrid(*xs, indexing='ij')
+        shape  = points[0].shape
+
+        re = np.empty((points[0].size, len(self._terms)))
+        im = np.empty((points[0].size, len(self._terms)))
+        for j, (f, g) in enumerate(self._funcs):
+            re[:,j] = np.broadcast_to(f(*points), shape).reshape(-1)
+            im[:,j] = np.broadcast_to(g(*points), shape).reshape(-1)
+
+        return re, im, not im.any()
+
+    def iter_blocks(self, ts, xs=None, chunk_size=CHUNK_SIZE):
+        """
+        Samples the symbol on the tensor product of a grid of space points and
+        of a grid of Fourier variables. This is a generator, yielding
+        contiguous arrays of shape (npoints, k, k) for chunks of space points,
+        the points being ordered with the space points first, as in
+        numpy.meshgrid(*xs, *ts, indexing='ij').
+
+        ts: list
+            for every axis, a 1d array of Fourier variables
+
+        xs: list
+            for every axis, a 1d array of logical coordinates, used when the
+            coefficients are variable
+
+        chunk_size: int
+            approximate number of entries in a chunk
+        """
+        dim  = self._dim
+        k    = self._size
+
+        ts    = [np.asarray(t, dtype=float) for t in _as_list(ts, dim)]
+        shape = tuple(len(t) for t in ts)
+        size  = int(np.prod(shape))
+
+        # ... factors of the terms, as the rows of a matrix
+        samples = sample_terms(self._terms, self._degrees, ts)
+
+        factors = np.empty((len(self._terms), size))
+        for i, (_, fs) in enumerate(samples):
+            outer_product([(1., fs)], shape, out=factors[i].reshape(shape))
+        # ...
+
+        re, im, is_real = self._coefficients(xs)
+        dtype = float if is_real else complex
+
+        n_points = re.shape[0]
+        step     = max(1, chunk_size // (size * k * k))
+        for start in range(0, n_points, step):
+            stop = min(start + step, n_points)
+
+            blocks = np.zeros((stop - start, size, k, k), dtype=dtype)
+            for i, j, first, last in self._entries:
+                if first == last:
+                    continue
+
+                blocks[:, :, i, j] = re[start:stop, first:last] @ factors[first:last]
+                if not is_real:
+                    blocks[:, :, i, j] += 1j * (im[start:stop, first:last] @ factors[first:last])
+
+            yield blocks.reshape((-1, k, k))
+
+    def eigenvalues(self, blocks):
+        """
+        Returns the eigenvalues of a (npoints, k, k) array of blocks, as an
+        array of shape (npoints, k), real and in increasing order for each
+        point if the symbol is Hermitian.
+        """
+        if self._hermitian:
+            return np.linalg.eigvalsh(blocks)
+
+        return np.linalg.eigvals(blocks)
+
+#==============================================================================
+def block_symbol(glt, degrees, n_elements, ts, xs=None, out=None, **values):
+    """
+    Returns the samples of the matrix-valued symbol of a form, as a
+    contiguous array of shape (npoints, k, k), where npoints is the number of
+    space points times the number of Fourier points (see
+    BlockSymbol.iter_blocks).
+
+    out: numpy.ndarray
+        optional output array
+    """
+    symbol = BlockSymbol(glt, degrees, n_elements, **values)
+
+    blocks = list(symbol.iter_blocks(ts, xs=xs))
+    shape  = (sum(len(b) for b in blocks),) + blocks[0].shape[1:]
+
+    if out is None:
+        return np.concatenate(blocks)
+
+    if not( out.shape == shape ):
+        raise ValueError('> Expecting an out array of shape {}'.format(shape))
+
+    return np.concatenate(blocks, out=out)
+
+def block_eigenvalues(glt, degrees, n_elements, ts, xs=None,
+                      chunk_size=CHUNK_SIZE, **values):
+    """
+    Returns the eigenvalues of the samples of the matrix-valued symbol of a
+    form, as an array of shape (npoints, k), computed by chunks (see
+    BlockSymbol.iter_blocks). The eigenvalues are real if the symbol is
+    Hermitian.
+
+    glt: GltExpr, BilinearForm
+        the form, with real constants
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    n_elements: int, list, tuple
+        number of elements for every axis
+
+    ts: list
+        for every axis, a 1d array of Fourier variables
+
+    xs: list
+        for every axis, a 1d array of logical coordinates
+
+    chunk_size: int
+        approximate number of entries in a chunk
+
+    values: dict
+        values of the constants, given by name
+
+    Examples
+
+    >>> block_eigenvalues(a, [3,3], [64,64], ts=[t,t], c=1.).shape
+    """
+    symbol = BlockSymbol(glt, degrees, n_elements, **values)
+
+    return np.concatenate([symbol.eigenvalues(blocks)
+                           for blocks in symbol.iter_blocks(ts, xs=xs,
+                                                            chunk_size=chunk_size)])
+
+#==============================================================================
+def predict_block_eigenvalues(glt, degrees, n_elements, k=None,
+                              which='smallest', n_space=None, **values):
+    """
+    Predicts the sorted eigenvalues of the block matrix of a form on a vector
+    space, whose size is k N for blocks of size k and N unknowns per
+    component, as the monotone rearrangement of the k eigenvalue functions
+    of its Hermitian symbol. See gelato.spectrum.predict_eigenvalues for the
+    sampling and the arguments.
+    """
+    if not( which in ('smallest', 'largest') ):
+        raise ValueError('> which must be smallest or largest, given {}'.format(which))
+
+    symbol = BlockSymbol(glt, degrees, n_elements, **values)
+    if not symbol.is_hermitian:
+        raise ValueError('> Expecting a Hermitian symbol')
+
+    size = symbol.size * int(np.prod(symbol.n_elements))
+
+    n_space, n_fourier = _sampling(symbol.n_elements, n_space,
+                                   symbol.is_variable)
+
+    xs = [(np.arange(m) + 0.5) / m for m in n_space]
+    ts = [_grid(n) for n in n_fourier]
+
+    out = np.concatenate([symbol.eigenvalues(blocks).reshape(-1)
+                          for blocks in symbol.iter_blocks(ts, xs=xs)])
+
+    return _rearrange(out, size, k=k, which=which)
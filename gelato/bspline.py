@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module computes exact values of cardinal B-splines and their
+derivatives at the integers.
+
+Only integer and Fraction arithmetic is used, so that the GLT coefficients of
+any degree are obtained exactly and at a cost polynomial in the degree.
+"""
+
+from fractions import Fraction
+from math import factorial
+
+__all__ = ('binomials',
+           'cardinal_bspline',
+           'cardinal_bspline_derivative',
+           'glt_coefficients')
+
+#==============================================================================
+def binomials(n):
+    """
+    Returns the list of binomial coefficients [C(n,0), ..., C(n,n)].
+
+    n: int
+        a non negative integer
+    """
+    c = [1]
+    for j in range(n):
+        c.append(c[-1] * (n - j) // (j + 1))
+    return c
+
+#==============================================================================
+def cardinal_bspline(degree, x):
+    """
+    Returns the exact value of the cardinal B-spline of a given degree, with
+    knots 0, 1, ..., degree+1, at the integer x.
+
+    degree: int
+        spline degree, must be positive
+
+    x: int
+        an integer
+    """
+    if degree < 1:
+        raise ValueError('> Expecting a positive degree, given {}'.format(degree))
+
+    if x <= 0 or x >= degree + 1:
+        return Fraction(0)
+
+    # ... truncated power representation, only the knots j < x contribute
+    c = binomials(degree + 1)
+    s = 0
+    for j in range(0, x):
+        s += (-1)**j * c[j] * (x - j)**degree
+    # ...
+
+    return Fraction(s, factorial(degree))
+
+#==============================================================================
+def cardinal_bspline_derivative(degree, order, x):
+    """
+    Returns the exact value of the derivative of a given order of the cardinal
+    B-spline of a given degree, at the integer x.
+
+    degree: int
+        spline degree
+
+    order: int
+        derivative order, between 0 and degree-1
+
+    x: int
+        an integer
+    """
+    if not( 0 <= order < degree ):
+        raise ValueError('> Expecting a derivative order between 0 and {}, '
+                         'given {}'.format(degree - 1, order))
+
+    # ... the derivative is a finite difference of lower degree B-splines
+    c = binomials(order)
+    s = Fraction(0)
+    for j in range(0, order + 1):
+        s += (-1)**j * c[j] * cardinal_bspline(degree - order, x - j)
+    # ...
+
+    return s
+
+#==============================================================================
+def glt_coefficients(p, order=0):
+    """
+    Returns the exact coefficients [phi_0, ..., phi_p] used to build the GLT
+    symbols, where phi_i is the derivative of the given order of the cardinal
+    B-spline of degree 2p+1, evaluated at p+1-i.
+
+    p: int
+        spline degree, must be positive
+
+    order: int
+        derivative order, between 0 and 2p
+    """
+    if p < 1:
+        raise ValueError('> Expecting a positive degree, given {}'.format(p))
+
+    m = 2*p + 1
+    if not( 0 <= order < m ):
+        raise ValueError('> Expecting a derivative order between 0 and {}, '
+                         'given {}'.format(m - 1, order))
+
+    # ... values of the lower degree B-spline at the integers, computed once
+    q = m - order
+    values = [cardinal_bspline(q, x) for x in range(0, q + 2)]
+    c = binomials(order)
+
+    phi = []
+    for i in range(0, p + 1):
+        x = p + 1 - i
+        s = Fraction(0)
+        for j in range(0, order + 1):
+            if 0 < x - j < q + 1:
+                s += (-1)**j * c[j] * values[x - j]
+        phi.append(s)
+    # ...
+
+    return phi
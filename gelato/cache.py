@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module contains a small bounded memoization helper, independent of
+the sympy global cache."""
+
+from collections import OrderedDict
+from collections import namedtuple
+from threading import RLock
+
+__all__ = ('CacheInfo',
+           'LRUCache')
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+#==============================================================================
+class LRUCache(object):
+    """
+    A bounded dictionary, discarding the least recently used entries.
+
+    maxsize: int
+        maximum number of entries, None for an unbounded cache
+
+    Examples
+
+    >>> cache = LRUCache(maxsize=2)
+    >>> cache.get_or_compute('a', lambda: 1)
+    1
+    >>> cache.info()
+    CacheInfo(hits=0, misses=1, maxsize=2, currsize=1)
+    """
+
+    def __init__(self, maxsize=128):
+        self._maxsize = maxsize
+        self._data    = OrderedDict()
+        self._lock    = RLock()
+        self._hits    = 0
+        self._misses  = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Returns the value of key, updating the hit/miss counters."""
+        with self._lock:
+            try:
+                value = self._data[key]
+
+            except KeyError:
+                self._misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self._hits += 1
+
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+
+            if not( self._maxsize is None ):
+                while len(self._data) > self._maxsize:
+                    self._data.popitem(last=False)
+
+    def get_or_compute(self, key, func):
+        """
+        Returns the value of key, calling func() to compute it on a miss.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+
+            except KeyError:
+                self._misses += 1
+
+            else:
+                self._data.move_to_end(key)
+                self._hits += 1
+
+                return value
+
+        value = func()
+        self.set(key, value)
+
+        return value
+
+    def clear(self):
+        """Removes all the entries and resets the counters."""
+        with self._lock:
+            self._data.clear()
+            self._hits   = 0
+            self._misses = 0
+
+    def info(self):
+        """Returns the hits, misses, maxsize and current size."""
+        return CacheInfo(self._hits, self._misses, self._maxsize, len(self._data))
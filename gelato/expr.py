@@ -1,11 +1,19 @@
 # coding: utf-8
 
+import time
+import threading
+from collections import OrderedDict
+from collections import namedtuple
+from contextlib import contextmanager
+
 from sympy import I as sympy_I
 from sympy import Symbol
 from sympy.core.containers import Tuple
 from sympy import S
 from sympy.core import Expr, Basic
 from sympy import simplify, expand
+from sympy import sympify
+from sympy import preorder_traversal
 
 from sympde.expr import BilinearForm
 from sympde.expr import TensorExpr
@@ -19,42 +27,284 @@ from sympde.expr import Basic1dForm
 from sympde.topology import SymbolicExpr
 from sympde.calculus.matrices import SymbolicDeterminant
 
-from .glt import (BasicGlt, Mass, Stiffness, Advection, Bilaplacian)
+from .glt import (Mass, Stiffness, Advection, Bilaplacian)
+from .kernel   import GltKernel
+from .mapping  import abstract_mapping
+from .sweep    import sweep_symbol
+from .trigpoly import trig_polynomial
+from .cache    import LRUCache
+
+__all__ = ('gelatize',
+           'GltExpr',
+           'PhaseRecord',
+           'GelatizeProfile',
+           'profile_gelatize')
+
+#==============================================================================
+# PROFILING
+#==============================================================================
+PhaseRecord = namedtuple('PhaseRecord', ['phase', 'time', 'substitutions',
+                                         'nodes_in', 'nodes_out'])
+
+# the active profiles of every thread, None when profiling is disabled
+_local = threading.local()
+
+def _count_nodes(expr):
+    return sum(1 for i in preorder_traversal(expr))
+
+def _phase(name, func, expr, substitutions=0):
+    """
+    Runs func() as a phase of gelatize and returns its result. When a profile
+    is active, the wall time of the phase and the number of nodes of the
+    expression before and after the phase are recorded.
+    """
+    profiles = getattr(_local, 'profiles', None)
+    if profiles is None:
+        return func()
+
+    nodes = any(profile.nodes for profile in profiles)
+
+    nodes_in = _count_nodes(expr) if nodes else None
+
+    tb  = time.perf_counter()
+    out = func()
+    t   = time.perf_counter() - tb
+
+    nodes_out = _count_nodes(out) if nodes else None
+
+    record = PhaseRecord(name, t, substitutions, nodes_in, nodes_out)
+    for profile in profiles:
+        profile.append(record)
+
+    return out
+
+class GelatizeProfile(object):
+    """
+    The records of the phases of gelatize, in the order of execution. The
+    phases are
+
+        tensor      sympde's TensorExpr
+        unwrap      removal of the nested TensorExpr nodes
+        forms       substitution of the 1d forms by their symbols
+        n_elements  substitution of the numbers of elements
+        degrees     substitution of the degrees, evaluating the symbols
+        mapping     multiplication by the SymbolicDeterminant of the mapping
+        trigpoly    conversion to a TrigPolynomial
 
-__all__ = ('gelatize', 'GltExpr')
+    callback: callable
+        optional function called with every PhaseRecord
+
+    nodes: bool
+        count the nodes of the expressions, which is costly on large
+        expressions
+    """
+
+    def __init__(self, callback=None, nodes=True):
+        self._records  = []
+        self._callback = callback
+        self._nodes    = nodes
+
+    @property
+    def records(self):
+        return self._records
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def time(self):
+        """Total time of the recorded phases."""
+        return sum(r.time for r in self._records)
+
+    def append(self, record):
+        self._records.append(record)
+
+        if not( self._callback is None ):
+            self._callback(record)
+
+    def by_phase(self):
+        """
+        Returns an ordered dictionary phase -> PhaseRecord, summing the times
+        and the substitutions of all the calls, with the largest node counts.
+        """
+        d = OrderedDict()
+        for r in self._records:
+            if r.phase in d:
+                q = d[r.phase]
+                r = PhaseRecord(r.phase, q.time + r.time,
+                                q.substitutions + r.substitutions,
+                                _max(q.nodes_in,  r.nodes_in),
+                                _max(q.nodes_out, r.nodes_out))
+
+            d[r.phase] = r
+
+        return d
+
+    def report(self):
+        """Returns a table of the phases, as a string."""
+        lines = ['{:<12s} {:>10s} {:>14s} {:>10s} {:>10s}'.format('phase', 'time',
+                                                                'substitutions',
+                                                                'nodes in',
+                                                                'nodes out')]
+        for r in self.by_phase().values():
+            lines.append('{:<12s} {:>10.4f} {:>14d} {:>10s} {:>10s}'.format(r.phase,
+                                                                          r.time,
+                                                                          r.substitutions,
+                                                                          str(r.nodes_in),
+                                                                          str(r.nodes_out)))
+
+        return '\n'.join(lines)
+
+def _max(a, b):
+    if a is None or b is None:
+        return None
+
+    return max(a, b)
+
+@contextmanager
+def profile_gelatize(callback=None, nodes=True):
+    """
+    Records the phases of every call to gelatize within the context, in the
+    current thread. Profiles can be nested. Outside of a profile, the overhead
+    is a test per phase.
+
+    callback: callable
+        optional function called with every PhaseRecord
+
+    nodes: bool
+        count the nodes of the expressions
+
+    Examples
+
+    >>> with profile_gelatize() as profile:
+    ...     gelatize(a, degrees=[3,3], n_elements=[16,16], evaluate=True)
+    >>> print(profile.report())
+    """
+    profile = GelatizeProfile(callback=callback, nodes=nodes)
+
+    previous = getattr(_local, 'profiles', None)
+    _local.profiles = (previous or ()) + (profile,)
+    try:
+        yield profile
+
+    finally:
+        _local.profiles = previous
 
 #==============================================================================
 def gelatize(a, degrees=None, n_elements=None, evaluate=False, mapping=None,
-             human=False, expand=False):
+             human=False, expand=False, output='sympy'):
+    """
+    Returns the GLT symbol of a bilinear form.
+
+    With output='trigpoly', the symbol is returned as an exact
+    gelato.trigpoly.TrigPolynomial, instead of a sympy expression. The
+    degrees and the numbers of elements must then be given, and the
+    coefficients must be numbers.
+    """
 
     if not isinstance(a, BilinearForm):
         raise TypeError('> Expecting a BilinearForm')
 
+    if not( output in ('sympy', 'trigpoly') ):
+        raise ValueError('> Unknown output {}'.format(output))
+
     dim = a.ldim
 
     # ... compute tensor form
-    expr = TensorExpr(a, mapping=mapping, expand=expand)
+    expr = _phase('tensor', lambda: TensorExpr(a, mapping=mapping, expand=expand),
+                  a.expr)
     # ...
 
+    if output == 'trigpoly':
+        if degrees is None or n_elements is None:
+            raise ValueError('> degrees and n_elements must be given')
+
+        expr = _gelatize_tensor(expr, dim, n_elements=n_elements)
+        return _phase('trigpoly',
+                      lambda: trig_polynomial(expr, dim, degrees, exact=True),
+                      expr)
+
+    expr = _gelatize_tensor(expr, dim, degrees=degrees, n_elements=n_elements,
+                            evaluate=evaluate)
+
+    # ...
+    if mapping and human:
+        expr = _phase('mapping',
+                      lambda: SymbolicExpr(expr * SymbolicDeterminant(mapping)),
+                      expr, substitutions=1)
     # ...
-    atoms = list(expr.atoms(TensorExpr))
+
+    return expr
+
+#==============================================================================
+def _gelatize_tensor(expr, dim, degrees=None, n_elements=None, evaluate=False):
+    """
+    Replaces the 1d forms of a tensor expression by their GLT symbols and
+    substitutes the degrees and number of elements. Every phase builds one
+    replacement map, applied in a single traversal of the expression.
+    """
+    # ... unwrap the TensorExpr nodes, nested nodes need another pass
+    atoms = expr.atoms(TensorExpr)
     if atoms:
-        for i in atoms:
-            expr = expr.subs(i, i._args[0])
+        expr = _phase('unwrap', lambda: _unwrap(expr, atoms), expr,
+                      substitutions=len(atoms))
+    # ...
+
+    # ... symbolic degree, ncells, fourier variables
+    ps, ns, ts = _glt_variables(dim)
+    # ...
+
+    # ... all the 1d forms are replaced in a single traversal
+    rules = _form_rules(expr.atoms(Basic1dForm), ps, ns, ts, evaluate=evaluate)
+    if rules:
+        expr = _phase('forms', lambda: expr.xreplace(rules), expr,
+                      substitutions=len(rules))
     # ...
 
+    # ...
+    if not( n_elements is None ):
+
+        if isinstance(n_elements, int):
+            n_elements = [n_elements]*dim
+
+        if not( len(ns) == len(n_elements) ):
+            raise ValueError('Wrong size for n_elements')
+
+        rules = {n: sympify(v) for n,v in zip(ns, n_elements)}
+        expr  = _phase('n_elements', lambda: expr.xreplace(rules), expr,
+                       substitutions=len(rules))
+    # ...
+
+    # ... get the degree, the symbols are evaluated when rebuilt
+    if not( degrees is None ):
+        if not isinstance(degrees, (tuple, list, Tuple)):
+            degrees = [degrees]
+
+        assert(len(degrees) == len(ps))
+
+        rules = {p: sympify(v) for p,v in zip(ps, degrees)}
+        expr  = _phase('degrees', lambda: expr.xreplace(rules), expr,
+                       substitutions=len(rules))
+    # ...
+
+    return expr
+
+def _glt_variables(dim):
+    """Returns the symbolic degrees, numbers of elements and Fourier variables."""
     # ... coordinates as strings
     coordinates = ['x', 'y', 'z'][:dim]
     # ...
 
-    # ... symbolic degree, ncells, fourier variables
     ps = [Symbol('p{}'.format(i), integer=True) for i in coordinates]
     ns = [Symbol('n{}'.format(i), integer=True) for i in coordinates]
     ts = [Symbol('t{}'.format(i))               for i in coordinates]
-    # ...
 
-    # ...
-    forms = list(expr.atoms(Basic1dForm))
+    return ps, ns, ts
+
+def _form_rules(forms, ps, ns, ts, evaluate=False):
+    """Returns the map of the 1d forms to their GLT symbols."""
+    rules = {}
     for form in forms:
 
         p = ps[form.axis]
@@ -63,74 +313,59 @@ def gelatize(a, degrees=None, n_elements=None, evaluate=False, mapping=None,
 
         if isinstance(form, MassForm):
             symbol = Mass(p, t, evaluate=evaluate)
-            expr = expr.subs(form, symbol / n)
+            rules[form] = symbol / n
 
         elif isinstance(form, StiffnessForm):
             symbol = Stiffness(p, t, evaluate=evaluate)
-            expr = expr.subs(form, symbol * n)
+            rules[form] = symbol * n
 
         elif isinstance(form, AdvectionForm):
             symbol = sympy_I * Advection(p, t, evaluate=evaluate)
-            expr = expr.subs(form, symbol)
+            rules[form] = symbol
 
         elif isinstance(form, AdvectionTForm):
             symbol = - sympy_I * Advection(p, t, evaluate=evaluate)
-            expr = expr.subs(form, symbol)
+            rules[form] = symbol
 
         elif isinstance(form, BilaplacianForm):
             symbol = Bilaplacian(p, t, evaluate=evaluate)
-            expr = expr.subs(form, symbol * n**3)
+            rules[form] = symbol * n**3
 
         else:
             raise NotImplementedError('{} not available yet'.format(type(form)))
-    # ...
-
-    # ...
-    if not( n_elements is None ):
-
-        if isinstance(n_elements, int):
-            n_elements = [n_elements]*dim
-
-        if not( len(ns) == len(n_elements) ):
-            raise ValueError('Wrong size for n_elements')
 
-        for n,v in zip(ns, n_elements):
-            expr = expr.subs(n, v)
-    # ...
+    return rules
 
-    # ... get the degree
-    if not( degrees is None ):
-        if not isinstance(degrees, (tuple, list, Tuple)):
-            degrees = [degrees]
+def _unwrap(expr, atoms):
+    # the nested nodes appear once their parents are removed
+    while atoms:
+        expr  = expr.xreplace({i: i._args[0] for i in atoms})
+        atoms = expr.atoms(TensorExpr)
 
-        assert(len(degrees) == len(ps))
+    return expr
 
-        atoms = list(expr.atoms(BasicGlt))
+#==============================================================================
+def _as_key(v):
+    if isinstance(v, (tuple, list, Tuple)):
+        return tuple(int(i) for i in v)
 
-        d = {}
-        for p,v in zip(ps, degrees):
-            d[p] = v
-
-        for atom in atoms:
-            p,t = atom.args[:]
-            newp = d[p]
-            newatom = atom.func(newp, t)
-            expr = expr.subs(atom, newatom)
-    # ...
+    return v
 
-    # ...
-    if mapping and human:
-        expr *= SymbolicDeterminant(mapping)
-        expr  = SymbolicExpr(expr)
-    # ...
+def _coordinates(form):
+    # in 1d, sympde gives the coordinate itself
+    coordinates = form.coordinates
+    if not isinstance(coordinates, (tuple, list, Tuple)):
+        coordinates = [coordinates]
 
-    return expr
+    return list(coordinates)
 
 #==============================================================================
-# TODO add __call__
 class GltExpr(Expr):
     is_Function = True
 
+    # maximum number of gelatized forms and kernels memoized by an instance
+    CACHE_SIZE = 32
+
     def __new__(cls, form):
 
         assert(isinstance(form, BilinearForm))
@@ -141,7 +376,7 @@ class GltExpr(Expr):
         fourier_vars = [Symbol(i) for i in ['tx', 'ty', 'tz'][:dim]]
 #        space_vars   = [Symbol(i) for i in ['x', 'y', 'z'][:dim]]
         atoms  = form.atoms(Symbol)
-        space_vars   = [i for i in atoms if i in form.coordinates]
+        space_vars   = [i for i in atoms if i in _coordinates(form)]
         # ...
 
         return Basic.__new__(cls, fourier_vars, space_vars, form)
@@ -164,7 +399,7 @@ class GltExpr(Expr):
 
     @property
     def coordinates(self):
-        return self.form.coordinates
+        return _coordinates(self.form)
 
     @property
     def fields(self):
@@ -174,6 +409,75 @@ class GltExpr(Expr):
     def constants(self):
         return self.form.constants
 
+    def _cache(self, name):
+        # caches are created lazily, since sympy does not call __init__
+        try:
+            return self.__dict__[name]
+
+        except KeyError:
+            cache = LRUCache(maxsize=self.CACHE_SIZE)
+            self.__dict__[name] = cache
+            return cache
+
+    def gelatize(self, degrees=None, n_elements=None, mapping=None, human=True):
+        """
+        Returns the evaluated gelatized form. The result is memoized per
+        (degrees, n_elements, mapping, human), see clear_cache.
+        """
+        key = (_as_key(degrees), _as_key(n_elements), mapping, human)
+
+        return self._cache('_symbols').get_or_compute(key,
+                    lambda: gelatize(self.form,
+                                     degrees = degrees, n_elements = n_elements,
+                                     mapping = mapping, human = human,
+                                     evaluate = True))
+
+    def separable_symbol(self, mapping=None):
+        """
+        Returns the symbol gelatized with symbolic degrees and numbers of
+        elements, whose 1d symbols are not evaluated. It is memoized and can
+        be split with gelato.separable.glt_terms.
+
+        With a mapping, the symbol is written with the symbols of the
+        Jacobian matrix and of its determinant, see gelato.mapping.
+        """
+        if mapping is None:
+            return self._cache('_symbols').get_or_compute('separable',
+                        lambda: gelatize(self.form, evaluate=False))
+
+        return self._cache('_symbols').get_or_compute(('separable', mapping),
+                    lambda: gelatize(self.form, evaluate=False,
+                                     mapping = abstract_mapping(mapping),
+                                     human = True, expand = True))
+
+    def trig_polynomial(self, degrees, n_elements, exact=False, **values):
+        """
+        Returns the symbol as a gelato.trigpoly.TrigPolynomial, for given
+        degrees, numbers of elements and values of the constants.
+        """
+        if self.fields:
+            raise NotImplementedError('Fields are not available yet')
+
+        dim = self.ldim
+        ns  = [Symbol('n{}'.format(i), integer=True) for i in ['x', 'y', 'z'][:dim]]
+
+        if isinstance(n_elements, int):
+            n_elements = [n_elements]*dim
+
+        expr = self.separable_symbol()
+        expr = expr.xreplace({n: sympify(v) for n,v in zip(ns, n_elements)})
+
+        return trig_polynomial(expr, dim, degrees, exact=exact, **values)
+
+    def clear_cache(self):
+        """Removes the memoized gelatized forms and compiled kernels."""
+        self._cache('_symbols').clear()
+        self._cache('_kernels').clear()
+
+    def cache_info(self):
+        """Returns the statistics of the cache of the gelatized forms."""
+        return self._cache('_symbols').info()
+
     def __call__(self, *args, **kwargs):
 
         mapping    = kwargs.pop('mapping',    None)
@@ -181,16 +485,110 @@ class GltExpr(Expr):
         degrees    = kwargs.pop('degrees',    None)
         n_elements = kwargs.pop('n_elements', None)
 
-        expr =  gelatize( self.form,
-                          degrees = degrees, n_elements = n_elements,
-                          mapping = mapping, human = human, evaluate = True)
+        expr = self.gelatize(degrees = degrees, n_elements = n_elements,
+                             mapping = mapping, human = human)
 
         dim = self.ldim
 
-        for i in ['tx', 'ty', 'tz'][:dim] +  ['x', 'y', 'z'][:dim]:
+        # ... the space variables x, y, z stand for the coordinates of the form
+        variables  = [Symbol(i) for i in ['tx', 'ty', 'tz'][:dim]]
+        variables += list(self.coordinates)[:dim]
+
+        d = {}
+        for i,S in zip(['tx', 'ty', 'tz'][:dim] +  ['x', 'y', 'z'][:dim], variables):
             I = kwargs.pop(i, None)
             if not(I is None):
-                S = Symbol(i)
-                expr = expr.subs(S, I)
+                d[S] = I
+
+        if d:
+            expr = expr.subs(d)
+        # ...
 
         return expr
+
+    def compile(self, degrees=None, n_elements=None, backend='numpy',
+                mapping=None):
+        """
+        Returns a vectorized numeric kernel of the symbol, see
+        gelato.kernel.GltKernel. Kernels are cached on the instance.
+
+        degrees: int, list, tuple
+            spline degree for every axis
+
+        n_elements: int, list, tuple
+            number of elements for every axis. If None, nx, ny, nz are
+            arguments of the kernel.
+
+        backend: str
+            'numpy' (default) or 'sympy'
+
+        mapping: sympde.topology.Mapping
+            an analytical mapping of the domain of the form. The kernel is
+            then evaluated on logical coordinates, see gelato.mapping.
+
+        Examples
+
+        >>> f = glt.compile(degrees=[2,2], n_elements=[16,16])
+        >>> f(tx=tx, ty=ty, c=1.)
+        """
+        if self.fields:
+            raise NotImplementedError('Fields are not available yet')
+
+        key = (_as_key(degrees), _as_key(n_elements), backend, mapping)
+
+        return self._cache('_kernels').get_or_compute(key,
+                    lambda: GltKernel(self.separable_symbol(mapping),
+                                      self.ldim, degrees,
+                                      n_elements  = n_elements,
+                                      coordinates = self.coordinates,
+                                      constants   = self.constants,
+                                      backend     = backend,
+                                      mapping     = mapping))
+
+    def sweep(self, degrees, n_elements, **kwargs):
+        """
+        Evaluates the symbol for every degree and number of elements, see
+        gelato.sweep.sweep_symbol. The form is gelatized once. Returns an
+        array indexed by (degree, number of elements, tx, ty, tz).
+
+        degrees: list
+            the degrees, every entry being an int or a tuple of ints
+
+        n_elements: list
+            the numbers of elements, every entry being an int or a tuple of
+            ints
+
+        kwargs: dict
+            tx, ty, tz: 1d arrays of Fourier variables, or an int m for the
+            grid t_j = j*pi/m. The space variables x, y, z and the constants
+            are given by name.
+
+        Examples
+
+        >>> glt.sweep([1, 2, 3], [16, 32], tx=64, ty=64, c=1.).shape
+        (3, 2, 65, 65)
+        """
+        if self.fields:
+            raise NotImplementedError('Fields are not available yet')
+
+        dim = self.ldim
+
+        ts = []
+        for i in ['tx', 'ty', 'tz'][:dim]:
+            try:
+                ts.append(kwargs.pop(i))
+
+            except KeyError:
+                raise TypeError('> Missing argument {}'.format(i))
+
+        # ... the space variables x, y, z stand for the coordinates of the form
+        values = {}
+        for i,S in zip(['x', 'y', 'z'][:dim], list(self.coordinates)[:dim]):
+            if i in kwargs:
+                values[S] = kwargs.pop(i)
+
+        values.update(kwargs)
+        # ...
+
+        return sweep_symbol(self.separable_symbol(), dim, degrees, n_elements,
+                            ts, values=values)
@@ -1,239 +1,172 @@
 # -*- coding: utf-8 -*-
 #
 #
-# TODO: - add tabulation for Bilaplacian
 
 """This module contains different functions to create and treate the GLT symbols."""
 
 from sympy import Symbol
 from sympy import Function
-from sympy import bspline_basis
-from sympy import sympify
-from sympy import lambdify
+from sympy import Add
 from sympy import cos
 from sympy import sin
 from sympy import Rational
-from sympy import diff
+from sympy import Integer
+from sympy import sympify
 from sympy import I as sympy_I
 from sympy.core import Basic
 from sympy.core.singleton import S
-from sympy.simplify.simplify import nsimplify
-from sympy import Tuple
-from sympy import Rational
 
-from itertools import product
-
-# ............................................
-# tabular values
-# ............................................
-P_MAX = 8
-
-# ... phi_{2p+1}
-d_phi = {}
-d_phi[1] = [Rational(2,3),
-            Rational(1,6)]
-d_phi[2] = [Rational(11,20),
-            Rational(13,60),
-            Rational(1,120)]
-d_phi[3] = [Rational(151,315),
-            Rational(397,1680),
-            Rational(1,42),
-            Rational(1,5040)]
-d_phi[4] = [Rational(15619,36288),
-            Rational(44117,181440),
-            Rational(913,22680),
-            Rational(251,181440),
-            Rational(1,362880)]
-d_phi[5] = [Rational(655177,1663200),
-            Rational(1623019,6652800),
-            Rational(1093,19800),
-            Rational(50879,13305600),
-            Rational(509,9979200),
-            Rational(1,39916800)]
-d_phi[6] = [Rational(27085381,74131200),
-            Rational(125468459,518918400),
-            Rational(28218769,415134720),
-            Rational(910669,124540416),
-            Rational(82207,345945600),
-            Rational(1363,1037836800),
-            Rational(1,6227020800)]
-d_phi[7] = [Rational(2330931341,6810804000),
-            Rational(103795866137,435891456000),
-            Rational(6423562433,81729648000),
-            Rational(15041229521,1307674368000),
-            Rational(26502841,40864824000),
-            Rational(13824739,1307674368000),
-            Rational(2047,81729648000),
-            Rational(1,1307674368000)]
-d_phi[8] = [Rational(12157712239,37638881280),
-            Rational(8313722318537,35568742809600),
-            Rational(7763913237097,88921857024000),
-            Rational(317627331799,19760412672000),
-            Rational(23667665053,17784371404800),
-            Rational(297507989,7113748561920),
-            Rational(704339,1976041267200),
-            Rational(851,2309658624000),
-            Rational(1,355687428096000)]
-# ...
+from collections.abc import Mapping
+from functools import lru_cache
+
+from .cache  import LRUCache
+from .tables import P_MAX, tabulated, check_order, exact_table
+from . import numeric
+
+__all__ = ('P_MAX',
+           'd_phi',
+           'd_phi_r',
+           'd_phi_rr',
+           'rational_table',
+           'SYMBOL_CACHE_SIZE',
+           'glt_symbol',
+           'symbol_cache_info',
+           'clear_symbol_cache',
+           'BasicGlt',
+           'Mass',
+           'Stiffness',
+           'Advection',
+           'Bilaplacian',
+           'GltSymbol',
+           'glt_pair')
+
+#==============================================================================
+class _RationalTable(Mapping):
+    """
+    The hard-coded table of a derivative order, as a read-only mapping
+    p -> [phi_0, ..., phi_p] of sympy Rational numbers, for p <= P_MAX. The
+    Rational numbers are built on first access, from the packed integer
+    tables of gelato.tables.
+    """
 
-# ... phi'_{2p+1}
-d_phi_r = {}
-d_phi_r[1] = [0,
-              Rational(1,2)]
-d_phi_r[2] = [0,
-              Rational(5,12),
-              Rational(1,24)]
-d_phi_r[3] = [0,
-              Rational(49,144),
-              Rational(7,90),
-              Rational(1,720)]
-d_phi_r[4] = [0,
-              Rational(809,2880),
-              Rational(289,2880),
-              Rational(41,6720),
-              Rational(1,40320)]
-d_phi_r[5] = [0,
-              Rational(6787,28800),
-              Rational(16973,151200),
-              Rational(5203,403200),
-              Rational(253,907200),
-              Rational(1,3628800)]
-d_phi_r[6] = [0,
-              Rational(728741,3628800),
-              Rational(1700933,14515200),
-              Rational(441337,21772800),
-              Rational(10777,10886400),
-              Rational(2041,239500800),
-              Rational(1,479001600)]
-d_phi_r[7] = [0,
-              Rational(35263201,203212800),
-              Rational(4489301,38102400),
-              Rational(5532241,203212800),
-              Rational(233021,104781600),
-              Rational(6323,121927680),
-              Rational(31,165110400),
-              Rational(1,87178291200)]
-d_phi_r[8] = [0,
-              Rational(11102502613,73156608000),
-              Rational(8480306503,73156608000),
-              Rational(7939969,238436352),
-              Rational(3146582819,804722688000),
-              Rational(353015251,2092278988800),
-              Rational(775319,387459072000),
-              Rational(32759,10461394944000),
-              Rational(1,20922789888000)]
-# ...
+    def __init__(self, order):
+        self._order = order
 
-# ... phi''_{2p+1}
-d_phi_rr = {}
-d_phi_rr[1] = [-2,
-               1]
-d_phi_rr[2] = [-1,
-               Rational(1,3),
-               Rational(1,6)]
-d_phi_rr[3] = [Rational(-2,3),
-               Rational(1,8),
-               Rational(1,5),
-               Rational(1,120)]
-d_phi_rr[4] = [Rational(-35,72),
-               Rational(11,360),
-               Rational(17,90),
-               Rational(59,2520),
-               Rational(1,5040)]
-d_phi_rr[5] = [Rational(-809,2160),
-               Rational(-1,64),
-               Rational(31,189),
-               Rational(907,24192),
-               Rational(25,18144),
-               Rational(1,362880)]
-d_phi_rr[6] = [Rational(-4319,14400),
-               Rational(-11731,302400),
-               Rational(6647,48384),
-               Rational(3455,72576),
-               Rational(2251,604800),
-               Rational(113,2217600),
-               Rational(1,39916800)]
-d_phi_rr[7] = [Rational(-56057,226800),
-               Rational(-104159,2073600),
-               Rational(43993,388800),
-               Rational(333361,6220800),
-               Rational(14623,2138400),
-               Rational(16081,68428800),
-               Rational(73,55598400),
-               Rational(1,6227020800)]
-d_phi_rr[8] = [Rational(-35263201,169344000),
-               Rational(-253354477,4572288000),
-               Rational(30188519,326592000),
-               Rational(44897821,798336000),
-               Rational(36700199,3592512000),
-               Rational(58605299,93405312000),
-               Rational(382201,36324288000),
-               Rational(131,5230697472),
-               Rational(1,1307674368000)]
+    def __getitem__(self, p):
+        if tabulated(p, self._order) is None:
+            raise KeyError(p)
+
+        return list(rational_table(p, self._order))
+
+    def __iter__(self):
+        return iter(range(1, P_MAX+1))
+
+    def __len__(self):
+        return P_MAX
+
+# ... phi_{2p+1}, phi'_{2p+1}, phi''_{2p+1}
+d_phi    = _RationalTable(0)
+d_phi_r  = _RationalTable(1)
+d_phi_rr = _RationalTable(2)
 # ...
 
-## ...
-#d_phi[1] = [Rational(,),
-#            Rational(,)]
-#d_phi[2] = [Rational(,),
-#            Rational(,),
-#            Rational(,)]
-#d_phi[3] = [Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,)]
-#d_phi[4] = [Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,)]
-#d_phi[5] = [Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,)]
-#d_phi[6] = [Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,)]
-#d_phi[7] = [Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,)]
-#d_phi[8] = [Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,),
-#            Rational(,)]
-## ...
-
-# ............................................
-
-# TODO add it to glt_function
-TOLERANCE    = 1.e-10
+#==============================================================================
+@lru_cache(maxsize=None)
+def rational_table(p, order):
+    """
+    Returns the coefficients (phi_0, ..., phi_p) of the derivative of a given
+    order of the B-spline of degree 2p+1, as sympy Rational numbers.
+    The hard-coded tables are used for p <= P_MAX, otherwise the values are
+    taken from gelato.tables.exact_table.
+    """
+    table = tabulated(p, order)
+    if not( table is None ):
+        numerators, denominators, values = table
+        return tuple(Rational(n, d) for n, d in zip(numerators.tolist(),
+                                                    denominators.tolist()))
+
+    return tuple(Rational(c.numerator, c.denominator)
+                 for c in exact_table(p, order))
 
+#==============================================================================
+def _build_symbol(p, t, order):
+    """
+    Builds the trigonometric polynomial of the GLT symbol of a given
+    derivative order, for an integer degree p.
+
+    For an even order k, the symbol is
+
+        (-1)**(k/2) * (phi_0 + 2 sum_{i=1}^p phi_i cos(i t))
+
+    and for an odd order k, it is
+
+        (-1)**((k+1)/2) * 2 sum_{i=1}^p phi_i sin(i t)
+
+    so that it behaves like (-t)**k for small t.
+    """
+    phi  = rational_table(p, order)
+    sign = (-1)**((order + 1) // 2)
+
+    # ...
+    if order % 2 == 0:
+        terms = [sign * phi[0]]
+        terms += [sign * 2 * phi[i] * cos(i * t) for i in range(1, p+1)]
+
+    else:
+        terms = [sign * 2 * phi[i] * sin(i * t) for i in range(1, p+1)]
+    # ...
+
+    return Add(*terms)
+
+#==============================================================================
+# memoized symbols, keyed on (order, p, t)
+SYMBOL_CACHE_SIZE = 1024
+_symbol_cache = LRUCache(maxsize=SYMBOL_CACHE_SIZE)
+
+def glt_symbol(p, t, order):
+    """
+    Returns the trigonometric polynomial of the GLT symbol of a given
+    derivative order, for an integer degree p.
+
+    The expressions are memoized in a bounded cache, which does not depend
+    on the sympy cache. See symbol_cache_info and clear_symbol_cache.
+    """
+    p, order = check_order(p, order)
+
+    return _symbol_cache.get_or_compute((order, p, t),
+                                        lambda: _build_symbol(p, t, order))
+
+def symbol_cache_info():
+    """
+    Returns the hits, misses, maxsize and current size of the cache of the
+    symbols.
+    """
+    return _symbol_cache.info()
+
+def clear_symbol_cache():
+    """Empties the cache of the symbols and resets its counters."""
+    _symbol_cache.clear()
+
+#==============================================================================
 class BasicGlt(Function):
     """
+    Base class for the GLT symbols of the 1d mass, stiffness, advection and
+    bilaplacian matrices. The integer attribute order gives the total
+    derivative order of the associated bilinear form.
 
     Examples
 
+    >>> from sympy import Symbol
+    >>> t = Symbol('t')
+    >>> Mass(1, t)
+    cos(t)/3 + 2/3
     """
     nargs = None
+    order = None
 
     def __new__(cls, *args, **options):
         # (Try to) sympify args first
+        args = [sympify(a) for a in args]
 
         if options.pop('evaluate', True):
             r = cls.eval(*args)
@@ -245,6 +178,32 @@ class BasicGlt(Function):
         else:
             return r
 
+    @classmethod
+    def eval(cls, p, t):
+
+        if p is S.Infinity:
+            raise NotImplementedError('Add symbol limit for p -> oo')
+
+        elif isinstance(p, Symbol):
+            return cls(p, t, evaluate=False)
+
+        elif isinstance(p, (int, Integer)):
+            return glt_symbol(int(p), t, cls.order)
+
+    @classmethod
+    def numeric(cls, p, t, out=None, method='auto'):
+        """
+        Evaluates the symbol of degree p on an array of Fourier variables,
+        without sympy. See gelato.numeric.glt_symbol.
+
+        method is 'cosine' for the cosine or sine series, 'sinc' for the
+        closed-form sinc series of gelato.numeric.sinc_series, whose cost
+        does not depend on p, or 'auto', which picks the sinc series for the
+        mass, advection and stiffness symbols from the degree
+        gelato.numeric.SINC_THRESHOLD.
+        """
+        return numeric.glt_symbol(p, t, cls.order, out=out, method=method)
+
     @property
     def name(self):
         return self._name
@@ -265,55 +224,8 @@ class Mass(BasicGlt):
     A class for the mass symbol
     """
     nargs = 2
+    order = 0
     _name = 'Mass'
-
-    @classmethod
-    def eval(cls, p, t):
-
-        if p is S.Infinity:
-            raise NotImplementedError('Add symbol limit for p -> oo')
-
-        elif isinstance(p, Symbol):
-            return Mass(p, t, evaluate=False)
-
-        elif isinstance(p, int):
-
-            # ... we use nsimplify to get the rational number
-            if p <= P_MAX:
-                phi = d_phi[p]
-
-            else:
-                # ...
-                r  = Symbol('r')
-
-                pp = 2*p + 1
-                N = pp + 1
-                L = list(range(0, N + pp + 1))
-
-                b0 = bspline_basis(pp, L, 0, r)
-                bsp = lambdify(r, b0)
-                # ...
-
-                phi = []
-                for i in range(0, p+1):
-                    y = bsp(p+1-i)
-                    y = nsimplify(y, tolerance=TOLERANCE, rational=True)
-                    phi.append(y)
-            # ...
-
-            # ...
-            m = phi[0] * cos(S.Zero)
-            for i in range(1, p+1):
-                m += 2 * phi[i] * cos(i * t)
-            # ...
-#            print(phi)
-#            print('> mass = ', m)
-
-#            # hack to avoid
-#            # sympy.tensor.array.dense_ndim_array.ImmutableDenseNDimArray
-#            m = sympify(str(m))
-
-            return m
 # ...
 
 # ...
@@ -322,57 +234,8 @@ class Stiffness(BasicGlt):
     A class for the stiffness symbol
     """
     nargs = 2
+    order = 2
     _name = 'Stiffness'
-
-    @classmethod
-    def eval(cls, p, t):
-
-        if p is S.Infinity:
-            raise NotImplementedError('Add symbol limit for p -> oo')
-
-        elif isinstance(p, Symbol):
-            return Stiffness(p, t, evaluate=False)
-
-        elif isinstance(p, int):
-
-            if p <= P_MAX:
-                phi = d_phi_rr[p]
-
-            else:
-                # ...
-                r  = Symbol('r')
-
-                pp = 2*p + 1
-                N = pp + 1
-                L = list(range(0, N + pp + 1))
-
-                b0    = bspline_basis(pp, L, 0, r)
-                b0_r  = diff(b0, r)
-                b0_rr = diff(b0_r, r)
-                bsp   = lambdify(r, b0_rr)
-                # ...
-
-                # ... we use nsimplify to get the rational number
-                phi = []
-                for i in range(0, p+1):
-                    y = bsp(p+1-i)
-                    y = nsimplify(y, tolerance=TOLERANCE, rational=True)
-                    phi.append(y)
-                # ...
-
-            # ...
-            m = -phi[0] * cos(S.Zero)
-            for i in range(1, p+1):
-                m += -2 * phi[i] * cos(i * t)
-            # ...
-
-#            print('> stiffness = ', m)
-
-#            # hack to avoid
-#            # sympy.tensor.array.dense_ndim_array.ImmutableDenseNDimArray
-#            m = sympify(str(m))
-
-            return m
 # ...
 
 # ...
@@ -381,56 +244,8 @@ class Advection(BasicGlt):
     A class for the advection symbol
     """
     nargs = 2
+    order = 1
     _name = 'Advection'
-
-    @classmethod
-    def eval(cls, p, t):
-
-        if p is S.Infinity:
-            raise NotImplementedError('Add symbol limit for p -> oo')
-
-        elif isinstance(p, Symbol):
-            return Advection(p, t, evaluate=False)
-
-        elif isinstance(p, int):
-
-            if p <= P_MAX:
-                phi = d_phi_r[p]
-
-            else:
-                # ...
-                r  = Symbol('r')
-
-                pp = 2*p + 1
-                N = pp + 1
-                L = list(range(0, N + pp + 1))
-
-                b0   = bspline_basis(pp, L, 0, r)
-                b0_r = diff(b0, r)
-                bsp  = lambdify(r, b0_r)
-                # ...
-
-                # ... we use nsimplify to get the rational number
-                phi = []
-                for i in range(0, p+1):
-                    y = bsp(p+1-i)
-                    y = nsimplify(y, tolerance=TOLERANCE, rational=True)
-                    phi.append(y)
-                # ...
-
-            # ...
-            m = -phi[0] * cos(S.Zero)
-            for i in range(1, p+1):
-                m += -2 * phi[i] * sin(i * t)
-            # ...
-
-#            print('> advection = ', m)
-
-#            # hack to avoid
-#            # sympy.tensor.array.dense_ndim_array.ImmutableDenseNDimArray
-#            m = sympify(str(m))
-
-            return m
 # ...
 
 # ...
@@ -439,59 +254,74 @@ class Bilaplacian(BasicGlt):
     A class for the bilaplacian symbol
     """
     nargs = 2
+    order = 4
     _name = 'Bilaplacian'
+# ...
+
+# ...
+class GltSymbol(BasicGlt):
+    """
+    A class for the symbol of a given derivative order, between 0 and 2p.
+
+    The bilinear form with the derivatives of order r of the trial function
+    and s of the test function has the symbol I**(r-s) * GltSymbol(p, t, r+s).
+    Mass, Advection, Stiffness and Bilaplacian are the orders 0, 1, 2 and 4.
+    """
+    nargs = 3
+    _name = 'GltSymbol'
 
     @classmethod
-    def eval(cls, p, t):
+    def eval(cls, p, t, order):
 
         if p is S.Infinity:
             raise NotImplementedError('Add symbol limit for p -> oo')
 
         elif isinstance(p, Symbol):
-            return Bilaplacian(p, t, evaluate=False)
+            return cls(p, t, order, evaluate=False)
 
-        elif isinstance(p, int):
+        elif isinstance(p, (int, Integer)):
+            return glt_symbol(int(p), t, int(order))
 
-            if p <= P_MAX:
-                raise NotImplementedError('Bilaplacian table not available')
-#                phi = d_phi_rrrr[p]
+    @classmethod
+    def numeric(cls, p, t, order, out=None, method='auto'):
+        """
+        Evaluates the symbol of degree p and a given derivative order on an
+        array of Fourier variables, without sympy. See BasicGlt.numeric for
+        the method.
+        """
+        return numeric.glt_symbol(p, t, order, out=out, method=method)
 
-            else:
+    @property
+    def order(self):
+        return self.args[2]
 
-                # ...
-                r  = Symbol('r')
+    def _sympystr(self, printer):
+        sstr = printer.doprint
 
-                pp = 2*p + 1
-                N = pp + 1
-                L = list(range(0, N + pp + 1))
+        name  = sstr(self.name)
+        p     = sstr(self.args[0])
+        t     = sstr(self.args[1])
+        order = sstr(self.args[2])
 
-                b0    = bspline_basis(pp, L, 0, r)
-                b0_r  = diff(b0, r)
-                b0_rr = diff(b0_r, r)
-                b0_rrr = diff(b0_rr, r)
-                b0_rrrr = diff(b0_rrr, r)
-                bsp   = lambdify(r, b0_rrrr)
-                # ...
+        return '{name}({p},{t},{order})'.format(name=name, p=p, t=t, order=order)
+# ...
 
-                # ... we use nsimplify to get the rational number
-                phi = []
-                for i in range(0, p+1):
-                    y = bsp(p+1-i)
-                    y = nsimplify(y, tolerance=TOLERANCE, rational=True)
-                    phi.append(y)
-                # ...
+#==============================================================================
+def glt_pair(p, t, trial, test):
+    """
+    Returns the symbol of the 1d bilinear form involving the derivative of
+    order trial of the trial function and of order test of the test function.
 
-            # ...
-            m = phi[0] * cos(S.Zero)
-            for i in range(1, p+1):
-                m += 2 * phi[i] * cos(i * t)
-            # ...
+    p: int, Symbol
+        spline degree
 
-#            print('> bilaplacian = ', m)
+    t: Symbol
+        Fourier variable
 
-#            # hack to avoid
-#            # sympy.tensor.array.dense_ndim_array.ImmutableDenseNDimArray
-#            m = sympify(str(m))
+    trial: int
+        derivative order of the trial function
 
-            return m
-# ...
+    test: int
+        derivative order of the test function
+    """
+    return sympy_I**(trial - test) * GltSymbol(p, t, trial + test)
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module turns gelatized symbols into vectorized numeric kernels."""
+
+import numpy as np
+
+from sympy import Symbol
+from sympy import lambdify
+
+from .numeric   import glt_symbol
+from .separable import glt_terms, sample_terms, fourier_variables
+from .mapping   import mapping_symbols, mapping_grid
+
+__all__ = ('GltKernel',)
+
+#==============================================================================
+def _as_tuple(v, dim):
+    if v is None:
+        return None
+
+    if isinstance(v, (tuple, list)):
+        if not( len(v) == dim ):
+            raise ValueError('> Expecting {} values, given {}'.format(dim, len(v)))
+
+        return tuple(int(i) for i in v)
+
+    return (int(v),)*dim
+
+#==============================================================================
+class GltKernel(object):
+    """
+    A numeric kernel evaluating a gelatized symbol on NumPy arrays.
+
+    The kernel is called with the Fourier variables tx, ty, tz, the logical
+    coordinates x, y, z and the constants of the form, given as keyword
+    arguments (or positionally in this order). All arrays are broadcast
+    together.
+
+    expr: sympy.Expr
+        the output of gelatize, computed without degrees
+
+    dim: int
+        the dimension of the form
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    n_elements: int, list, tuple
+        number of elements for every axis. If None, nx, ny, nz are arguments
+        of the kernel.
+
+    coordinates: list
+        the coordinates of the form
+
+    constants: list
+        the constants of the form
+
+    backend: str
+        'numpy' evaluates the separable terms of the symbol, sampling every
+        1d symbol once with gelato.numeric; 'sympy' lambdifies the whole
+        evaluated symbol.
+
+    mapping: sympde.topology.Mapping
+        an analytical mapping, if the symbol was gelatized on a mapped
+        domain (see GltExpr.separable_symbol). The space arguments are then
+        logical coordinates, on which the Jacobian matrix is evaluated once
+        per call, see gelato.mapping.
+    """
+
+    def __init__(self, expr, dim, degrees, n_elements=None, coordinates=(),
+                 constants=(), backend='numpy', mapping=None):
+
+        if not( backend in ('numpy', 'sympy') ):
+            raise ValueError('> Unknown backend {}'.format(backend))
+
+        self._dim        = dim
+        self._degrees    = _as_tuple(degrees, dim)
+        self._n_elements = _as_tuple(n_elements, dim)
+        self._backend    = backend
+        self._mapping    = mapping
+
+        if self._degrees is None:
+            raise ValueError('> degrees must be given')
+
+        # ... arguments
+        ts = fourier_variables(dim)
+        ns = [Symbol('n{}'.format(i), integer=True) for i in ['x', 'y', 'z'][:dim]]
+        ps = [Symbol('p{}'.format(i), integer=True) for i in ['x', 'y', 'z'][:dim]]
+
+        self._fourier_names = [str(i) for i in ts]
+        self._space_names   = ['x', 'y', 'z'][:dim]
+        self._const_names   = [str(i) for i in constants]
+        self._n_names       = [] if self._n_elements else [str(i) for i in ns]
+
+        coordinates = list(coordinates)
+        symbols     = coordinates + list(constants)
+        if not self._n_elements:
+            symbols += ns
+
+        # ... the symbols of the mapping are computed from the coordinates
+        self._mapping_symbols = []
+        if not( mapping is None ):
+            jacobian, determinant = mapping_symbols(mapping)
+            self._mapping_symbols = [s for row in jacobian for s in row] + [determinant]
+            symbols = symbols + self._mapping_symbols
+        # ...
+
+        self._coordinates = coordinates
+        self._arguments   = symbols
+        # ...
+
+        if self._n_elements:
+            expr = expr.subs(dict(zip(ns, self._n_elements)))
+
+        if backend == 'numpy':
+            terms = glt_terms(expr, dim)
+
+            self._terms  = terms
+            self._coeffs = [self._lambdify(t.coeff) for t in terms]
+
+        else:
+            expr = expr.subs(dict(zip(ps, self._degrees)))
+            self._func = lambdify(ts + symbols, expr, 'numpy')
+
+            # ... the arguments the symbol depends on must be given
+            names = self._space_names + self._const_names + self._n_names
+            names = dict(zip(self._arguments, names))
+            self._required = set(name for s,name in names.items() if expr.has(s))
+            # ...
+
+    @property
+    def dim(self):
+        return self._dim
+
+    @property
+    def degrees(self):
+        return self._degrees
+
+    @property
+    def n_elements(self):
+        return self._n_elements
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @property
+    def mapping(self):
+        return self._mapping
+
+    @property
+    def argument_names(self):
+        """Names of the arguments, in the positional order."""
+        return (self._fourier_names + self._space_names + self._const_names +
+                self._n_names)
+
+    def _lambdify(self, coeff):
+        unknown = coeff.free_symbols - set(self._arguments)
+        if unknown:
+            raise NotImplementedError('Cannot evaluate {}, unknown symbols '
+                                      '{}'.format(coeff, unknown))
+
+        used = [s for s in self._arguments if coeff.has(s)]
+        func = lambdify(used, coeff, 'numpy')
+        return used, func
+
+    def _parse(self, args, kwargs):
+        names = self.argument_names
+        if len(args) > len(names):
+            raise TypeError('> Too many arguments')
+
+        values = dict(zip(names, args))
+        for k,v in kwargs.items():
+            if not( k in names ):
+                raise TypeError('> Unexpected argument {}'.format(k))
+            values[k] = v
+
+        return values
+
+    def _value(self, values, name):
+        try:
+            return values[name]
+
+        except KeyError:
+            raise TypeError('> Missing argument {}'.format(name))
+
+    def _mapping_values(self, values):
+        """Values of the symbols of the mapping, on the logical coordinates."""
+        points = [self._value(values, i) for i in self._space_names]
+        d = mapping_grid(self._mapping, points).values()
+
+        return [d[s] for s in self._mapping_symbols]
+
+    def __call__(self, *args, **kwargs):
+        values = self._parse(args, kwargs)
+
+        if self._backend == 'sympy':
+            args  = [self._value(values, i) for i in self._fourier_names]
+            args += [self._value(values, i) if i in self._required else values.get(i)
+                     for i in self.argument_names[self._dim:]]
+            if self._mapping_symbols:
+                args += self._mapping_values(values)
+            return self._func(*args)
+
+        # ... 1d factors, every (axis, order) pair is evaluated once
+        def sampler(p, order, axis):
+            t = self._value(values, self._fourier_names[axis])
+            return glt_symbol(p, np.asarray(t, dtype=float), order)
+
+        samples = sample_terms(self._terms, self._degrees, [None]*self._dim,
+                               sampler=sampler)
+        # ...
+
+        # ... coefficients
+        names = self._space_names + self._const_names + self._n_names
+        names = dict(zip(self._arguments, names))
+        d = {s: values[name] for s,name in names.items() if name in values}
+
+        if self._mapping_symbols:
+            d.update(zip(self._mapping_symbols, self._mapping_values(values)))
+        # ...
+
+        result = 0
+        for (used, func), (coeff, fs) in zip(self._coeffs, samples):
+            try:
+                v = func(*[d[s] for s in used])
+
+            except KeyError as e:
+                raise TypeError('> Missing argument {}'.format(names[e.args[0]]))
+
+            for f in fs:
+                if not( f is None ):
+                    v = v * f
+
+            result = result + v
+
+        return result
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module evaluates the symbols of forms on mapped domains.
+
+With a mapping, gelatize(..., human=True) writes the symbol with the entries
+of the Jacobian matrix of the mapping (x_x1, x_x2, ...) and its determinant
+(det_M). For an analytical mapping, sympde would substitute their
+expressions, which gives large symbolic coefficients. The symbol is instead
+computed with an abstract mapping of the same name, and the Jacobian matrix
+of the analytical mapping is lambdified once and evaluated on arrays of
+logical coordinates.
+
+The Jacobian matrix, its determinant and the inverse metric are computed
+once per grid of logical coordinates and cached, so that they are shared by
+all the terms of the symbol and all the Fourier variables.
+"""
+
+import numpy as np
+
+from sympy import lambdify
+
+from sympde.topology import Mapping
+from sympde.topology import SymbolicExpr
+from sympde.topology import dx1, dx2, dx3
+from sympde.calculus.matrices import SymbolicDeterminant
+
+from .cache import LRUCache
+
+__all__ = ('abstract_mapping',
+           'mapping_symbols',
+           'MappingGrid',
+           'mapping_grid')
+
+# maximum number of grids and Jacobian functions kept in memory
+CACHE_SIZE = 8
+
+_jacobians = LRUCache(maxsize=CACHE_SIZE)
+_grids     = LRUCache(maxsize=CACHE_SIZE)
+
+#==============================================================================
+def abstract_mapping(mapping):
+    """
+    Returns the mapping without its expressions, used to gelatize the forms
+    on the domain of an analytical mapping.
+    """
+    return Mapping(mapping.name, mapping.ldim)
+
+def mapping_symbols(mapping):
+    """
+    Returns the symbols used by gelatize for the Jacobian matrix of the
+    mapping, as a list of rows, and for its determinant.
+    """
+    dim = mapping.ldim
+    ds  = [dx1, dx2, dx3][:dim]
+
+    jacobian    = [[SymbolicExpr(d(mapping[i])) for d in ds] for i in range(dim)]
+    determinant = SymbolicExpr(SymbolicDeterminant(mapping))
+
+    return jacobian, determinant
+
+def _jacobian_function(mapping):
+    """Returns the lambdified Jacobian matrix of an analytical mapping."""
+    if mapping.expressions is None:
+        raise ValueError('> Expecting an analytical mapping, {} has no '
+                         'expressions'.format(mapping.name))
+
+    def _lambdify():
+        dim = mapping.ldim
+        xs  = list(mapping.logical_coordinates)
+        jac = mapping.jacobian_expr
+
+        return [[lambdify(xs, jac[i,j], 'numpy') for j in range(dim)]
+                for i in range(dim)]
+
+    return _jacobians.get_or_compute(mapping, _lambdify)
+
+#==============================================================================
+class MappingGrid(object):
+    """
+    The Jacobian matrix of an analytical mapping, evaluated on arrays of
+    logical coordinates. The determinant and the inverse metric are computed
+    on the first access.
+
+    mapping: sympde.topology.Mapping
+        an analytical mapping
+
+    points: list
+        for every axis, an array of logical coordinates. The arrays are
+        broadcast together, e.g. x[:,None] and y[None,:] for a tensor grid.
+    """
+
+    def __init__(self, mapping, points):
+        dim = mapping.ldim
+
+        if not( len(points) == dim ):
+            raise ValueError('> Expecting {} arrays of logical coordinates, '
+                             'given {}'.format(dim, len(points)))
+
+        points = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in points])
+        shape  = points[0].shape
+
+        funcs = _jacobian_function(mapping)
+
+        jacobian = np.empty(shape + (dim, dim))
+        for i in range(dim):
+            for j in range(dim):
+                jacobian[..., i, j] = funcs[i][j](*points)
+
+        self._mapping        = mapping
+        self._shape          = shape
+        self._jacobian       = jacobian
+        self._determinant    = None
+        self._inverse_metric = None
+
+    @property
+    def mapping(self):
+        return self._mapping
+
+    @property
+    def shape(self):
+        """Shape of the grid."""
+        return self._shape
+
+    @property
+    def jacobian(self):
+        """The Jacobian matrices, as an array of shape grid + (dim, dim)."""
+        return self._jacobian
+
+    @property
+    def determinant(self):
+        """The determinant of the Jacobian matrices."""
+        if self._determinant is None:
+            self._determinant = np.linalg.det(self._jacobian)
+
+        return self._determinant
+
+    @property
+    def inverse_metric(self):
+        """The inverse of the metric J^T J, as an array of shape grid + (dim, dim)."""
+        if self._inverse_metric is None:
+            inv = np.linalg.inv(self._jacobian)
+            self._inverse_metric = inv @ np.swapaxes(inv, -1, -2)
+
+        return self._inverse_metric
+
+    def values(self):
+        """
+        Returns the values of the symbols of mapping_symbols, as a dictionary.
+        """
+        jacobian, determinant = mapping_symbols(self._mapping)
+
+        d = {determinant: self.determinant}
+        for i, row in enumerate(jacobian):
+            for j, s in enumerate(row):
+                d[s] = self._jacobian[..., i, j]
+
+        return d
+
+def mapping_grid(mapping, points):
+    """
+    Returns the MappingGrid of the mapping on the given arrays of logical
+    coordinates. The last grids are cached, and found again from the values
+    of the coordinates.
+    """
+    points = [np.asarray(x, dtype=float) for x in points]
+    key    = (mapping,) + tuple((x.shape, x.tobytes()) for x in points)
+
+    return _grids.get_or_compute(key, lambda: MappingGrid(mapping, points))
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module analyses complex GLT symbols, such as the symbols of
+advection-diffusion forms, where gelatize multiplies the advection symbols
+by I or -I.
+
+The coefficient of every separable term is split once into its real and
+imaginary parts, which are evaluated as real arrays and multiplied by the
+(real) 1d factors. The symbol is sampled on the tensor product of a space
+grid and of a Fourier grid, by chunks of space points, so that the singular
+value distribution |f| and the numerical range (the convex hull of the
+values of f) can be computed on large grids.
+"""
+
+import numpy as np
+
+from scipy.spatial import ConvexHull
+try:
+    from scipy.spatial import QhullError
+except ImportError:
+    from scipy.spatial.qhull import QhullError
+
+from sympde.expr import BilinearForm
+
+from .expr      import GltExpr
+from .separable import glt_terms, sample_terms, outer_product, _as_list
+from .spectrum  import _coefficients, _sampling, _rearrange
+
+__all__ = ('iter_symbol_parts',
+           'symbol_parts',
+           'predict_singular_values',
+           'numerical_range')
+
+# number of values of the symbol computed at once
+CHUNK_SIZE = 2**20
+
+#==============================================================================
+def _symmetric_grid(n):
+    """Returns the midpoints of n uniform cells of [-pi, pi]."""
+    return (2*np.arange(n) + 1 - n) * (np.pi / n)
+
+def _prepare(glt, degrees, n_elements, values, mapping=None):
+    if isinstance(glt, BilinearForm):
+        glt = GltExpr(glt)
+
+    if glt.fields:
+        raise NotImplementedError('Fields are not available yet')
+
+    dim        = glt.ldim
+    degrees    = [int(i) for i in _as_list(degrees,    dim)]
+    n_elements = [int(i) for i in _as_list(n_elements, dim)]
+
+    terms = glt_terms(glt.separable_symbol(mapping), dim)
+
+    funcs, is_variable = _coefficients(terms, glt, n_elements, values,
+                                       parts=True, mapping=mapping)
+
+    return glt, degrees, n_elements, terms, funcs, is_variable
+
+#==============================================================================
+def _iter_parts(terms, funcs, is_variable, degrees, ts, xs, chunk_size):
+    dim   = len(ts)
+    shape = tuple(len(t) for t in ts)
+    size  = int(np.prod(shape))
+
+    samples = sample_terms(terms, degrees, ts)
+
+    # ... constant coefficients: a single point, without the factor matrix
+    if not is_variable:
+        x  = [0.]*dim
+        re = outer_product([(f(*x), fs) for (f,g),(_, fs) in zip(funcs, samples)], shape)
+        im = outer_product([(g(*x), fs) for (f,g),(_, fs) in zip(funcs, samples)], shape)
+
+        yield re[None], im[None]
+        return
+    # ...
+
+    if xs is None:
+        raise ValueError('> The symbol depends on the space variables, xs must be given')
+
+    # ... factors of the terms, as the rows of a matrix
+    factors = np.empty((len(terms), size))
+    for i, (_, fs) in enumerate(samples):
+        outer_product([(1., fs)], shape, out=factors[i].reshape(shape))
+    # ...
+
+    # ... coefficients on all the space points, as the columns of a matrix
+    xs = [np.asarray(x, dtype=float) for x in xs]
+    n_points = int(np.prod([len(x) for x in xs]))
+    points   = np.meshgrid(*xs, indexing='ij')
+
+    coeffs_re = np.empty((n_points, len(terms)))
+    coeffs_im = np.empty((n_points, len(terms)))
+    for j, (f, g) in enumerate(funcs):
+        coeffs_re[:,j] = np.broadcast_to(f(*points), points[0].shape).reshape(-1)
+        coeffs_im[:,j] = np.broadcast_to(g(*points), points[0].shape).reshape(-1)
+    # ...
+
+    step = max(1, chunk_size // size)
+    for start in range(0, n_points, step):
+        stop = min(start + step, n_points)
+
+        yield ((coeffs_re[start:stop] @ factors).reshape((stop - start,) + shape),
+               (coeffs_im[start:stop] @ factors).reshape((stop - start,) + shape))
+
+def iter_symbol_parts(glt, degrees, n_elements, ts, xs=None,
+                      chunk_size=CHUNK_SIZE, mapping=None, **values):
+    """
+    Samples the real and imaginary parts of the symbol of a form, on the
+    tensor product of a grid of space points and of a grid of Fourier
+    variables. This is a generator, yielding arrays (re, im) of shape
+    (number of space points of the chunk,) + the shape of the Fourier grid,
+    the space points being ordered as in numpy.meshgrid(*xs, indexing='ij').
+    If the coefficients are constant, a single chunk with one point is
+    yielded.
+
+    glt: GltExpr, BilinearForm
+        the form, with real constants
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    n_elements: int, list, tuple
+        number of elements for every axis
+
+    ts: list
+        for every axis, a 1d array of Fourier variables
+
+    xs: list
+        for every axis, a 1d array of logical coordinates
+
+    chunk_size: int
+        approximate number of values in a chunk
+
+    mapping: sympde.topology.Mapping
+        an analytical mapping of the domain of the form, see gelato.mapping.
+        The Jacobian matrix is evaluated once on the space grid.
+
+    values: dict
+        values of the constants, given by name
+    """
+    glt, degrees, n_elements, terms, funcs, is_variable = _prepare(glt,
+                                                                   degrees,
+                                                                   n_elements,
+                                                                   values,
+                                                                   mapping)
+
+    ts = [np.asarray(t, dtype=float) for t in _as_list(ts, glt.ldim)]
+
+    for re, im in _iter_parts(terms, funcs, is_variable, degrees, ts, xs,
+                              chunk_size):
+        yield re, im
+
+def symbol_parts(glt, degrees, n_elements, ts, xs=None, mapping=None,
+                 **values):
+    """
+    Returns the real and imaginary parts of the symbol of a form, as arrays
+    of shape (len(x_1), ..., len(x_d), len(t_1), ..., len(t_d)), or of the
+    shape of the Fourier grid when the coefficients are constant. See
+    iter_symbol_parts.
+    """
+    chunks = list(iter_symbol_parts(glt, degrees, n_elements, ts, xs=xs,
+                                    mapping=mapping, **values))
+
+    re = np.concatenate([c[0] for c in chunks])
+    im = np.concatenate([c[1] for c in chunks])
+
+    if xs is None:
+        return re[0], im[0]
+
+    # ... constant coefficients are broadcast on the space grid
+    space = tuple(len(x) for x in xs)
+    shape = (int(np.prod(space)),) + re.shape[1:]
+
+    re = np.broadcast_to(re, shape).reshape(space + re.shape[1:])
+    im = np.broadcast_to(im, shape).reshape(space + im.shape[1:])
+    # ...
+
+    return re, im
+
+#==============================================================================
+def predict_singular_values(glt, degrees, n_elements, k=None, which='smallest',
+                            n_space=None, out=None, mapping=None, **values):
+    """
+    Predicts the sorted singular values of the matrix of a form, discretized
+    with n_elements per axis, as the monotone rearrangement of |f|, where f
+    is the GLT symbol, sampled on [0,1]^d x [-pi,pi]^d. Returns an array in
+    increasing order. See gelato.spectrum.predict_eigenvalues for the
+    sampling and the arguments.
+    """
+    if not( which in ('smallest', 'largest') ):
+        raise ValueError('> which must be smallest or largest, given {}'.format(which))
+
+    glt, degrees, n_elements, terms, funcs, is_variable = _prepare(glt,
+                                                                   degrees,
+                                                                   n_elements,
+                                                                   values,
+                                                                   mapping)
+
+    dim  = glt.ldim
+    size = int(np.prod(n_elements))
+
+    n_space, n_fourier = _sampling(n_elements, n_space, is_variable)
+
+    xs = [(np.arange(m) + 0.5) / m for m in n_space]
+    ts = [_symmetric_grid(n) for n in n_fourier]
+
+    # ... |f| in a single buffer
+    n_values = int(np.prod(n_space)) * int(np.prod(n_fourier))
+
+    if out is None:
+        out = np.empty(n_values)
+
+    elif not( out.shape == (n_values,) ) or not( out.dtype == np.float64 ):
+        raise ValueError('> Expecting a float64 out array of shape ({},)'.format(n_values))
+
+    start = 0
+    for re, im in _iter_parts(terms, funcs, is_variable, degrees, ts, xs,
+                              CHUNK_SIZE):
+        stop = start + re.size
+        np.hypot(re.reshape(-1), im.reshape(-1), out=out[start:stop])
+        start = stop
+    # ...
+
+    return _rearrange(out, size, k=k, which=which)
+
+#==============================================================================
+def _hull(points):
+    """
+    Returns the vertices of the convex hull of 2d points, counterclockwise,
+    or the two extreme points when the points are aligned.
+    """
+    try:
+        hull = ConvexHull(points)
+        return points[hull.vertices]
+
+    except (QhullError, ValueError):
+        pass
+
+    # ... aligned points, projected on their main direction
+    center = points.mean(axis=0)
+    u, s, vt = np.linalg.svd(points - center, full_matrices=False)
+    d = (points - center) @ vt[0]
+
+    i, j = d.argmin(), d.argmax()
+    if i == j:
+        return points[[i]]
+
+    return points[[i, j]]
+
+def numerical_range(glt, degrees, n_elements, ts=None, xs=None, n_fourier=64,
+                    n_space=16, chunk_size=CHUNK_SIZE, mapping=None, **values):
+    """
+    Returns the vertices of the convex hull of the values of the symbol of a
+    form, sampled on [0,1]^d x [-pi,pi]^d, as a complex array in
+    counterclockwise order. It contains the spectra of the matrices of the
+    form, up to the boundary effects. The hull is updated chunk by chunk,
+    only its vertices being kept.
+
+    glt: GltExpr, BilinearForm
+        the form, with real constants
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    n_elements: int, list, tuple
+        number of elements for every axis
+
+    ts: list
+        for every axis, a 1d array of Fourier variables. By default,
+        n_fourier+1 uniform points of [-pi, pi].
+
+    xs: list
+        for every axis, a 1d array of logical coordinates, used when the
+        coefficients are variable. By default, n_space uniform points.
+
+    chunk_size: int
+        approximate number of values in a chunk
+
+    mapping: sympde.topology.Mapping
+        an analytical mapping of the domain of the form, see gelato.mapping
+
+    values: dict
+        values of the constants, given by name
+    """
+    glt, degrees, n_elements, terms, funcs, is_variable = _prepare(glt,
+                                                                   degrees,
+                                                                   n_elements,
+                                                                   values,
+                                                                   mapping)
+
+    dim = glt.ldim
+
+    if ts is None:
+        ts = [np.linspace(-np.pi, np.pi, n + 1) for n in _as_list(n_fourier, dim)]
+
+    ts = [np.asarray(t, dtype=float) for t in _as_list(ts, dim)]
+
+    if xs is None:
+        xs = [(np.arange(m) + 0.5) / m for m in _as_list(n_space, dim)]
+
+    vertices = np.empty((0, 2))
+    for re, im in _iter_parts(terms, funcs, is_variable, degrees, ts, xs,
+                              chunk_size):
+        points   = np.column_stack([re.reshape(-1), im.reshape(-1)])
+        vertices = _hull(np.concatenate([vertices, points]))
+
+    return vertices[:,0] + 1j * vertices[:,1]
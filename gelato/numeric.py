@@ -0,0 +1,549 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module evaluates the 1d GLT symbols on arrays of Fourier variables,
+without sympy.
+
+The symbols are cosine or sine series whose float coefficients are given by
+gelato.tables.series_coefficients. They are summed with the Clenshaw
+recurrence, which needs a single cosine evaluation per point (and a sine for
+the odd orders). The points are processed by chunks, so that the work arrays
+stay in cache and the evaluation is limited by the memory bandwidth.
+
+For large degrees, the coefficients span many orders of magnitude and the
+sums cancel where the symbols are small, e.g. the mass symbol near pi. The
+function adaptive_glt_symbol bounds the rounding error of every point, and
+evaluates again the inaccurate points in long double, then with mpmath.
+
+From the degree SINC_THRESHOLD, the mass, advection and stiffness symbols
+are evaluated by sinc_series, the Poisson summation of the Fourier transform
+of the B-spline. It needs a few terms per point, whatever the degree, and
+its terms do not cancel for even orders.
+"""
+
+from collections import namedtuple
+from decimal import Decimal, localcontext
+from functools import lru_cache
+
+import numpy as np
+
+from .tables import check_order, series_coefficients, exact_table
+
+__all__ = ('cos_series',
+           'sin_series',
+           'sinc_terms',
+           'sinc_series',
+           'glt_symbol',
+           'mass',
+           'stiffness',
+           'advection',
+           'bilaplacian',
+           'fourier_grid',
+           'sample_fourier_grid',
+           'Promotion',
+           'adaptive_glt_symbol')
+
+# number of points processed at once
+CHUNK_SIZE = 4096
+
+# degree from which the orders 0, 1 and 2 are evaluated by sinc_series
+SINC_THRESHOLD = 20
+
+# maximum number of terms of sinc_series on each side of j = 0
+SINC_MAX_TERMS = 1000
+
+#==============================================================================
+def _prepare(t, out):
+    """
+    Returns the flat views of the input and output arrays, and the output
+    array in the shape of t.
+    """
+    t = np.asarray(t, dtype=float)
+
+    if out is None:
+        out = np.empty(t.shape)
+
+    elif not( out.shape == t.shape ) or not( out.dtype == np.float64 ):
+        raise ValueError('> Expecting a float64 out array of shape {}'.format(t.shape))
+
+    elif not out.flags.c_contiguous:
+        raise ValueError('> Expecting a contiguous out array')
+
+    return t.reshape(-1), out.reshape(-1), out
+
+def _clenshaw(c, x, b1, b2, tmp):
+    """
+    Runs the recurrence b_k = c_k + 2 x b_{k+1} - b_{k+2}, for k from n down
+    to 1, where x contains 2*cos(t). On exit b1 contains b_1 and b2 contains
+    b_2.
+    """
+    b1[...] = 0.
+    b2[...] = 0.
+    for k in range(len(c)-1, 0, -1):
+        np.multiply(x, b1, out=tmp)
+        tmp -= b2
+        tmp += c[k]
+        b1, b2, tmp = tmp, b1, b2
+
+    return b1, b2
+
+#==============================================================================
+def cos_series(c, t, out=None, chunk_size=CHUNK_SIZE):
+    """
+    Evaluates sum_k c_k cos(k t).
+
+    c: array_like
+        the coefficients (c_0, ..., c_n)
+
+    t: float, array_like
+        Fourier variables
+
+    out: numpy.ndarray
+        optional float64 output array of the same shape as t
+    """
+    c = np.asarray(c, dtype=float)
+    t, values, out = _prepare(t, out)
+
+    n  = min(chunk_size, t.size)
+    x  = np.empty(n)
+    b1 = np.empty(n)
+    b2 = np.empty(n)
+    w  = np.empty(n)
+
+    for start in range(0, t.size, chunk_size):
+        stop = min(start + chunk_size, t.size)
+        k = stop - start
+
+        # ... sum = c_0 + cos(t) b_1 - b_2
+        np.cos(t[start:stop], out=x[:k])
+        x[:k] *= 2.
+        r1, r2 = _clenshaw(c, x[:k], b1[:k], b2[:k], w[:k])
+
+        v = values[start:stop]
+        np.multiply(x[:k], r1, out=v)
+        v *= 0.5
+        v -= r2
+        v += c[0]
+        # ...
+
+    return out
+
+#==============================================================================
+def sin_series(c, t, out=None, chunk_size=CHUNK_SIZE):
+    """
+    Evaluates sum_k c_k sin(k t), the coefficient c_0 being ignored.
+
+    c: array_like
+        the coefficients (c_0, ..., c_n)
+
+    t: float, array_like
+        Fourier variables
+
+    out: numpy.ndarray
+        optional float64 output array of the same shape as t
+    """
+    c = np.asarray(c, dtype=float)
+    t, values, out = _prepare(t, out)
+
+    n  = min(chunk_size, t.size)
+    x  = np.empty(n)
+    b1 = np.empty(n)
+    b2 = np.empty(n)
+    w  = np.empty(n)
+
+    for start in range(0, t.size, chunk_size):
+        stop = min(start + chunk_size, t.size)
+        k = stop - start
+
+        # ... sum = sin(t) b_1
+        np.cos(t[start:stop], out=x[:k])
+        x[:k] *= 2.
+        r1, r2 = _clenshaw(c, x[:k], b1[:k], b2[:k], w[:k])
+
+        v = values[start:stop]
+        np.sin(t[start:stop], out=v)
+        v *= r1
+        # ...
+
+    return out
+
+#==============================================================================
+def sinc_terms(p, order, tol=np.finfo(float).eps):
+    """
+    Returns the number J of terms on each side of j = 0 kept by sinc_series,
+    such that the truncated terms are below tol times the term j = 0.
+
+    With u = t/2 in [-pi/2, pi/2] and b = 2p+2-order, the term j is at most
+    (2|j|-1)**(-b) times the term j = 0, and the terms |j| > J are bounded by
+    2 (2J+1)**(-b) (1 + (2J+1)/(2(b-1))).
+    """
+    p, order = check_order(p, order)
+
+    b = 2*p + 2 - order
+    for J in range(1, SINC_MAX_TERMS+1):
+        if 2. * (2*J+1)**(-b) * (1. + (2*J+1) / (2.*(b-1))) <= tol:
+            return J
+
+    raise ValueError('> The sinc series of degree {} and order {} needs more '
+                     'than {} terms, use the cosine series'.format(p, order,
+                                                                   SINC_MAX_TERMS))
+
+def _power(x, n, out):
+    """Computes out = x**n by repeated squaring, x is overwritten."""
+    out[...] = 1.
+    while n:
+        if n & 1:
+            out *= x
+
+        n >>= 1
+        if n:
+            np.multiply(x, x, out=x)
+
+    return out
+
+def sinc_series(p, t, order, tol=np.finfo(float).eps, out=None,
+                chunk_size=CHUNK_SIZE):
+    """
+    Evaluates the symbol of degree p and a given derivative order as
+
+        sum_j (-(t + 2 j pi))**order * (sin(t/2) / (t/2 + j pi))**(2p+2)
+
+    after reducing t to [-pi, pi]. The series is truncated to tol, relative
+    to the term j = 0, see sinc_terms. For even orders all the terms are
+    nonnegative, and the values keep their relative accuracy where the
+    symbol is small.
+
+    p: int
+        spline degree
+
+    t: float, array_like
+        Fourier variables
+
+    order: int
+        derivative order, between 0 and 2p
+
+    tol: float
+        truncation tolerance
+
+    out: numpy.ndarray
+        optional float64 output array of the same shape as t
+    """
+    J = sinc_terms(p, order, tol=tol)
+    a = 2*p + 2
+
+    t, values, out = _prepare(t, out)
+
+    n = min(chunk_size, t.size)
+    u = np.empty(n)
+    s = np.empty(n)
+    r = np.empty(n)
+    w = np.empty(n)
+
+    for start in range(0, t.size, chunk_size):
+        stop = min(start + chunk_size, t.size)
+        k = stop - start
+
+        # ... u = t/2 - m pi, in [-pi/2, pi/2]
+        np.multiply(t[start:stop], 0.5 / np.pi, out=u[:k])
+        np.rint(u[:k], out=u[:k])
+        u[:k] *= -np.pi
+        u[:k] += 0.5 * t[start:stop]
+
+        np.sin(u[:k], out=s[:k])
+        # ...
+
+        v = values[start:stop]
+        v[...] = 0.
+        for j in range(-J, J+1):
+            d = u[:k] + j * np.pi
+
+            # ... sin(u)/(u + j pi), which is 1 at u = 0 for j = 0
+            np.divide(s[:k], d, out=r[:k], where=(d != 0.))
+            r[:k][d == 0.] = 1.
+            # ...
+
+            _power(r[:k], a, w[:k])
+            if order > 0:
+                w[:k] *= (-2. * d)**order
+
+            v += w[:k]
+
+    return out
+
+#==============================================================================
+def glt_symbol(p, t, order, out=None, method='auto'):
+    """
+    Evaluates the symbol of degree p and a given derivative order, see
+    gelato.glt.GltSymbol.
+
+    p: int
+        spline degree
+
+    t: float, array_like
+        Fourier variables
+
+    order: int
+        derivative order, between 0 and 2p
+
+    out: numpy.ndarray
+        optional float64 output array of the same shape as t
+
+    method: str
+        'cosine' for the cosine or sine series, 'sinc' for sinc_series, or
+        'auto' for sinc_series on the orders 0, 1 and 2 from the degree
+        SINC_THRESHOLD
+    """
+    if method == 'auto':
+        method = 'sinc' if p >= SINC_THRESHOLD and order <= 2 else 'cosine'
+
+    if method == 'sinc':
+        return sinc_series(p, t, order, out=out)
+
+    if not( method == 'cosine' ):
+        raise ValueError('> Unknown method {}'.format(method))
+
+    c = series_coefficients(p, order)
+
+    if order % 2 == 0:
+        return cos_series(c, t, out=out)
+
+    else:
+        return sin_series(c, t, out=out)
+
+def mass(p, t, out=None):
+    """Evaluates the mass symbol of degree p."""
+    return glt_symbol(p, t, 0, out=out)
+
+def advection(p, t, out=None):
+    """Evaluates the advection symbol of degree p."""
+    return glt_symbol(p, t, 1, out=out)
+
+def stiffness(p, t, out=None):
+    """Evaluates the stiffness symbol of degree p."""
+    return glt_symbol(p, t, 2, out=out)
+
+def bilaplacian(p, t, out=None):
+    """Evaluates the bilaplacian symbol of degree p."""
+    return glt_symbol(p, t, 4, out=out)
+
+#==============================================================================
+def fourier_grid(n):
+    """
+    Returns the uniform grid t_j = j*pi/n, for j = 0, ..., n.
+    """
+    return np.arange(n+1) * (np.pi / n)
+
+def sample_fourier_grid(p, order, n):
+    """
+    Evaluates the symbol of degree p and a given derivative order on the grid
+    t_j = j*pi/n, for j = 0, ..., n (see fourier_grid).
+
+    All the values are computed at once by a real FFT of length 2n of the
+    zero-padded coefficients, in O(n log n) operations.
+
+    p: int
+        spline degree
+
+    order: int
+        derivative order, between 0 and 2p
+
+    n: int
+        number of intervals of the grid
+    """
+    c = series_coefficients(p, order)
+
+    # ... cos(k j pi/n) and sin(k j pi/n) are 2n-periodic in k
+    a = np.zeros(2*n)
+    np.add.at(a, np.arange(len(c)) % (2*n), c)
+    # ...
+
+    f = np.fft.rfft(a)
+    if order % 2 == 0:
+        return f.real.copy()
+
+    else:
+        return -f.imag
+
+#==============================================================================
+# ADAPTIVE PRECISION
+#==============================================================================
+# maximum working precision of mpmath, in bits
+MAX_PRECISION = 4096
+
+Promotion = namedtuple('Promotion', ['points', 'longdouble', 'mpmath'])
+
+@lru_cache(maxsize=None)
+def _exact_series(p, order):
+    """
+    Returns the exact coefficients of the series of series_coefficients, as
+    Fractions.
+    """
+    phi  = exact_table(p, order)
+    sign = (-1)**((order + 1) // 2)
+
+    c = [sign * 2 * i for i in phi]
+    c[0] = 0 * c[0] if order % 2 == 1 else sign * phi[0]
+
+    return tuple(c)
+
+@lru_cache(maxsize=None)
+def _longdouble_series(p, order):
+    """Returns the coefficients of the series, rounded to long double."""
+    with localcontext() as ctx:
+        ctx.prec = 40
+        return np.array([str(Decimal(c.numerator) / Decimal(c.denominator))
+                         for c in _exact_series(p, order)], dtype=np.longdouble)
+
+def _clenshaw_sum(c, t, odd, cos, sin):
+    """
+    Sums the cosine series, or the sine series if odd is True, with the
+    Clenshaw recurrence, for numpy arrays or mpmath numbers.
+    """
+    x  = 2 * cos(t)
+    b1 = 0 * x
+    b2 = 0 * x
+    for k in range(len(c)-1, 0, -1):
+        b1, b2 = c[k] + x * b1 - b2, b1
+
+    if odd:
+        return sin(t) * b1
+
+    return c[0] + x * b1 / 2 - b2
+
+def _error_bound(c, odd, t, eps):
+    """
+    Returns a running bound, to first order, of the rounding error of the
+    Clenshaw sums at the points t, for a unit roundoff eps. The step k makes
+    an error of at most 3 eps (|c_k| + |x b_{k+1}| + |b_{k+2}|), which reaches
+    the sum multiplied by T_k(cos t), or by sin(k t) for the sine series, hence
+    at most 1, or k |sin t|.
+    """
+    t = np.asarray(t, dtype=float)
+    c = np.asarray(c, dtype=float)
+
+    x  = 2 * np.cos(t)
+    s  = np.abs(np.sin(t))
+    b1 = np.zeros_like(x)
+    b2 = np.zeros_like(x)
+    e  = np.zeros_like(x)
+    for k in range(len(c)-1, 0, -1):
+        m = abs(c[k]) + np.abs(x * b1) + np.abs(b2)
+        e += m * np.minimum(1., k * s) if odd else m
+        b1, b2 = c[k] + x * b1 - b2, b1
+
+    if odd:
+        e += np.abs(s * b1)
+
+    else:
+        e += abs(c[0]) + np.abs(x * b1) + np.abs(b2)
+
+    return 3 * eps * e
+
+@lru_cache(maxsize=None)
+def _mpmath_series(p, order, bits):
+    """Returns the coefficients of the series as mpf, with a precision bits."""
+    import mpmath
+
+    with mpmath.workprec(bits):
+        return tuple(mpmath.mpf(i.numerator) / i.denominator
+                     for i in _exact_series(p, order))
+
+def _mpmath_values(p, order, ts, values, bounds, rtol, atol):
+    """
+    Evaluates the symbol at the points ts with mpmath, in place of values. The
+    working precision is doubled until the error bound is below the tolerance,
+    the bounds being given for a unit roundoff of 1. Every precision is a
+    single pass over the remaining points.
+    """
+    import mpmath
+
+    odd   = order % 2 == 1
+    index = np.arange(ts.size)
+    bits  = 128
+    while index.size:
+        with mpmath.workprec(bits):
+            cs = _mpmath_series(p, order, bits)
+            for i in index:
+                values[i] = float(_clenshaw_sum(cs, mpmath.mpf(ts[i]), odd,
+                                                mpmath.cos, mpmath.sin))
+
+        if bits >= MAX_PRECISION:
+            break
+
+        eps   = 2.**(1 - bits)
+        index = index[eps * bounds[index] > rtol * np.abs(values[index]) + atol]
+        bits *= 2
+
+def adaptive_glt_symbol(p, t, order, rtol=1e-12, atol=0., out=None):
+    """
+    Evaluates the symbol of degree p and a given derivative order, with a
+    relative accuracy rtol (or an absolute accuracy atol) at every point.
+
+    The symbol is evaluated in float64 by the cosine or sine series. The
+    points where a bound of the rounding error exceeds rtol*|value| + atol
+    are evaluated again in long double, then the remaining ones with mpmath,
+    whose precision grows up to MAX_PRECISION bits. Returns the values and a
+    Promotion, giving the number of points and the numbers of points
+    evaluated in long double and with mpmath.
+
+    p: int
+        spline degree
+
+    t: float, array_like
+        Fourier variables
+
+    order: int
+        derivative order, between 0 and 2p
+
+    rtol: float
+        relative tolerance
+
+    atol: float
+        absolute tolerance, for the points where the symbol vanishes
+
+    out: numpy.ndarray
+        optional float64 output array of the same shape as t
+
+    Examples
+
+    >>> t = np.linspace(0., np.pi, 5)
+    >>> values, promotion = adaptive_glt_symbol(30, t, 0)
+    >>> promotion
+    Promotion(points=5, longdouble=2, mpmath=2)
+    """
+    out    = glt_symbol(p, t, order, out=out, method='cosine')
+    values = out.reshape(-1)
+    ts     = np.asarray(t, dtype=float).reshape(-1)
+
+    c   = series_coefficients(p, order)
+    odd = order % 2 == 1
+
+    # ... the error bounds are proportional to the unit roundoff
+    bound = _error_bound(c, odd, ts, 1.)
+    # ...
+
+    # ... long double, if it is more accurate than float64 on this platform
+    index = np.flatnonzero(np.finfo(float).eps * bound > rtol * np.abs(values) + atol)
+    n_longdouble = index.size
+
+    eps = np.finfo(np.longdouble).eps
+    if index.size and eps < np.finfo(float).eps:
+        cs = _longdouble_series(p, order)
+        v  = _clenshaw_sum(cs, ts[index].astype(np.longdouble), odd, np.cos, np.sin)
+        values[index] = v
+
+        index = index[float(eps) * bound[index] > rtol * np.abs(values[index]) + atol]
+
+    elif index.size:
+        n_longdouble = 0
+    # ...
+
+    # ... mpmath
+    if index.size:
+        v = values[index]
+        _mpmath_values(p, order, ts[index], v, bound[index], rtol, atol)
+        values[index] = v
+    # ...
+
+    return out, Promotion(ts.size, n_longdouble, index.size)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module gelatizes many bilinear forms on a pool of processes.
+
+sympde forms cannot be pickled. When the 'fork' start method is available,
+the forms are inherited by the workers and a task only carries the index of
+its form. Otherwise, every form must be given as a picklable callable (a
+module level function, functools.partial, ...) building the form inside the
+worker. Results are sent back as srepr strings, which are much smaller than
+their pickles, and rebuilt in the parent process.
+
+The workers live for the whole call and receive the gelatize arguments once,
+hence the GLT symbol and coefficient caches of every worker stay warm from one
+form to the next.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sympy import srepr, sympify
+
+from sympde.core import Constant
+from sympde.expr import BilinearForm
+
+from .expr import gelatize
+from .glt  import Mass, Stiffness, Advection, Bilaplacian, GltSymbol
+from .glt  import rational_table
+
+__all__ = ('gelatize_many',)
+
+#==============================================================================
+# the forms and the gelatize arguments of the workers
+_forms  = None
+_kwargs = None
+
+# names needed to rebuild the results
+_namespace = {'Mass':        Mass,
+              'Stiffness':   Stiffness,
+              'Advection':   Advection,
+              'Bilaplacian': Bilaplacian,
+              'GltSymbol':   GltSymbol,
+              'Constant':    Constant}
+
+#==============================================================================
+def _warm(degrees):
+    """Fills the coefficient tables needed by the given degrees."""
+    if degrees is None:
+        return
+
+    if not isinstance(degrees, (tuple, list)):
+        degrees = [degrees]
+
+    for p in set(degrees):
+        if isinstance(p, int):
+            for order in (0, 1, 2, 4):
+                if order <= 2*p:
+                    rational_table(p, order)
+
+def _init_worker(forms, kwargs):
+    global _forms, _kwargs
+    _forms  = forms
+    _kwargs = kwargs
+
+    _warm(kwargs.get('degrees'))
+
+def _as_form(form):
+    if isinstance(form, BilinearForm):
+        return form
+
+    return form()
+
+def _gelatize_task(index, form):
+    if form is None:
+        form = _forms[index]
+
+    expr = gelatize(_as_form(form), **_kwargs)
+
+    return index, srepr(expr)
+
+def _loads(s):
+    return sympify(s, locals=_namespace)
+
+#==============================================================================
+def gelatize_many(forms, workers=None, **kwargs):
+    """
+    Gelatizes a sequence of bilinear forms on a pool of processes. This is a
+    generator, yielding the results in the order of the forms, every result
+    being yielded as soon as it and all the previous ones are available.
+
+    forms: list
+        BilinearForm objects, or callables without arguments returning a
+        BilinearForm (required when the 'fork' start method is not available)
+
+    workers: int
+        number of processes. If None or 1, the forms are gelatized serially
+        in the current process.
+
+    kwargs: dict
+        arguments passed to gelatize
+
+    Examples
+
+    >>> for expr in gelatize_many(forms, workers=4, degrees=[2,2]):
+    ...     print(expr)
+    """
+    forms = list(forms)
+
+    if workers is None or workers <= 1 or len(forms) <= 1:
+        for form in forms:
+            yield gelatize(_as_form(form), **kwargs)
+        return
+
+    # ... forms are inherited by forked workers, or built by them
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context  = multiprocessing.get_context('fork')
+        initargs = (forms, kwargs)
+        tasks    = [None]*len(forms)
+
+    else:
+        if any(isinstance(form, BilinearForm) for form in forms):
+            raise TypeError('> Expecting callables building the forms, since '
+                            'the fork start method is not available')
+
+        context  = None
+        initargs = (None, kwargs)
+        tasks    = forms
+    # ...
+
+    workers = min(workers, len(forms))
+    with ProcessPoolExecutor(max_workers = workers, mp_context = context,
+                             initializer = _init_worker,
+                             initargs    = initargs) as executor:
+
+        futures = [executor.submit(_gelatize_task, i, task)
+                   for i,task in enumerate(tasks)]
+
+        # ... results arriving out of order wait for their predecessors
+        done = {}
+        next_index = 0
+        try:
+            for future in as_completed(futures):
+                index, s = future.result()
+                done[index] = s
+
+                while next_index in done:
+                    yield _loads(done.pop(next_index))
+                    next_index += 1
+
+        finally:
+            # the pending tasks are dropped if the generator is closed early
+            for future in futures:
+                future.cancel()
+        # ...
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module builds preconditioners from the GLT symbol of a form.
+
+The matrix of a form with constant coefficients, discretized with n_i
+elements per axis, is approximated by the sum of Kronecker products of the
+Toeplitz matrices of its 1d symbols. Three approximations, cheap to invert,
+are available:
+
+    'tau'        the tau matrices of the symbols, diagonalized by the
+                 discrete sine transform (DST-I); the eigenvalues are the
+                 samples of the symbol at t_j = j*pi/(n+1), j = 1, ..., n
+
+    'circulant'  the circulant matrices of the symbols, diagonalized by the
+                 FFT; the eigenvalues are the samples of the symbol at
+                 t_j = 2*pi*j/n, j = 0, ..., n-1
+
+    'kronecker'  the exact inverse of the sum of Kronecker products, by the
+                 fast diagonalization method: every 1d generalized eigenvalue
+                 problem (K, M) is solved once, the mass matrices being shared
+                 by all the terms
+
+The transforms are applied along every axis, in O(N log N) operations for
+the tau and circulant preconditioners and in O(N (n_1 + ... + n_d)) for the
+Kronecker one, N being the number of unknowns.
+"""
+
+import numpy as np
+
+from scipy.linalg import eigh
+from scipy.sparse.linalg import LinearOperator
+
+from sympde.expr import BilinearForm
+
+from .expr      import GltExpr
+from .assembly  import toeplitz_matrix
+from .separable import glt_terms, sample_terms, outer_product, _as_list
+from .spectrum  import _coefficients
+
+__all__ = ('glt_preconditioner',)
+
+#==============================================================================
+def _dst(x, axis):
+    """
+    Applies the orthonormal DST-I along an axis, through the real FFT of the
+    odd extension. This transform is its own inverse.
+    """
+    x = np.moveaxis(x, axis, -1)
+    n = x.shape[-1]
+
+    y = np.zeros(x.shape[:-1] + (2*(n+1),))
+    y[..., 1:n+1] =  x
+    y[..., n+2:]  = -x[..., ::-1]
+
+    y = - np.fft.rfft(y)[..., 1:n+1].imag * np.sqrt(0.5 / (n+1))
+
+    return np.moveaxis(y, -1, axis)
+
+def _apply(matrices, x):
+    """Applies the Kronecker product of the matrices to the tensor x."""
+    for axis, U in enumerate(matrices):
+        x = np.moveaxis(np.tensordot(U, x, axes=([1], [axis])), 0, axis)
+
+    return x
+
+def _regularize(values):
+    """Replaces the (nearly) vanishing eigenvalues by the smallest other one."""
+    small = abs(values) <= 1e-12 * abs(values).max()
+    if small.any() and not small.all():
+        values = values.copy()
+        values[small] = abs(values[~small]).min()
+
+    return values
+
+#==============================================================================
+def _tau(terms, coeffs, degrees, n_elements):
+    ts = [np.arange(1, n+1) * (np.pi / (n+1)) for n in n_elements]
+
+    samples = sample_terms(terms, degrees, ts)
+    samples = [(c, fs) for c,(_, fs) in zip(coeffs, samples)]
+    values  = _regularize(outer_product(samples, tuple(n_elements)))
+
+    def solve(x):
+        for axis in range(len(n_elements)):
+            x = _dst(x, axis)
+
+        x = x / values
+
+        for axis in range(len(n_elements)):
+            x = _dst(x, axis)
+
+        return x
+
+    return solve
+
+def _circulant(terms, coeffs, degrees, n_elements):
+    # the symbols are even, only the half grid of the last axis is needed
+    ns = list(n_elements)
+    ts = [np.arange(n) * (2*np.pi / n) for n in ns[:-1]]
+    ts = ts + [np.arange(ns[-1]//2 + 1) * (2*np.pi / ns[-1])]
+
+    shape   = tuple(len(t) for t in ts)
+    samples = sample_terms(terms, degrees, ts)
+    samples = [(c, fs) for c,(_, fs) in zip(coeffs, samples)]
+    values  = _regularize(outer_product(samples, shape))
+
+    def solve(x):
+        axes = list(range(x.ndim))
+        return np.fft.irfftn(np.fft.rfftn(x) / values, s=x.shape, axes=axes)
+
+    return solve
+
+def _kronecker(terms, coeffs, degrees, n_elements):
+    dim = len(n_elements)
+
+    # ... every term must be a mass matrix on all the axes but one
+    shift    = 0.
+    matrices = [None]*dim
+    for c, term in zip(coeffs, terms):
+        axes = [i for i,orders in enumerate(term.factors) if not( orders == (0,) )]
+        if len(axes) > 1 or any(len(orders) > 1 for orders in term.factors):
+            raise NotImplementedError('Kronecker preconditioner not available '
+                                      'for the term {}'.format(term))
+
+        if not axes:
+            shift += c
+            continue
+
+        axis  = axes[0]
+        order = term.factors[axis][0]
+        if order % 2 == 1:
+            raise NotImplementedError('Kronecker preconditioner not available '
+                                      'for odd orders')
+
+        K = c * toeplitz_matrix(degrees[axis], order, n_elements[axis]).toarray()
+        matrices[axis] = K if matrices[axis] is None else matrices[axis] + K
+    # ...
+
+    # ... 1d generalized eigenvalue problems, U^T M U = I
+    eigenvalues = []
+    vectors     = []
+    for axis, K in enumerate(matrices):
+        M = toeplitz_matrix(degrees[axis], 0, n_elements[axis]).toarray()
+        if K is None:
+            K = np.zeros_like(M)
+
+        w, U = eigh(K, M)
+        eigenvalues.append(w)
+        vectors.append(U)
+    # ...
+
+    values = shift
+    for axis, w in enumerate(eigenvalues):
+        index = [None]*dim
+        index[axis] = slice(None)
+        values = values + w[tuple(index)]
+
+    values     = _regularize(np.broadcast_to(values, tuple(n_elements)))
+    transposed = [U.T for U in vectors]
+
+    def solve(x):
+        return _apply(vectors, _apply(transposed, x) / values)
+
+    return solve
+
+_kinds = {'tau':       _tau,
+          'circulant': _circulant,
+          'kronecker': _kronecker}
+
+#==============================================================================
+def glt_preconditioner(glt, degrees, n_elements, kind='tau', **values):
+    """
+    Returns a preconditioner, approximating the inverse of the matrix of a
+    form, as a scipy.sparse.linalg.LinearOperator. The unknowns are ordered
+    as in numpy.kron, the last axis being the fastest.
+
+    glt: GltExpr, BilinearForm
+        the form, with constant and real coefficients
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    n_elements: int, list, tuple
+        number of elements for every axis
+
+    kind: str
+        'tau' (default), 'circulant' or 'kronecker'
+
+    values: dict
+        values of the constants, given by name
+
+    Examples
+
+    >>> P = glt_preconditioner(a, degrees=[3,3], n_elements=[64,64])
+    >>> x, info = cg(A, b, M=P)
+    """
+    if isinstance(glt, BilinearForm):
+        glt = GltExpr(glt)
+
+    if glt.fields:
+        raise NotImplementedError('Fields are not available yet')
+
+    if not( kind in _kinds ):
+        raise ValueError('> Unknown preconditioner {}'.format(kind))
+
+    dim        = glt.ldim
+    degrees    = [int(i) for i in _as_list(degrees,    dim)]
+    n_elements = [int(i) for i in _as_list(n_elements, dim)]
+
+    terms = glt_terms(glt.separable_symbol(), dim)
+
+    funcs, is_variable = _coefficients(terms, glt, n_elements, values)
+    if is_variable:
+        raise NotImplementedError('Variable coefficients are not available yet')
+
+    coeffs = [float(f(*[0.]*dim)) for f in funcs]
+
+    solve = _kinds[kind](terms, coeffs, degrees, n_elements)
+
+    shape = tuple(n_elements)
+    size  = int(np.prod(shape))
+
+    def matvec(x):
+        x = np.asarray(x, dtype=float)
+        return solve(x.reshape(shape)).reshape(x.shape)
+
+    return LinearOperator((size, size), matvec=matvec, dtype=float)
@@ -1 +1,2 @@
 from .latex import *
+from .latex import __all__
@@ -4,6 +4,8 @@
 from sympy.core import Symbol
 from sympy.printing.latex import LatexPrinter as LatexPrinterSympy
 
+__all__ = ('LatexPrinter', 'latex')
+
 class LatexPrinter(LatexPrinterSympy):
 
     def __init__(self, settings=None):
@@ -35,6 +37,10 @@ class LatexPrinter(LatexPrinterSympy):
     def _print_Bilaplacian(self, expr, **kwargs):
         return self._print_BasicGlt('b', *expr.args)
 
+    def _print_GltSymbol(self, expr, **kwargs):
+        p, t, order = expr.args
+        return self._print_BasicGlt('g', p, t).replace('_{', '^{(' + self._print(order) + ')}_{', 1)
+
 def latex(expr, **settings):
 
     coords = ['x', 'y', 'z']
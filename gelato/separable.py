@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module exploits the tensor-product structure of gelatized symbols.
+
+A symbol returned by gelatize (without degrees) is a sum of terms
+
+    coeff * f_1(t_x) * f_2(t_y) * f_3(t_z)
+
+where coeff does not depend on the Fourier variables and every f_i is a
+product of 1d symbols (Mass, Stiffness, ...) of the same axis. The functions
+of this module extract these terms and sample the 1d factors numerically.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from sympy import Symbol
+from sympy import Add, Mul
+from sympy import expand
+from sympy.core.singleton import S
+
+from .glt     import BasicGlt, GltSymbol
+from .numeric import glt_symbol, fourier_grid, sample_fourier_grid
+
+__all__ = ('GltTerm',
+           'glt_terms',
+           'fourier_variables',
+           'sample_terms',
+           'sample_fourier_grid_terms',
+           'outer_product')
+
+#==============================================================================
+GltTerm = namedtuple('GltTerm', ['coeff', 'factors'])
+GltTerm.__doc__ = """
+A separable term of a gelatized symbol.
+
+coeff: sympy.Expr
+    coefficient, independent of the Fourier variables
+
+factors: tuple
+    for every axis, the sorted tuple of the derivative orders of the 1d
+    symbols multiplied on this axis
+"""
+
+#==============================================================================
+def fourier_variables(dim):
+    """Returns the Fourier variables used by gelatize."""
+    return [Symbol('t{}'.format(i)) for i in ['x', 'y', 'z'][:dim]]
+
+def _order(atom):
+    if isinstance(atom, GltSymbol):
+        return int(atom.order)
+
+    return atom.order
+
+#==============================================================================
+def glt_terms(expr, dim):
+    """
+    Splits a gelatized symbol into separable terms, see GltTerm. Terms with
+    the same factors are merged.
+
+    expr: sympy.Expr
+        the output of gelatize, computed without degrees
+
+    dim: int
+        the dimension of the form
+    """
+    ts = fourier_variables(dim)
+
+    terms = {}
+    for term in Add.make_args(expand(expr)):
+        factors = [[] for i in range(dim)]
+        coeff   = []
+
+        for f in Mul.make_args(term):
+            b, e = f.as_base_exp()
+
+            if isinstance(b, BasicGlt):
+                if not( e.is_Integer and e > 0 ):
+                    raise ValueError('> Expecting positive integer powers of the symbols')
+
+                axis = ts.index(b.args[1])
+                factors[axis] += [_order(b)] * int(e)
+
+            elif f.has(*ts):
+                raise ValueError('> Cannot separate {}, expecting unevaluated '
+                                 'symbols (call gelatize without degrees)'.format(f))
+
+            else:
+                coeff.append(f)
+
+        factors = tuple(tuple(sorted(i)) for i in factors)
+        terms[factors] = terms.get(factors, S.Zero) + Mul(*coeff)
+
+    return [GltTerm(c, f) for f,c in terms.items() if not( c == 0 )]
+
+#==============================================================================
+def _as_list(v, dim):
+    if isinstance(v, (tuple, list)):
+        if not( len(v) == dim ):
+            raise ValueError('> Expecting {} values, given {}'.format(dim, len(v)))
+
+        return list(v)
+
+    return [v]*dim
+
+def sample_terms(terms, degrees, ts, sampler=None):
+    """
+    Evaluates the 1d factors of separable terms.
+
+    Every distinct (axis, order) pair is evaluated once. Returns a list of
+    (coeff, [f_1, ..., f_d]) where f_i are the 1d arrays of the values on
+    the axis i, or None when the term does not depend on this axis.
+
+    terms: list
+        list of GltTerm
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    ts: list
+        the 1d arrays of Fourier variables for every axis
+
+    sampler: callable
+        function (p, order, axis) returning the values of a 1d symbol; by
+        default gelato.numeric.glt_symbol is used on ts
+    """
+    dim     = len(ts)
+    degrees = _as_list(degrees, dim)
+
+    if sampler is None:
+        sampler = lambda p, order, axis: glt_symbol(p, ts[axis], order)
+
+    values = {}
+    def _value(axis, order):
+        key = (axis, order)
+        if not( key in values ):
+            values[key] = sampler(degrees[axis], order, axis)
+        return values[key]
+
+    samples = []
+    for term in terms:
+        fs = []
+        for axis, orders in enumerate(term.factors):
+            f = None
+            for order in orders:
+                v = _value(axis, order)
+                f = v if f is None else f * v
+            fs.append(f)
+
+        samples.append((term.coeff, fs))
+
+    return samples
+
+def sample_fourier_grid_terms(expr, dim, degrees, n):
+    """
+    Samples the 1d factors of a gelatized symbol on the grids
+    t_j = j*pi/n, j = 0, ..., n of every axis, using real FFTs
+    (see gelato.numeric.sample_fourier_grid).
+
+    Returns a list of (coeff, [f_1, ..., f_d]) that can be assembled with
+    outer_product.
+
+    expr: sympy.Expr, list
+        the output of gelatize, computed without degrees, or its GltTerm
+
+    dim: int
+        the dimension of the form
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    n: int, list, tuple
+        number of grid intervals for every axis
+    """
+    terms = expr if isinstance(expr, (list, tuple)) else glt_terms(expr, dim)
+    ns    = _as_list(n, dim)
+    ts    = [fourier_grid(i) for i in ns]
+
+    sampler = lambda p, order, axis: sample_fourier_grid(p, order, ns[axis])
+
+    return sample_terms(terms, degrees, ts, sampler=sampler)
+
+#==============================================================================
+def outer_product(samples, shape, dtype=float, out=None):
+    """
+    Assembles the tensor-product array sum_k coeff_k * f_1 x ... x f_d from
+    sampled terms, whose coefficients must be numbers.
+
+    samples: list
+        the output of sample_terms or sample_fourier_grid_terms
+
+    shape: tuple
+        the shape of the tensor grid
+
+    out: numpy.ndarray
+        optional output array
+    """
+    if out is None:
+        out = np.zeros(shape, dtype=dtype)
+    else:
+        out[...] = 0
+
+    dim = len(shape)
+    for coeff, fs in samples:
+        c = complex(coeff) if np.iscomplexobj(out) else float(coeff)
+
+        value = np.asarray(c)
+        for axis, f in enumerate(fs):
+            if f is None:
+                continue
+
+            index = [None]*dim
+            index[axis] = slice(None)
+            value = value * f[tuple(index)]
+
+        out += value
+
+    return out
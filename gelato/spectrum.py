@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module predicts the spectrum of discretized operators from their GLT
+symbol, without assembling any matrix.
+
+For a symbol f(x, t) defined on [0,1]^d x [0,pi]^d, the eigenvalues of the
+matrix of size N = n_1 ... n_d are distributed as the values of f: sorting
+N samples of f on a uniform grid (the monotone rearrangement of f) gives a
+prediction of the sorted eigenvalues.
+
+When the symbol depends on the space variables, the samples are taken on the
+tensor product of a space grid of m_i points and a Fourier grid of about
+n_i/m_i points per axis, and the N eigenvalues are interpolated between the
+quantiles of the sorted samples.
+"""
+
+import numpy as np
+
+from sympy import lambdify
+from sympy import expand
+from sympy import I as sympy_I
+
+from sympde.expr import BilinearForm
+
+from .expr      import GltExpr
+from .separable import glt_terms, sample_terms, outer_product, _as_list
+from .mapping   import mapping_symbols, mapping_grid
+
+__all__ = ('predict_eigenvalues',)
+
+#==============================================================================
+def _grid(n):
+    """Returns the Fourier grid t_j = j*pi/(n+1), j = 1, ..., n."""
+    return np.arange(1, n+1) * (np.pi / (n+1))
+
+def _mapped(func, mapping, symbols):
+    """
+    Returns a function of the logical coordinates, calling func with the
+    coordinates and the values of the symbols of the mapping, taken from the
+    cached grid of the coordinates.
+    """
+    def _func(*x):
+        d = mapping_grid(mapping, x).values()
+        return func(*(list(x) + [d[s] for s in symbols]))
+
+    return _func
+
+def _coefficients(terms, glt, n_elements, values, real=True, parts=False,
+                  mapping=None):
+    """
+    Returns, for every term, a function of the space variables computing its
+    coefficient, and whether a coefficient depends on the space variables.
+    If real is True, the coefficients must be real. If parts is True, a pair
+    of functions computing the real and imaginary parts is returned for
+    every term, the constants and space variables being real. With a
+    mapping, the functions take the logical coordinates.
+    """
+    dim = glt.ldim
+
+    ns = ['n{}'.format(i) for i in ['x', 'y', 'z'][:dim]]
+    ns = dict(zip(ns, n_elements))
+
+    coordinates = list(glt.coordinates)[:dim]
+
+    symbols = []
+    if not( mapping is None ):
+        jacobian, determinant = mapping_symbols(mapping)
+        symbols = [s for row in jacobian for s in row] + [determinant]
+
+    def _lambdify(expr):
+        if not symbols or not expr.has(*symbols):
+            return lambdify(coordinates, expr, 'numpy')
+
+        func = lambdify(coordinates + symbols, expr, 'numpy')
+        return _mapped(func, mapping, symbols)
+
+    values = {str(k): v for k,v in values.items()}
+    values.update(ns)
+
+    funcs  = []
+    is_variable = False
+    for term in terms:
+        coeff = term.coeff.subs({s: values[str(s)]
+                                 for s in term.coeff.free_symbols
+                                 if str(s) in values})
+
+        unknown = [s for s in coeff.free_symbols
+                   if not( s in coordinates or s in symbols )]
+        if unknown:
+            raise NotImplementedError('Cannot evaluate {}, unknown symbols '
+                                      '{}'.format(term.coeff, unknown))
+
+        if coeff.free_symbols:
+            is_variable = True
+
+        if parts:
+            coeff = expand(coeff)
+            im    = coeff.coeff(sympy_I)
+            re    = expand(coeff - sympy_I*im)
+
+            funcs.append((_lambdify(re), _lambdify(im)))
+            continue
+
+        if real and coeff.has(sympy_I):
+            raise ValueError('> Expecting a real symbol')
+
+        funcs.append(_lambdify(coeff))
+
+    return funcs, is_variable
+
+def _sampling(n_elements, n_space, is_variable):
+    """
+    Returns the number of samples of the space variables and of the Fourier
+    variables for every axis, whose product is about n_elements.
+    """
+    dim = len(n_elements)
+
+    if is_variable:
+        if n_space is None:
+            n_space = [max(1, int(round(np.sqrt(n)))) for n in n_elements]
+
+        n_space = [int(i) for i in _as_list(n_space, dim)]
+
+    else:
+        n_space = [1]*dim
+
+    n_fourier = [-(-n // m) for n,m in zip(n_elements, n_space)]
+
+    return n_space, n_fourier
+
+def _rearrange(out, size, k=None, which='smallest'):
+    """
+    Returns the k smallest or largest of size values predicted from the
+    samples out, in increasing order. The samples are sorted, or partially
+    sorted, in place, and the values are interpolated between the quantiles
+    of the samples when their number differs from size.
+    """
+    n_values = len(out)
+
+    if k is None:
+        k = size
+
+    k = min(int(k), size)
+    if k < 1:
+        return np.empty(0)
+
+    # indices of the quantiles of the wanted values in the samples
+    j = np.arange(k) if which == 'smallest' else np.arange(size - k, size)
+    q = (j + 0.5) * (n_values / size) - 0.5
+    q = np.clip(q, 0, n_values - 1)
+
+    if which == 'smallest':
+        r = min(n_values, int(np.ceil(q[-1])) + 1)
+        if r < n_values:
+            out.partition(r - 1)
+        part   = out[:r]
+        offset = 0
+
+    else:
+        offset = max(0, int(np.floor(q[0])))
+        if offset > 0:
+            out.partition(offset)
+        part = out[offset:]
+
+    part.sort()
+
+    # ... one sample per value, part holds the wanted values
+    if n_values == size:
+        return part[:k]
+    # ...
+
+    return np.interp(q - offset, np.arange(len(part)), part)
+
+#==============================================================================
+def predict_eigenvalues(glt, degrees, n_elements, k=None, which='smallest',
+                        n_space=None, out=None, mapping=None, **values):
+    """
+    Predicts the sorted eigenvalues of the matrix of a form, discretized with
+    n_elements per axis, from its GLT symbol. The prediction is exact in the
+    limit of large n_elements. Returns an array in increasing order.
+
+    glt: GltExpr, BilinearForm
+        the form, whose symbol must be real
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    n_elements: int, list, tuple
+        number of elements for every axis
+
+    k: int
+        if given, only the k smallest or largest eigenvalues are computed,
+        using a partial sort
+
+    which: str
+        'smallest' or 'largest', used with k
+
+    n_space: int, list, tuple
+        number of samples of the space variables for every axis, when the
+        symbol depends on them. The default is about sqrt(n_elements).
+
+    out: numpy.ndarray
+        optional float64 work array, holding the samples of the symbol. The
+        full spectrum is sorted in place and returned in it when possible.
+
+    mapping: sympde.topology.Mapping
+        an analytical mapping of the domain of the form, see gelato.mapping
+
+    values: dict
+        values of the constants, given by name
+
+    Examples
+
+    >>> predict_eigenvalues(glt, degrees=3, n_elements=200)[:4]
+    """
+    if isinstance(glt, BilinearForm):
+        glt = GltExpr(glt)
+
+    if glt.fields:
+        raise NotImplementedError('Fields are not available yet')
+
+    if not( which in ('smallest', 'largest') ):
+        raise ValueError('> which must be smallest or largest, given {}'.format(which))
+
+    dim        = glt.ldim
+    degrees    = [int(i) for i in _as_list(degrees,    dim)]
+    n_elements = [int(i) for i in _as_list(n_elements, dim)]
+
+    size  = int(np.prod(n_elements))
+    terms = glt_terms(glt.separable_symbol(mapping), dim)
+
+    funcs, is_variable = _coefficients(terms, glt, n_elements, values,
+                                       mapping=mapping)
+
+    # ... sampling grids
+    n_space, n_fourier = _sampling(n_elements, n_space, is_variable)
+
+    xs = [(np.arange(m) + 0.5) / m for m in n_space]
+    ts = [_grid(n) for n in n_fourier]
+    # ...
+
+    # ... samples of the symbol, in a single buffer
+    n_points = int(np.prod(n_space))
+    shape    = tuple(n_fourier)
+    n_values = n_points * int(np.prod(shape))
+
+    if out is None:
+        out = np.empty(n_values)
+
+    elif not( out.shape == (n_values,) ) or not( out.dtype == np.float64 ):
+        raise ValueError('> Expecting a float64 out array of shape ({},)'.format(n_values))
+
+    buffer  = out.reshape((n_points,) + shape)
+    samples = sample_terms(terms, degrees, ts)
+
+    if is_variable:
+        x = np.meshgrid(*xs, indexing='ij')
+        coeffs = [np.broadcast_to(f(*x), tuple(n_space)).reshape(-1) for f in funcs]
+
+        for i in range(n_points):
+            outer_product([(c[i], fs) for c,(_, fs) in zip(coeffs, samples)],
+                          shape, out=buffer[i])
+
+    else:
+        outer_product([(f(*[0.]*dim), fs) for f,(_, fs) in zip(funcs, samples)],
+                      shape, out=buffer[0])
+    # ...
+
+    return _rearrange(out, size, k=k, which=which)
@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module contains a persistent on-disk store for the GLT coefficient
+tables.
+
+Each derivative order is stored in its own file, as exact numerators and
+denominators. The files are shared between processes: readers only see
+complete files since writes are atomic, and writers are serialized by a lock
+file.
+
+The store is located in the directory given by the environment variable
+GELATO_CACHE_DIR, or in ~/.cache/gelato by default. Setting GELATO_DISK_CACHE
+to 0 disables it.
+
+The store can be filled in advance using::
+
+  gelato-tables --degree 30
+
+or equivalently::
+
+  python3 -m gelato.store --degree 30
+"""
+
+import os
+import json
+import tempfile
+from fractions import Fraction
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .bspline import glt_coefficients
+
+__all__ = ('STORE_VERSION',
+           'TableStore',
+           'default_store_directory',
+           'get_store',
+           'set_store')
+
+# version of the file format, files with another version are ignored
+STORE_VERSION = 1
+
+#==============================================================================
+def default_store_directory():
+    """
+    Returns the directory used by the default store.
+    """
+    path = os.environ.get('GELATO_CACHE_DIR')
+    if not path:
+        root = os.environ.get('XDG_CACHE_HOME',
+                              os.path.join(os.path.expanduser('~'), '.cache'))
+        path = os.path.join(root, 'gelato')
+
+    return path
+
+#==============================================================================
+@contextmanager
+def _locked(filename):
+    """
+    Holds an exclusive lock on the given file while the context is active.
+    On platforms without fcntl, no locking is done.
+    """
+    with open(filename, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+#==============================================================================
+class TableStore(object):
+    """
+    A persistent store of the exact GLT coefficient tables.
+
+    directory: str
+        the directory where the tables are written
+
+    Examples
+
+    >>> store = TableStore('/tmp/gelato')
+    >>> store.get(9, 2) is None
+    True
+    >>> phi = store.compute(9, 2)
+    >>> store.get(9, 2) == phi
+    True
+    """
+
+    def __init__(self, directory):
+        self._directory = directory
+        self._tables    = {}
+
+    @property
+    def directory(self):
+        return self._directory
+
+    def filename(self, order):
+        """Returns the file used to store the tables of a derivative order."""
+        name = 'glt_order_{order}.v{version}.json'.format(order=order,
+                                                         version=STORE_VERSION)
+        return os.path.join(self.directory, name)
+
+    def _read(self, order):
+        try:
+            with open(self.filename(order), 'r') as f:
+                data = json.load(f)
+
+        except (OSError, ValueError):
+            return {}
+
+        if not( data.get('version') == STORE_VERSION ) or not( data.get('order') == order ):
+            return {}
+
+        return {int(p): [Fraction(n, d) for n,d in values]
+                for p,values in data['tables'].items()}
+
+    def _write(self, order, tables):
+        data = {'version': STORE_VERSION,
+                'order'  : order,
+                'tables' : {str(p): [[c.numerator, c.denominator] for c in values]
+                            for p,values in sorted(tables.items())}}
+
+        # ... atomic write, readers never see a partial file
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.chmod(tmp, 0o644)
+            os.replace(tmp, self.filename(order))
+
+        except BaseException:
+            os.remove(tmp)
+            raise
+        # ...
+
+    def get(self, p, order):
+        """
+        Returns the stored coefficients for a degree and a derivative order,
+        or None if they are not available.
+        """
+        tables = self._tables.get(order)
+        if tables is None or not( p in tables ):
+            tables = self._read(order)
+            self._tables[order] = tables
+
+        return tables.get(p)
+
+    def put(self, p, order, values):
+        """
+        Stores the coefficients for a degree and a derivative order.
+        Errors on a read-only or missing file system are silently ignored.
+        """
+        self.put_many(order, {p: values})
+
+    def put_many(self, order, tables):
+        """
+        Stores the coefficients of several degrees of a derivative order,
+        given as a dictionary degree -> coefficients, in a single write.
+        Errors on a read-only or missing file system are silently ignored.
+        """
+        new = {p: list(values) for p,values in tables.items()}
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with _locked(self.filename(order) + '.lock'):
+                stored  = self._read(order)
+                missing = {p: v for p,v in new.items() if not( p in stored )}
+                if missing:
+                    stored.update(missing)
+                    self._write(order, stored)
+
+        except OSError:
+            stored = self._tables.get(order, {})
+            stored.update(new)
+
+        self._tables[order] = stored
+
+    def compute(self, p, order):
+        """
+        Returns the coefficients for a degree and a derivative order, computing
+        and storing them if needed.
+        """
+        values = self.get(p, order)
+        if values is None:
+            values = glt_coefficients(p, order)
+            self.put(p, order, values)
+
+        return values
+
+    def warm(self, degree, orders=(0, 1, 2, 4)):
+        """
+        Fills the store for all degrees up to the given one. Every derivative
+        order is read and written once.
+
+        degree: int
+            maximum spline degree
+
+        orders: list, tuple
+            derivative orders to compute
+        """
+        for order in orders:
+            # ... the file is read once, the missing degrees are written at once
+            stored = self._read(order)
+            self._tables[order] = stored
+
+            tables = {}
+            for p in range(1, degree+1):
+                if order <= 2*p and not( p in stored ):
+                    tables[p] = glt_coefficients(p, order)
+
+            if tables:
+                self.put_many(order, tables)
+            # ...
+
+    def clear(self):
+        """
+        Removes all the tables of the store. The lock files are kept, since
+        another process may hold a lock on them.
+        """
+        self._tables = {}
+        if not os.path.isdir(self.directory):
+            return
+
+        for name in os.listdir(self.directory):
+            if name.startswith('glt_order_') and not name.endswith('.lock'):
+                os.remove(os.path.join(self.directory, name))
+
+#==============================================================================
+_store = None
+
+def get_store():
+    """
+    Returns the default store, or None if the disk cache is disabled.
+    """
+    global _store
+
+    if os.environ.get('GELATO_DISK_CACHE', '1').lower() in ('0', 'off', 'false', 'no'):
+        return None
+
+    if _store is None:
+        _store = TableStore(default_store_directory())
+
+    return _store
+
+def set_store(store):
+    """
+    Sets the default store. It can be a TableStore, a directory or None to
+    use the default directory.
+    """
+    global _store
+
+    if isinstance(store, str):
+        store = TableStore(store)
+
+    _store = store
+
+#==============================================================================
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Fill the GeLaTo on-disk '
+                                                 'table store.')
+    parser.add_argument('--degree', type=int, required=True,
+                        help='maximum spline degree')
+    parser.add_argument('--orders', type=int, nargs='+', default=[0, 1, 2, 4],
+                        help='derivative orders (default: 0 1 2 4)')
+    parser.add_argument('--directory', default=None,
+                        help='store directory (default: {})'.format(default_store_directory()))
+
+    args = parser.parse_args(argv)
+
+    store = TableStore(args.directory or default_store_directory())
+    store.warm(args.degree, orders=args.orders)
+
+    print('> tables up to degree {} written to {}'.format(args.degree, store.directory))
+
+if __name__ == '__main__':
+    main()
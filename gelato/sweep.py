@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module evaluates a gelatized symbol over many discretizations.
+
+The symbol is gelatized once, with symbolic degrees and numbers of elements,
+and split into separable terms (see gelato.separable). The 1d factors are
+then sampled once per degree, while the coefficients, which only depend on
+the numbers of elements, are evaluated for all of them at once. Every
+(degree, number of elements) pair is then a small matrix product.
+"""
+
+import numpy as np
+
+from sympy import Symbol
+from sympy import lambdify
+
+from .numeric   import glt_symbol, fourier_grid, sample_fourier_grid
+from .separable import glt_terms, sample_terms, _as_list
+
+__all__ = ('sweep_symbol',)
+
+#==============================================================================
+def _as_tuples(values, dim):
+    return [tuple(int(i) for i in _as_list(v, dim)) for v in values]
+
+def _tensor(fs, shape):
+    """Returns the tensor product of the 1d factors, on the grid shape."""
+    dim   = len(shape)
+    value = np.ones(())
+    for axis, f in enumerate(fs):
+        if f is None:
+            continue
+
+        index = [None]*dim
+        index[axis] = slice(None)
+        value = value * f[tuple(index)]
+
+    return np.broadcast_to(value, shape)
+
+#==============================================================================
+def sweep_symbol(expr, dim, degrees, n_elements, ts, values=None):
+    """
+    Evaluates a gelatized symbol for every degree and number of elements.
+    Returns an array of shape (len(degrees), len(n_elements)) + the shape of
+    the tensor grid of the Fourier variables.
+
+    expr: sympy.Expr
+        the output of gelatize, computed without degrees and number of
+        elements
+
+    dim: int
+        the dimension of the form
+
+    degrees: list
+        the degrees, every entry being an int or a tuple of dim ints
+
+    n_elements: list
+        the numbers of elements, every entry being an int or a tuple of dim
+        ints
+
+    ts: list
+        for every axis, a 1d array of Fourier variables, or an int m for the
+        grid t_j = j*pi/m, j = 0, ..., m, sampled with real FFTs
+
+    values: dict
+        values of the other symbols of the coefficients (constants, space
+        variables), given by symbol or by name, as scalars
+
+    Examples
+
+    >>> ts = [np.linspace(0, np.pi, 65)]*2
+    >>> sweep_symbol(expr, 2, [1, 2, 3], [16, 32, 64], ts).shape
+    (3, 3, 65, 65)
+    """
+    degrees    = _as_tuples(degrees,    dim)
+    n_elements = _as_tuples(n_elements, dim)
+    ts         = _as_list(ts, dim)
+
+    ns = [Symbol('n{}'.format(i), integer=True) for i in ['x', 'y', 'z'][:dim]]
+
+    # ... other symbols, by name
+    values = {str(k): v for k,v in (values or {}).items()}
+    # ...
+
+    # ... coefficients, for all the numbers of elements at once
+    terms = glt_terms(expr, dim)
+    n_arrays = [np.array([n[axis] for n in n_elements], dtype=float)
+                for axis in range(dim)]
+
+    coeffs = []
+    for term in terms:
+        others = sorted(term.coeff.free_symbols - set(ns), key=str)
+        unknown = [s for s in others if not( str(s) in values )]
+        if unknown:
+            raise NotImplementedError('Cannot evaluate {}, unknown symbols '
+                                      '{}'.format(term.coeff, unknown))
+
+        arrays = [s for s in others if np.ndim(values[str(s)]) > 0]
+        if arrays:
+            raise ValueError('> Expecting scalar values for {}, in the '
+                             'coefficient {}'.format(arrays, term.coeff))
+
+        func = lambdify(ns + others, term.coeff, 'numpy')
+        c = func(*(n_arrays + [values[str(s)] for s in others]))
+        coeffs.append(np.broadcast_to(c, (len(n_elements),)))
+
+    coeffs = np.array(coeffs).reshape((len(terms), len(n_elements)))
+    dtype  = complex if np.iscomplexobj(coeffs) else float
+    # ...
+
+    # ... the 1d factors are sampled once per (degree, order, axis)
+    grids = [fourier_grid(t) if isinstance(t, int) else np.asarray(t, dtype=float)
+             for t in ts]
+    shape = tuple(len(t) for t in grids)
+
+    samples = {}
+    def sampler(p, order, axis):
+        key = (p, order, axis)
+        if not( key in samples ):
+            if isinstance(ts[axis], int):
+                samples[key] = sample_fourier_grid(p, order, ts[axis])
+            else:
+                samples[key] = glt_symbol(p, grids[axis], order)
+
+        return samples[key]
+    # ...
+
+    out = np.zeros((len(degrees), len(n_elements)) + shape, dtype=dtype)
+    if not terms:
+        return out
+
+    for i, p in enumerate(degrees):
+        fs = sample_terms(terms, p, grids, sampler=sampler)
+        fs = np.array([_tensor(f, shape) for c,f in fs]).reshape((len(terms), -1))
+
+        # ... sum over the terms, for all the numbers of elements
+        out[i] = np.dot(coeffs.T, fs).reshape((len(n_elements),) + shape)
+
+    return out
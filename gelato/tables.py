@@ -0,0 +1,295 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module gives access to the GLT coefficient tables for any degree and
+any derivative order.
+
+The table of degree p and derivative order k contains the values of the k-th
+derivative of the cardinal B-spline of degree 2p+1 at the integers p+1-i,
+for i = 0, ..., p. Tables are generated lazily, kept in memory and in the
+on-disk store (see gelato.store).
+
+The tables of the orders 0, 1 and 2 are hard-coded for p <= P_MAX. They are
+packed, for every order, in flat int64 buffers of numerators and
+denominators and a float64 buffer of values, the degree p being stored at
+offsets[p-1]:offsets[p].
+"""
+
+from collections import namedtuple
+from fractions import Fraction
+from functools import lru_cache
+from numbers import Integral
+
+import numpy as np
+
+from .bspline import glt_coefficients
+from .store   import get_store
+
+__all__ = ('P_MAX',
+           'PackedTable',
+           'packed_table',
+           'tabulated',
+           'check_order',
+           'exact_table',
+           'series_coefficients')
+
+#==============================================================================
+# HARD-CODED TABLES, as (numerator, denominator) pairs
+#==============================================================================
+P_MAX = 8
+
+# ... phi_{2p+1}
+_d_phi = {}
+_d_phi[1] = [(2,3),
+             (1,6)]
+_d_phi[2] = [(11,20),
+             (13,60),
+             (1,120)]
+_d_phi[3] = [(151,315),
+             (397,1680),
+             (1,42),
+             (1,5040)]
+_d_phi[4] = [(15619,36288),
+             (44117,181440),
+             (913,22680),
+             (251,181440),
+             (1,362880)]
+_d_phi[5] = [(655177,1663200),
+             (1623019,6652800),
+             (1093,19800),
+             (50879,13305600),
+             (509,9979200),
+             (1,39916800)]
+_d_phi[6] = [(27085381,74131200),
+             (125468459,518918400),
+             (28218769,415134720),
+             (910669,124540416),
+             (82207,345945600),
+             (1363,1037836800),
+             (1,6227020800)]
+_d_phi[7] = [(2330931341,6810804000),
+             (103795866137,435891456000),
+             (6423562433,81729648000),
+             (15041229521,1307674368000),
+             (26502841,40864824000),
+             (13824739,1307674368000),
+             (2047,81729648000),
+             (1,1307674368000)]
+_d_phi[8] = [(12157712239,37638881280),
+             (8313722318537,35568742809600),
+             (7763913237097,88921857024000),
+             (317627331799,19760412672000),
+             (23667665053,17784371404800),
+             (297507989,7113748561920),
+             (704339,1976041267200),
+             (851,2309658624000),
+             (1,355687428096000)]
+# ...
+
+# ... phi'_{2p+1}
+_d_phi_r = {}
+_d_phi_r[1] = [(0,1),
+               (1,2)]
+_d_phi_r[2] = [(0,1),
+               (5,12),
+               (1,24)]
+_d_phi_r[3] = [(0,1),
+               (49,144),
+               (7,90),
+               (1,720)]
+_d_phi_r[4] = [(0,1),
+               (809,2880),
+               (289,2880),
+               (41,6720),
+               (1,40320)]
+_d_phi_r[5] = [(0,1),
+               (6787,28800),
+               (16973,151200),
+               (5203,403200),
+               (253,907200),
+               (1,3628800)]
+_d_phi_r[6] = [(0,1),
+               (728741,3628800),
+               (1700933,14515200),
+               (441337,21772800),
+               (10777,10886400),
+               (2041,239500800),
+               (1,479001600)]
+_d_phi_r[7] = [(0,1),
+               (35263201,203212800),
+               (4489301,38102400),
+               (5532241,203212800),
+               (233021,104781600),
+               (6323,121927680),
+               (31,165110400),
+               (1,87178291200)]
+_d_phi_r[8] = [(0,1),
+               (11102502613,73156608000),
+               (8480306503,73156608000),
+               (7939969,238436352),
+               (3146582819,804722688000),
+               (353015251,2092278988800),
+               (775319,387459072000),
+               (32759,10461394944000),
+               (1,20922789888000)]
+# ...
+
+# ... phi''_{2p+1}
+_d_phi_rr = {}
+_d_phi_rr[1] = [(-2,1),
+                (1,1)]
+_d_phi_rr[2] = [(-1,1),
+                (1,3),
+                (1,6)]
+_d_phi_rr[3] = [(-2,3),
+                (1,8),
+                (1,5),
+                (1,120)]
+_d_phi_rr[4] = [(-35,72),
+                (11,360),
+                (17,90),
+                (59,2520),
+                (1,5040)]
+_d_phi_rr[5] = [(-809,2160),
+                (-1,64),
+                (31,189),
+                (907,24192),
+                (25,18144),
+                (1,362880)]
+_d_phi_rr[6] = [(-4319,14400),
+                (-11731,302400),
+                (6647,48384),
+                (3455,72576),
+                (2251,604800),
+                (113,2217600),
+                (1,39916800)]
+_d_phi_rr[7] = [(-56057,226800),
+                (-104159,2073600),
+                (43993,388800),
+                (333361,6220800),
+                (14623,2138400),
+                (16081,68428800),
+                (73,55598400),
+                (1,6227020800)]
+_d_phi_rr[8] = [(-35263201,169344000),
+                (-253354477,4572288000),
+                (30188519,326592000),
+                (44897821,798336000),
+                (36700199,3592512000),
+                (58605299,93405312000),
+                (382201,36324288000),
+                (131,5230697472),
+                (1,1307674368000)]
+# ...
+
+# ... derivative order => tabulated values
+_tables = {0: _d_phi, 1: _d_phi_r, 2: _d_phi_rr}
+# ...
+
+PackedTable = namedtuple('PackedTable', ['offsets', 'numerators',
+                                         'denominators', 'values'])
+
+@lru_cache(maxsize=None)
+def packed_table(order):
+    """
+    Returns the hard-coded tables of a derivative order, 0, 1 or 2, for the
+    degrees 1 to P_MAX, as a PackedTable of read-only arrays. The
+    coefficients of the degree p are at offsets[p-1]:offsets[p]. The values
+    are the correctly rounded float64 numerator/denominator.
+    """
+    if not( order in _tables ):
+        raise ValueError('> No hard-coded table of order {}'.format(order))
+
+    pairs = [pair for p in range(1, P_MAX+1) for pair in _tables[order][p]]
+
+    offsets      = np.cumsum([0] + [len(_tables[order][p]) for p in range(1, P_MAX+1)])
+    numerators   = np.array([n for n, d in pairs], dtype=np.int64)
+    denominators = np.array([d for n, d in pairs], dtype=np.int64)
+    values       = np.array([n / d for n, d in pairs])
+
+    for a in [offsets, numerators, denominators, values]:
+        a.setflags(write=False)
+
+    return PackedTable(offsets, numerators, denominators, values)
+
+def tabulated(p, order):
+    """
+    Returns the numerators, denominators and values of the hard-coded table
+    of the degree p and a derivative order, as views of the packed buffers,
+    or None if the table is not hard-coded.
+    """
+    if not( order in _tables and 1 <= p <= P_MAX ):
+        return None
+
+    table = packed_table(order)
+    i, j  = table.offsets[p-1], table.offsets[p]
+
+    return table.numerators[i:j], table.denominators[i:j], table.values[i:j]
+
+#==============================================================================
+def check_order(p, order):
+    """
+    Checks that a derivative order is available for the degree p, i.e. that
+    0 <= order <= 2p. Any integer type is accepted, e.g. numpy.int64, and
+    the degree and the order are returned as ints.
+    """
+    if not isinstance(p, Integral) or p < 1:
+        raise ValueError('> Expecting a positive degree, given {}'.format(p))
+
+    if not isinstance(order, Integral) or not( 0 <= order <= 2*p ):
+        raise NotImplementedError('symbol of order {order} not available '
+                                  'for degree {p}'.format(order=order, p=p))
+
+    return int(p), int(order)
+
+#==============================================================================
+@lru_cache(maxsize=None)
+def exact_table(p, order):
+    """
+    Returns the exact coefficients (phi_0, ..., phi_p), as Fractions, for the
+    degree p and a derivative order between 0 and 2p.
+    """
+    p, order = check_order(p, order)
+
+    table = tabulated(p, order)
+    if not( table is None ):
+        numerators, denominators, values = table
+        return tuple(Fraction(n, d) for n, d in zip(numerators.tolist(),
+                                                    denominators.tolist()))
+
+    store = get_store()
+    if store is None:
+        phi = glt_coefficients(p, order)
+    else:
+        phi = store.compute(p, order)
+
+    return tuple(phi)
+
+#==============================================================================
+@lru_cache(maxsize=None)
+def series_coefficients(p, order):
+    """
+    Returns the float64 coefficients (c_0, ..., c_p) of the symbol of degree p
+    and a given derivative order, written as the cosine series
+    sum_k c_k cos(k t) for even orders and as the sine series
+    sum_k c_k sin(k t) for odd orders (in which case c_0 = 0).
+    The returned array is read-only.
+    """
+    sign  = (-1)**((order + 1) // 2)
+    table = tabulated(p, order)
+
+    if table is None:
+        phi = exact_table(p, order)
+
+        c = np.array([float(sign * 2 * i) for i in phi])
+        c[0] = 0. if order % 2 == 1 else float(sign * phi[0])
+
+    else:
+        numerators, denominators, values = table
+
+        c = (sign * 2) * values
+        c[0] = 0. if order % 2 == 1 else sign * values[0]
+    c.setflags(write=False)
+
+    return c
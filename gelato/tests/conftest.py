@@ -0,0 +1,20 @@
+# coding: utf-8
+
+import pytest
+
+from gelato.store import set_store
+
+#==============================================================================
+@pytest.fixture(autouse=True)
+def table_store(tmp_path, monkeypatch):
+    """
+    Redirects the on-disk table store to a temporary directory, so that the
+    tests never write to the user's cache. The default store is reset
+    before and after every test.
+    """
+    monkeypatch.setenv('GELATO_CACHE_DIR', str(tmp_path / 'gelato'))
+    monkeypatch.delenv('GELATO_DISK_CACHE', raising=False)
+
+    set_store(None)
+    yield
+    set_store(None)
@@ -0,0 +1,117 @@
+# coding: utf-8
+
+import numpy as np
+from scipy.linalg import toeplitz
+
+from sympde.core import Constant
+from sympde.calculus import grad, dot
+from sympde.topology import dx1
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+from gelato import GltExpr
+from gelato import toeplitz_bands, toeplitz_matrix, assemble
+from gelato.tables import series_coefficients
+
+DIM = 2
+
+#==============================================================================
+def test_toeplitz_matrix():
+    for p in [1, 2, 3]:
+        for order in [0, 2]:
+            c = series_coefficients(p, order)
+
+            column = np.zeros(10)
+            column[:p+1] = c
+            column[1:p+1] /= 2
+
+            A = toeplitz_matrix(p, order, 10)
+            assert( A.nnz == 10*(2*p+1) - p*(p+1) )
+            assert( np.allclose(A.toarray(), toeplitz(column)) )
+
+        # ... odd orders are skew-symmetric
+        A = toeplitz_matrix(p, 1, 10).toarray()
+        assert( np.allclose(A, -A.T) )
+        assert( A[0,1] > 0 )
+
+    # ... periodic mass matrix of the quadratic B-splines
+    A = toeplitz_matrix(2, 0, 5, periodic=True).toarray() * 120
+    assert( np.allclose(A[0], [66, 26, 1, 1, 26]) )
+
+#==============================================================================
+def test_toeplitz_product():
+    n = 12
+    for p in [1, 2]:
+        bands = toeplitz_bands(p, (0, 2))
+        assert( len(bands) == 4*p+1 )
+
+        # ... circulant matrices are multiplied exactly
+        A = toeplitz_matrix(p, (0, 2), n, periodic=True)
+        M = toeplitz_matrix(p, 0, n, periodic=True)
+        S = toeplitz_matrix(p, 2, n, periodic=True)
+        assert( np.allclose(A.toarray(), (M @ S).toarray()) )
+
+#==============================================================================
+def test_assemble_2d():
+    domain = Domain('Omega', dim=DIM)
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    c = Constant('c')
+
+    expr = dot(grad(v), grad(u)) + dx1(u)*v + c*u*v
+    a = BilinearForm((u,v), integral(domain, expr))
+
+    # ... sum of Kronecker products, scaled as in gelatize
+    degrees    = [2,3]
+    n_elements = [5,6]
+
+    A = assemble(a, degrees, n_elements, c=2.)
+    assert( A.shape == (30, 30) )
+    assert( A.dtype == np.float64 )
+
+    M1 = toeplitz_matrix(2, 0, 5).toarray() ; S1 = toeplitz_matrix(2, 2, 5).toarray()
+    D1 = toeplitz_matrix(2, 1, 5).toarray()
+    M2 = toeplitz_matrix(3, 0, 6).toarray() ; S2 = toeplitz_matrix(3, 2, 6).toarray()
+
+    expected = (np.kron(S1, M2) * 5/6 + np.kron(M1, S2) * 6/5 +
+                np.kron(D1, M2) / 6 + 2. * np.kron(M1, M2) / 30)
+
+    assert( np.allclose(A.tosparse().toarray(), expected) )
+
+    X = np.random.random((30, 4))
+    assert( np.allclose(A @ X, expected @ X) )
+    assert( np.allclose(A @ X[:,0], expected @ X[:,0]) )
+    assert( np.allclose(A.H @ X, expected.T @ X) )
+    # ...
+
+    # ... the circulant operator is diagonalized by the Fourier modes
+    n  = 8
+    Ap = assemble(a, degrees, n, periodic=True, c=2.)
+    f  = GltExpr(a).compile(degrees=degrees, n_elements=[n,n])
+
+    j = np.arange(n)
+    for k1, k2 in [(0, 1), (3, 5)]:
+        t1 = 2*np.pi*k1/n
+        t2 = 2*np.pi*k2/n
+
+        x = np.exp(-1j*(j[:,None]*t1 + j[None,:]*t2)).ravel()
+        assert( np.allclose(Ap @ x, f(tx=t1, ty=t2, c=2.) * x) )
+    # ...
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
@@ -0,0 +1,128 @@
+# coding: utf-8
+
+import numpy as np
+
+from sympy import Symbol
+
+from sympde.core import Constant
+from sympde.calculus import grad, div, curl, inner
+from sympde.topology import VectorFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+from gelato import gelatize
+from gelato import toeplitz_matrix
+from gelato import BlockSymbol, block_symbol, block_eigenvalues
+from gelato import predict_block_eigenvalues
+
+DIM = 2
+
+#==============================================================================
+def test_block_symbol_2d():
+    domain = Domain('Omega', dim=DIM)
+
+    V = VectorFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    c = Constant('c')
+
+    a = BilinearForm((u,v), integral(domain, c*div(v)*div(u) + curl(v)*curl(u)))
+
+    degrees    = [2,3]
+    n_elements = [8,10]
+
+    symbol = BlockSymbol(a, degrees, n_elements, c=2.)
+    assert( symbol.size == 2 )
+    assert( symbol.is_hermitian )
+    assert( not symbol.is_variable )
+
+    ts = [np.linspace(0., np.pi, 5), np.linspace(0., np.pi, 4)]
+
+    B = block_symbol(a, degrees, n_elements, ts, c=2.)
+    assert( B.shape == (20, 2, 2) )
+    assert( B.dtype == np.float64 and B.flags.c_contiguous )
+
+    # ... same values as the evaluated gelatized form
+    expr = gelatize(a, degrees=degrees, n_elements=n_elements, evaluate=True)
+    expr = expr.subs({c: 2.})
+
+    for i, j in [(0, 0), (2, 1), (4, 3)]:
+        value = expr.subs({Symbol('tx'): float(ts[0][i]),
+                           Symbol('ty'): float(ts[1][j])})
+        assert( np.allclose(B[4*i + j], np.array(value.evalf(), dtype=float)) )
+    # ...
+
+    # ... batched eigenvalues, by small chunks
+    ev = block_eigenvalues(a, degrees, n_elements, ts, chunk_size=16, c=2.)
+    assert( np.allclose(ev, np.linalg.eigvalsh(B)) )
+    # ...
+
+#==============================================================================
+def test_block_eigenvalues_non_hermitian():
+    domain = Domain('Omega', dim=DIM)
+
+    V = VectorFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    a = BilinearForm((u,v), integral(domain, inner(grad(v), grad(u)) + div(u)*v[0]))
+
+    symbol = BlockSymbol(a, 2, 8)
+    assert( not symbol.is_hermitian )
+
+    ts = [np.linspace(0., np.pi, 5)]*DIM
+
+    B  = block_symbol(a, 2, 8, ts)
+    ev = block_eigenvalues(a, 2, 8, ts)
+
+    assert( B.dtype == np.complex128 )
+    expected = np.array([np.linalg.eigvals(b) for b in B])
+    assert( np.allclose(np.sort_complex(ev), np.sort_complex(expected)) )
+
+#==============================================================================
+def test_predict_block_eigenvalues_2d():
+    domain = Domain('Omega', dim=DIM)
+
+    V = VectorFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    c = Constant('c')
+
+    a = BilinearForm((u,v), integral(domain, c*div(v)*div(u) + curl(v)*curl(u)))
+
+    p = 2
+    n = 16
+
+    # ... the block matrix, the odd order matrices carrying a factor i
+    M = toeplitz_matrix(p, 0, n).toarray()
+    S = toeplitz_matrix(p, 2, n).toarray()
+    D = toeplitz_matrix(p, 1, n).toarray()
+
+    A00 = 2. * np.kron(S, M) + np.kron(M, S)
+    A11 = 2. * np.kron(M, S) + np.kron(S, M)
+    A01 = - np.kron(D, D)
+
+    A = np.block([[A00, A01], [A01, A11]])
+    # ...
+
+    expected = np.linalg.eigvalsh(A)
+    predicted = predict_block_eigenvalues(a, p, n, c=2.)
+
+    assert( predicted.shape == expected.shape )
+    assert( abs(predicted - expected).mean() < 2e-2 * expected.max() )
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
@@ -0,0 +1,88 @@
+# coding: utf-8
+
+from fractions import Fraction
+
+from gelato.bspline import binomials
+from gelato.bspline import cardinal_bspline
+from gelato.bspline import cardinal_bspline_derivative
+from gelato.bspline import glt_coefficients
+from gelato.glt import P_MAX, d_phi, d_phi_r, d_phi_rr
+from gelato.glt import rational_table
+from gelato.tables import packed_table, tabulated, series_coefficients
+
+#==============================================================================
+def test_bspline_1():
+
+    assert( binomials(4) == [1, 4, 6, 4, 1] )
+
+    # ... cubic B-spline
+    assert( cardinal_bspline(3, 1) == Fraction(1, 6) )
+    assert( cardinal_bspline(3, 2) == Fraction(2, 3) )
+    assert( cardinal_bspline(3, 4) == 0 )
+
+    assert( cardinal_bspline_derivative(3, 1, 1) == Fraction(1, 2) )
+    assert( cardinal_bspline_derivative(3, 2, 2) == -2 )
+    # ...
+
+#==============================================================================
+def test_bspline_2():
+
+    # ... compare to the tabulated values
+    for p in range(1, P_MAX+1):
+        assert( rational_table(p, 0) == tuple(d_phi[p])    )
+        assert( rational_table(p, 1) == tuple(d_phi_r[p])  )
+        assert( rational_table(p, 2) == tuple(d_phi_rr[p]) )
+    # ...
+
+    # ... the hard-coded tables are the exact values
+    for order in range(3):
+        for p in range(1, P_MAX+1):
+            numerators, denominators, values = tabulated(p, order)
+
+            phi = [Fraction(n, d) for n, d in zip(numerators.tolist(),
+                                                  denominators.tolist())]
+            assert( phi == glt_coefficients(p, order) )
+            assert( values.tolist() == [float(i) for i in phi] )
+
+    assert( tabulated(P_MAX+1, 0) is None and tabulated(2, 3) is None )
+    assert( not( P_MAX+1 in d_phi ) and len(d_phi) == P_MAX )
+    # ...
+
+#==============================================================================
+def test_bspline_packed():
+
+    # ... one flat buffer per order, the degree p at offsets[p-1]:offsets[p]
+    table = packed_table(2)
+
+    assert( table.offsets.tolist() == [sum(range(2, p+2)) for p in range(P_MAX+1)] )
+    assert( table.values.flags['C_CONTIGUOUS'] and not table.values.flags['WRITEABLE'] )
+    assert( table.numerators[table.offsets[2]:table.offsets[3]].tolist() == [-2, 1, 1, 1] )
+    # ...
+
+    # ... the float coefficients do not depend on the path
+    for p in [3, P_MAX, P_MAX+1]:
+        phi = glt_coefficients(p, 2)
+
+        c = [-2*float(i) for i in phi]
+        c[0] = -float(phi[0])
+        assert( series_coefficients(p, 2).tolist() == c )
+    # ...
+
+#==============================================================================
+def test_bspline_3():
+
+    # ... partition of unity and vanishing moments for a high degree
+    for p in [20, 30]:
+        phi = glt_coefficients(p, 0)
+        assert( phi[0] + 2*sum(phi[1:]) == 1 )
+
+        phi = glt_coefficients(p, 2)
+        assert( phi[0] + 2*sum(phi[1:]) == 0 )
+
+        phi = glt_coefficients(p, 4)
+        assert( phi[0] + 2*sum(phi[1:]) == 0 )
+    # ...
+
+    # ... bilaplacian of quadratic splines
+    assert( glt_coefficients(2, 4) == [6, -4, 1] )
+    # ...
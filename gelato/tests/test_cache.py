@@ -0,0 +1,25 @@
+# coding: utf-8
+
+from gelato.cache import LRUCache
+
+#==============================================================================
+def test_lru_cache_1():
+
+    cache = LRUCache(maxsize=2)
+
+    assert( cache.get_or_compute('a', lambda: 1) == 1 )
+    assert( cache.get_or_compute('b', lambda: 2) == 2 )
+    assert( cache.get_or_compute('a', lambda: 3) == 1 )
+
+    # ... 'b' is the least recently used entry
+    cache.set('c', 3)
+    assert( 'a' in cache and 'c' in cache and not( 'b' in cache ) )
+    assert( cache.get('b') is None )
+    # ...
+
+    info = cache.info()
+    assert( (info.hits, info.misses, info.maxsize, info.currsize) == (1, 3, 2, 2) )
+
+    cache.clear()
+    assert( len(cache) == 0 )
+    assert( cache.info().misses == 0 )
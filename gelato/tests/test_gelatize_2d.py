@@ -1,5 +1,7 @@
 # coding: utf-8
 
+import threading
+
 from sympy import Symbol
 from sympy.core.containers import Tuple
 from sympy import symbols
@@ -19,6 +21,7 @@ from sympde.expr import BilinearForm
 from sympde.expr import integral
 
 from gelato import gelatize
+from gelato import profile_gelatize
 from gelato import (Mass,
                     Stiffness,
                     Advection,
@@ -160,6 +163,79 @@ def test_gelatize_2d_7():
     expr = BilinearForm((u,v), integral(domain, expr))
     assert(gelatize(expr) == expected)
 
+#==============================================================================
+def test_gelatize_2d_profile():
+    domain = Domain('Omega', dim=DIM)
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    expr = dot(grad(v), grad(u)) + dx1(u)*v
+    expr = BilinearForm((u,v), integral(domain, expr))
+
+    expected = gelatize(expr, degrees=[2,3], n_elements=[8,16], evaluate=True)
+
+    records = []
+    with profile_gelatize(callback=records.append) as outer:
+        with profile_gelatize(nodes=False) as inner:
+            symbol = gelatize(expr, degrees=[2,3], n_elements=[8,16],
+                              evaluate=True)
+
+    assert( symbol == expected )
+    assert( records == outer.records )
+
+    phases = [r.phase for r in outer.records]
+    assert( phases == ['tensor', 'forms', 'n_elements', 'degrees'] )
+    assert( [r.phase for r in inner.records] == phases )
+
+    # ... mass, stiffness, advection in x, mass, stiffness in y
+    assert( [r.substitutions for r in outer.records] == [0, 5, 2, 2] )
+    assert( all(r.nodes_out > 0 for r in outer.records) )
+    assert( abs(outer.time - sum(r.time for r in records)) < 1e-12 )
+    # ...
+
+    # ... the profiles are local to every thread
+    barrier  = threading.Barrier(2)
+    profiles = [None, None]
+    def work(i):
+        with profile_gelatize(nodes=False) as profile:
+            barrier.wait()
+            gelatize(expr, degrees=[2,3], n_elements=[8,16], evaluate=True)
+            barrier.wait()
+
+        profiles[i] = profile
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert( all([r.phase for r in profile.records] == phases for profile in profiles) )
+    # ...
+
+    # ... the mapping phase
+    M = Mapping('M', DIM)
+    mapped = M(domain)
+
+    V = ScalarFunctionSpace('V', mapped)
+    u,v = elements_of(V, names='u,v')
+
+    expr = BilinearForm((u,v), integral(mapped, u*v))
+    with profile_gelatize(nodes=False) as profile:
+        gelatize(expr, mapping=M, human=True)
+
+    assert( list(profile.by_phase())[-1] == 'mapping' )
+    assert( all(r.nodes_in is None for r in profile.records) )
+    assert( 'mapping' in profile.report() )
+    # ...
+
+    # ... no records outside of the context
+    gelatize(expr, mapping=M, human=True)
+    assert( len(profile.records) == len(profile.by_phase()) )
+    # ...
+
 #==============================================================================
 ## TODO
 #def test_gelatize_2d_8():
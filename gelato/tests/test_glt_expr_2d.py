@@ -11,6 +11,7 @@ from sympde.core import Constant
 from sympde.calculus import grad, dot, inner, cross, rot, curl, div
 from sympde.calculus import laplace, hessian, bracket, convect
 from sympde.topology import (dx, dy, dz)
+from sympde.topology import dx1
 from sympde.topology import ScalarFunctionSpace, VectorFunctionSpace
 from sympde.topology import Domain
 from sympde.topology import Mapping
@@ -18,6 +19,9 @@ from sympde.topology import elements_of
 from sympde.expr import BilinearForm
 from sympde.expr import integral
 
+import numpy as np
+import pytest
+
 from gelato import GltExpr
 
 DIM = 2
@@ -41,6 +45,141 @@ def test_glt_expr_2d_1():
     print(glt(tx=0.1, ty=0.2, degrees=[2,2]))
 
 
+#==============================================================================
+def test_glt_expr_2d_compile():
+    domain = Domain('Omega', dim=DIM)
+    x, y   = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    c = Constant('c')
+
+    expr = (1 + x*y)*dot(grad(v), grad(u)) + c*v*u + dx1(u)*v
+    a = BilinearForm((u,v), integral(domain, expr))
+
+    glt = GltExpr(a)
+
+    f = glt.compile(degrees=[3,2], n_elements=[8,16])
+    assert( glt.compile(degrees=[3,2], n_elements=[8,16]) is f )
+    assert( f.argument_names == ['tx', 'ty', 'x', 'y', 'c'] )
+
+    tx = np.linspace(0, np.pi, 50)[:,None]
+    ty = np.linspace(0, np.pi, 40)[None,:]
+
+    values = f(tx=tx, ty=ty, x=0.3, y=0.7, c=2.)
+    assert( values.shape == (50, 40) )
+    assert( np.iscomplexobj(values) )
+
+    # ... compare to the lambdified symbol
+    g = glt.compile(degrees=[3,2], n_elements=[8,16], backend='sympy')
+    assert( np.allclose(values, g(tx=tx, ty=ty, x=0.3, y=0.7, c=2.)) )
+    # ...
+
+    # ... a missing argument is an error with both backends
+    for backend in ['numpy', 'sympy']:
+        g = glt.compile(degrees=[3,2], n_elements=[8,16], backend=backend)
+        with pytest.raises(TypeError, match='Missing argument c'):
+            g(tx=tx, ty=ty, x=0.3, y=0.7)
+    # ...
+
+    # ... the number of elements is an argument if not given
+    g = glt.compile(degrees=[3,2])
+    assert( np.allclose(values, g(tx, ty, 0.3, 0.7, 2., 8, 16)) )
+    # ...
+
+    # ... single point, compared to __call__
+    value = f(tx=0.1, ty=0.2, x=0.3, y=0.7, c=2.)
+    expected = glt(tx=0.1, ty=0.2, degrees=[3,2], n_elements=[8,16])
+    expected = expected.subs({c: 2., x: 0.3, y: 0.7})
+    assert( np.isclose(value, complex(expected)) )
+    # ...
+
+#==============================================================================
+def test_glt_expr_2d_cache():
+    domain = Domain('Omega', dim=DIM)
+    x, y   = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    expr = (1 + x*y)*dot(grad(v), grad(u))
+    a = BilinearForm((u,v), integral(domain, expr))
+
+    glt = GltExpr(a)
+
+    values = [glt(tx=0.1*i, ty=0.2, x=0.5, y=0.5, degrees=[2,2], n_elements=[4,4])
+              for i in range(5)]
+
+    # ... the form is gelatized only once
+    info = glt.cache_info()
+    assert( (info.hits, info.misses) == (4, 1) )
+
+    expected = glt.gelatize(degrees=[2,2], n_elements=[4,4])
+    expected = expected.subs({Symbol('tx'): 0.1, Symbol('ty'): 0.2, x: 0.5, y: 0.5})
+    assert( values[1] == expected )
+    # ...
+
+    # ... another discretization is another entry
+    glt(degrees=[3,3], n_elements=[4,4])
+    assert( glt.cache_info().currsize == 2 )
+    # ...
+
+    glt.clear_cache()
+    assert( glt.cache_info().currsize == 0 )
+
+#==============================================================================
+def test_glt_expr_2d_sweep():
+    domain = Domain('Omega', dim=DIM)
+    x, y   = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    c = Constant('c')
+
+    expr = (1 + x*y)*dot(grad(v), grad(u)) + c*v*u + dx1(u)*v
+    a = BilinearForm((u,v), integral(domain, expr))
+
+    glt = GltExpr(a)
+
+    tx = np.linspace(0., np.pi, 5)
+    ty = np.linspace(0., np.pi, 4)
+
+    degrees    = [1, 2, (2,3)]
+    n_elements = [4, (8,16)]
+
+    values = glt.sweep(degrees, n_elements, tx=tx, ty=ty, x=0.3, y=0.7, c=2.)
+    assert( values.shape == (3, 2, 5, 4) )
+
+    # ... compare with the gelatized form of every discretization
+    for i,ps in enumerate([[1,1], [2,2], [2,3]]):
+        for j,ns in enumerate([[4,4], [8,16]]):
+            for k,l in [(0,0), (1,2), (4,3)]:
+                expected = glt(tx=float(tx[k]), ty=float(ty[l]), x=0.3, y=0.7,
+                               degrees=ps, n_elements=ns).subs(c, 2.)
+
+                assert( np.isclose(values[i,j,k,l], complex(expected)) )
+    # ...
+
+    # ... Fourier grids sampled by FFTs
+    values = glt.sweep(degrees, n_elements, tx=4, ty=3, x=0.3, y=0.7, c=2.)
+    assert( values.shape == (3, 2, 5, 4) )
+
+    expected = glt(tx=np.pi, ty=2*np.pi/3, x=0.3, y=0.7,
+                   degrees=[2,3], n_elements=[8,16]).subs(c, 2.)
+    assert( np.isclose(values[2,1,4,2], complex(expected)) )
+    # ...
+
+    # ... the space variables and the constants must be scalars
+    with pytest.raises(ValueError):
+        glt.sweep(degrees, n_elements, tx=tx, ty=ty, x=np.array([0.3, 0.5]),
+                  y=0.7, c=2.)
+    # ...
+
 #==============================================================================
 # CLEAN UP SYMPY NAMESPACE
 #==============================================================================
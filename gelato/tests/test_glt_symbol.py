@@ -1,9 +1,12 @@
 # coding: utf-8
 
 from sympy.core import Symbol
-from sympy import cos, sin, Rational as frac
+from sympy import cos, sin, I, Rational as frac
+import pytest
 
 from gelato import Mass, Stiffness, Advection, Bilaplacian
+from gelato import GltSymbol, glt_pair
+from gelato import symbol_cache_info, clear_symbol_cache
 
 #==============================================================================
 def test_glt_symbol_1():
@@ -25,14 +28,14 @@ def test_glt_symbol_1():
     assert( Mass(two, t) == 13*cos(t)/30 + cos(2*t)/60 + frac(11, 20) )
     assert( Stiffness(two, t) == -2*cos(t)/3 - cos(2*t)/3 + 1 )
     assert( Advection(two, t) == -5*sin(t)/6 - sin(2*t)/12 )
-#    assert( Bilaplacian(two, t) == -8*cos(t) + 2*cos(2*t) + 6 )
+    assert( Bilaplacian(two, t) == -8*cos(t) + 2*cos(2*t) + 6 )
     # ...
 
     # ... cubic splines
     assert( Mass(three, t) == 397*cos(t)/840 + cos(2*t)/21 + cos(3*t)/2520 + frac(151, 315) )
     assert( Stiffness(three, t) == -cos(t)/4 - 2*cos(2*t)/5 - cos(3*t)/60 + frac(2, 3))
     assert( Advection(three, t) == -49*sin(t)/72 - 7*sin(2*t)/45 - sin(3*t)/360 )
-#    assert( Bilaplacian(three, t) == -3*cos(t) + cos(3*t)/3 + 8/3 )
+    assert( Bilaplacian(three, t) == -3*cos(t) + cos(3*t)/3 + frac(8, 3) )
     # ...
 
 #    p = 3
@@ -41,6 +44,66 @@ def test_glt_symbol_1():
 #    print(Advection(p, t))
 ##    print(Bilaplacian(p, t))
 
+#==============================================================================
+def test_glt_symbol_high_degree():
+
+    t = Symbol('t')
+
+    # ... symbols beyond the tabulated degrees are exact
+    for p in [9, 20]:
+        assert( Mass(p, t).subs(t, 0) == 1 )
+        assert( Stiffness(p, t).subs(t, 0) == 0 )
+        assert( Advection(p, t).subs(t, 0) == 0 )
+        assert( Bilaplacian(p, t).subs(t, 0) == 0 )
+    # ...
+
+#==============================================================================
+def test_glt_symbol_orders():
+
+    t = Symbol('t')
+    p = Symbol('p')
+
+    # ... named symbols are views of the generic one
+    for q in [1, 2, 3, 9]:
+        assert( GltSymbol(q, t, 0) == Mass(q, t) )
+        assert( GltSymbol(q, t, 1) == Advection(q, t) )
+        assert( GltSymbol(q, t, 2) == Stiffness(q, t) )
+    # ...
+
+    # ... odd and mixed orders
+    assert( GltSymbol(2, t, 3) == -2*sin(t) + sin(2*t) )
+    assert( glt_pair(2, t, 2, 1) == I*(-2*sin(t) + sin(2*t)) )
+    assert( glt_pair(p, t, 1, 1) == GltSymbol(p, t, 2) )
+    # ...
+
+    # ... orders are limited to 2p
+    assert( GltSymbol(1, t, 2) == Stiffness(1, t) )
+    with pytest.raises(NotImplementedError):
+        GltSymbol(1, t, 3)
+    # ...
+
+#==============================================================================
+def test_glt_symbol_cache():
+
+    t = Symbol('t')
+
+    clear_symbol_cache()
+
+    m = Mass(5, t)
+    assert( symbol_cache_info().misses == 1 )
+
+    # ... the sympy cache is not needed
+    from sympy import cache
+    cache.clear_cache()
+
+    assert( Mass(5, t) is m )
+    assert( GltSymbol(5, t, 0) is m )
+    assert( symbol_cache_info().hits == 2 )
+    # ...
+
+    clear_symbol_cache()
+    assert( symbol_cache_info().currsize == 0 )
+
 #==============================================================================
 #def test_glt_symbol_2():
 #
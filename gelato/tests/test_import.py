@@ -0,0 +1,83 @@
+# coding: utf-8
+
+import subprocess
+import sys
+from importlib import import_module
+
+import gelato
+
+#==============================================================================
+def _loaded_modules(statement):
+    script = ('import sys\n'
+              '{}\n'
+              'print(" ".join(sorted(m for m in sys.modules)))').format(statement)
+
+    out = subprocess.run([sys.executable, '-c', script], stdout=subprocess.PIPE,
+                         check=True, universal_newlines=True)
+
+    return set(out.stdout.split())
+
+#==============================================================================
+def test_import_lazy():
+
+    heavy = {'sympy', 'sympde', 'scipy', 'matplotlib'}
+
+    assert( not( _loaded_modules('import gelato') & heavy ) )
+    assert( not( _loaded_modules('from gelato.numeric import glt_symbol') & heavy ) )
+
+    # ... the symbolic part is loaded on first access
+    modules = _loaded_modules('import gelato; gelato.Mass')
+    assert( 'sympy' in modules and not( 'matplotlib' in modules ) )
+    # ...
+
+    # ... the submodules are imported on first access, in a clean interpreter
+    for module in ['numeric', 'tables', 'store']:
+        statement = ('import gelato; from importlib import import_module; '
+                     'assert( gelato.{0} is import_module("gelato.{0}") )').format(module)
+
+        modules = _loaded_modules(statement)
+        assert( 'gelato.' + module in modules )
+        assert( not( modules & heavy ) )
+    # ...
+
+#==============================================================================
+def test_import_exports():
+
+    # ... every public name of the submodules is exported
+    for module, names in gelato._exports:
+        m = import_module('gelato.' + module)
+
+        assert( tuple(m.__all__) == names )
+        for name in names:
+            assert( getattr(gelato, name) is getattr(m, name) )
+    # ...
+
+    assert( 'gelatize' in dir(gelato) )
+    assert( 'numeric' in dir(gelato) and 'tables' in dir(gelato) )
+
+    try:
+        gelato.unknown
+        assert( False )
+
+    except AttributeError:
+        pass
+
+#==============================================================================
+def test_import_tables():
+    from sympy import Rational
+    from gelato.glt import d_phi, d_phi_rr
+
+    assert( d_phi[1] == [Rational(2,3), Rational(1,6)] )
+    assert( d_phi_rr[1] == [-2, 1] )
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
@@ -0,0 +1,105 @@
+# coding: utf-8
+
+import pytest
+import numpy as np
+
+from sympde.calculus import grad, dot
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import Mapping, PolarMapping
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+from gelato import GltExpr
+from gelato import MappingGrid, mapping_grid, mapping_symbols
+from gelato import symbol_parts
+from gelato.numeric import glt_symbol
+
+DIM = 2
+
+#==============================================================================
+def test_mapping_grid():
+    P = PolarMapping('P', DIM, c1=0., c2=0., rmin=0.5, rmax=1.)
+
+    x = np.linspace(0., 1., 5)[:,None]
+    y = np.linspace(0., 1., 6)[None,:]
+
+    grid = mapping_grid(P, [x, y])
+    assert( grid.shape == (5, 6) )
+    assert( mapping_grid(P, [x.copy(), y.copy()]) is grid )
+
+    # ... the annulus: J = [[cos/2, -r sin], [sin/2, r cos]]
+    r = 0.5 * (1. + x)
+    assert( np.allclose(grid.jacobian[...,0,0], 0.5*np.cos(y)) )
+    assert( np.allclose(grid.jacobian[...,0,1], -r*np.sin(y)) )
+    assert( np.allclose(grid.determinant, 0.5*r) )
+    assert( np.allclose(grid.inverse_metric[...,0,0], 4.) )
+    assert( np.allclose(grid.inverse_metric[...,1,1], 1./r**2) )
+    assert( np.allclose(grid.inverse_metric[...,0,1], 0.) )
+    # ...
+
+    jacobian, determinant = mapping_symbols(P)
+    d = grid.values()
+    assert( str(jacobian[1][0]) == 'y_x1' and str(determinant) == 'det_P' )
+    assert( np.allclose(d[jacobian[1][0]], 0.5*np.sin(y)) )
+
+    # ... abstract mappings cannot be evaluated
+    with pytest.raises(ValueError):
+        MappingGrid(Mapping('M', DIM), [x, y])
+
+#==============================================================================
+def test_mapped_symbol_2d():
+    P = PolarMapping('P', DIM, c1=0., c2=0., rmin=0.5, rmax=1.)
+
+    domain = Domain('Omega', dim=DIM)
+    mapped_domain = P(domain)
+
+    V = ScalarFunctionSpace('V', mapped_domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    a = BilinearForm((u,v), integral(mapped_domain, dot(grad(v), grad(u))))
+    glt = GltExpr(a)
+
+    degrees    = [2,3]
+    n_elements = [16,20]
+
+    x  = np.linspace(0., 1., 5)[:,None,None,None]
+    y  = np.linspace(0., 1., 6)[None,:,None,None]
+    tx = np.linspace(0., np.pi, 7)[None,None,:,None]
+    ty = np.linspace(0., np.pi, 8)[None,None,None,:]
+
+    # ... det(J) (G^{-1})_{ii} multiplies the stiffness of the axis i
+    r  = 0.5 * (1. + x)
+    nx, ny = n_elements
+    expected = 0.5 * r * (4. * nx/ny * glt_symbol(2, tx, 2) * glt_symbol(3, ty, 0) +
+                          ny/(nx * r**2) * glt_symbol(2, tx, 0) * glt_symbol(3, ty, 2))
+    # ...
+
+    for backend in ['numpy', 'sympy']:
+        f = glt.compile(degrees=degrees, n_elements=n_elements, mapping=P,
+                        backend=backend)
+
+        assert( np.allclose(f(tx=tx, ty=ty, x=x, y=y), expected) )
+
+    # ... the same values by chunks, on a tensor grid
+    re, im = symbol_parts(glt, degrees, n_elements,
+                          [tx.ravel(), ty.ravel()], [x.ravel(), y.ravel()],
+                          mapping=P)
+
+    assert( np.allclose(re, expected) )
+    assert( np.allclose(im, 0.) )
+    # ...
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
@@ -0,0 +1,117 @@
+# coding: utf-8
+
+import numpy as np
+
+from sympde.core import Constant
+from sympde.calculus import grad, dot
+from sympde.topology import dx1, dx2
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+from gelato import GltExpr
+from gelato import assemble
+from gelato import symbol_parts, iter_symbol_parts
+from gelato import predict_singular_values, numerical_range
+
+#==============================================================================
+def test_symbol_parts_2d():
+    domain = Domain('Omega', dim=2)
+    x,y = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    c = Constant('c')
+
+    expr = dot(grad(v), grad(u)) + c*dx1(u)*v + (1+x)*dx2(u)*v
+    a = BilinearForm((u,v), integral(domain, expr))
+
+    degrees    = [2,3]
+    n_elements = [8,10]
+
+    ts = [np.linspace(-np.pi, np.pi, 7), np.linspace(-np.pi, np.pi, 5)]
+    xs = [np.array([0.2, 0.7]), np.array([0.1, 0.4, 0.9])]
+
+    re, im = symbol_parts(a, degrees, n_elements, ts, xs, c=3.)
+    assert( re.shape == (2, 3, 7, 5) )
+
+    # ... same values as the compiled complex symbol
+    f = GltExpr(a).compile(degrees=degrees, n_elements=n_elements)
+    expected = f(tx=ts[0][None,None,:,None], ty=ts[1][None,None,None,:],
+                 x=xs[0][:,None,None,None], y=xs[1][None,:,None,None], c=3.)
+
+    assert( np.allclose(re, expected.real) )
+    assert( np.allclose(im, expected.imag) )
+    # ...
+
+    # ... chunks of a few space points
+    chunks = list(iter_symbol_parts(a, degrees, n_elements, ts, xs,
+                                    chunk_size=70, c=3.))
+    assert( len(chunks) == 3 )
+    assert( np.allclose(np.concatenate([i for i,j in chunks]), re.reshape((6, 7, 5))) )
+    # ...
+
+#==============================================================================
+def test_singular_values_2d():
+    domain = Domain('Omega', dim=2)
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    c = Constant('c')
+
+    a = BilinearForm((u,v), integral(domain, dot(grad(v), grad(u)) + c*dx1(u)*v))
+
+    degrees    = [2,2]
+    n_elements = [16,16]
+
+    A = assemble(a, degrees, n_elements, c=20.).tosparse().toarray()
+
+    # ... the singular values follow |f|
+    s = np.linalg.svd(A, compute_uv=False)[::-1]
+    t = predict_singular_values(a, degrees, n_elements, c=20.)
+
+    assert( t.shape == s.shape )
+    assert( np.all(np.diff(t) >= 0) )
+    # asymptotic distribution: the boundary rows perturb a few values
+    assert( abs(t - s).mean() < 3e-2 * s.max() )
+
+    t = predict_singular_values(a, degrees, n_elements, k=5, which='largest', c=20.)
+    assert( np.allclose(t, predict_singular_values(a, degrees, n_elements, c=20.)[-5:]) )
+    # ...
+
+    # ... the eigenvalues are in the numerical range of the symbol
+    hull = numerical_range(a, degrees, n_elements, c=20.)
+    ev   = np.linalg.eigvals(A)
+
+    for z in ev:
+        # counterclockwise vertices: z is on the left of every edge
+        edges = np.roll(hull, -1) - hull
+        assert( np.all((np.conj(edges) * (z - hull)).imag >= -1e-10) )
+    # ...
+
+    # ... pure advection: a segment on the imaginary axis
+    b = BilinearForm((u,v), integral(domain, dx1(u)*v))
+    hull = numerical_range(b, degrees, n_elements)
+
+    assert( len(hull) == 2 )
+    assert( np.allclose(hull.real, 0) )
+    assert( np.allclose(hull.imag.sum(), 0) )
+    # ...
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
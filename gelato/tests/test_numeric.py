@@ -0,0 +1,139 @@
+# coding: utf-8
+
+import numpy as np
+import pytest
+from sympy import Symbol, lambdify
+
+from gelato import Mass, Stiffness, Advection, Bilaplacian, GltSymbol
+from gelato import numeric
+
+#==============================================================================
+def test_numeric_1():
+
+    t  = Symbol('t')
+    ts = np.linspace(-np.pi, np.pi, 1001)
+
+    # ... compare to the sympy symbols
+    for p in [1, 2, 3, 5, 9]:
+        for cls in [Mass, Advection, Stiffness, Bilaplacian]:
+            if cls.order > 2*p:
+                continue
+
+            f = lambdify(t, cls(p, t), 'numpy')
+            expected = f(ts) * np.ones_like(ts)
+
+            assert( np.allclose(cls.numeric(p, ts), expected, atol=1e-13) )
+    # ...
+
+    # ... odd order
+    f = lambdify(t, GltSymbol(4, t, 3), 'numpy')
+    assert( np.allclose(numeric.glt_symbol(4, ts, 3), f(ts), atol=1e-13) )
+    # ...
+
+    # ... degrees and orders given as numpy integers
+    for p, order in zip(np.array([3, 12, 25]), np.array([0, 2, 1])):
+        expected = numeric.glt_symbol(int(p), ts, int(order))
+        assert( np.array_equal(numeric.glt_symbol(p, ts, order), expected) )
+        assert( numeric.sinc_terms(p, order) == numeric.sinc_terms(int(p), int(order)) )
+    # ...
+
+#==============================================================================
+def test_numeric_out():
+
+    ts  = np.random.random((7, 1000)) * np.pi
+    out = np.empty_like(ts)
+
+    values = numeric.stiffness(3, ts, out=out)
+    assert( values is out )
+    assert( np.allclose(out, numeric.stiffness(3, ts.ravel()).reshape(ts.shape)) )
+
+    with pytest.raises(ValueError):
+        numeric.mass(3, ts, out=np.empty(5))
+
+#==============================================================================
+def test_numeric_series():
+
+    ts = np.linspace(0, np.pi, 100)
+    c  = np.array([1., -2., 0.5, 0.25])
+
+    expected = sum(c[k]*np.cos(k*ts) for k in range(4))
+    assert( np.allclose(numeric.cos_series(c, ts, chunk_size=7), expected) )
+
+    expected = sum(c[k]*np.sin(k*ts) for k in range(1, 4))
+    assert( np.allclose(numeric.sin_series(c, ts, chunk_size=7), expected) )
+
+#==============================================================================
+def test_numeric_adaptive():
+    import mpmath
+    from gelato.tables import exact_table
+
+    def reference(p, t):
+        # the mass symbol with 200 digits
+        with mpmath.workdps(200):
+            phi = [mpmath.mpf(i.numerator) / i.denominator for i in exact_table(p, 0)]
+            t   = mpmath.mpf(t)
+
+            return float(phi[0] + 2*sum(phi[k]*mpmath.cos(k*t) for k in range(1, p+1)))
+
+    ts = np.concatenate([np.linspace(0, np.pi, 101), np.pi - np.logspace(-8, -1, 8)])
+
+    # ... low degree, all the points stay in float64
+    values, promotion = numeric.adaptive_glt_symbol(3, ts, 0)
+    assert( promotion == (ts.size, 0, 0) )
+    assert( np.array_equal(values, numeric.mass(3, ts)) )
+    # ...
+
+    # ... near pi, float64 loses the relative accuracy of the mass symbol
+    p = 30
+    expected = np.array([reference(p, t) for t in ts])
+
+    out = np.empty_like(ts)
+    values, promotion = numeric.adaptive_glt_symbol(p, ts, 0, rtol=1e-12, out=out)
+
+    assert( values is out )
+    assert( np.max(np.abs(values - expected) / expected) < 1e-12 )
+    cosine = numeric.glt_symbol(p, ts, 0, method='cosine')
+    assert( np.max(np.abs(cosine - expected) / expected) > 1e-8 )
+
+    assert( promotion.points == ts.size )
+    assert( 0 < promotion.mpmath < ts.size )
+    # ...
+
+    # ... the promoted points are the ones where the symbol is small
+    values, promotion = numeric.adaptive_glt_symbol(p, np.array([0.1, 3.]), 0)
+    assert( promotion.mpmath == 1 )
+    # ...
+
+#==============================================================================
+def test_numeric_sinc():
+
+    ts = np.concatenate([np.linspace(-np.pi, np.pi, 101), [0., 5., -7.5]])
+
+    # ... the sinc series is the cosine or sine series
+    for p in [3, 10, 20]:
+        for cls in [Mass, Advection, Stiffness]:
+            expected = cls.numeric(p, ts, method='cosine')
+            values   = cls.numeric(p, ts, method='sinc')
+
+            assert( np.allclose(values, expected, rtol=0., atol=1e-14) )
+    # ...
+
+    # ... the number of terms decreases with the degree
+    assert( numeric.sinc_terms(3, 0) > numeric.sinc_terms(10, 0) > numeric.sinc_terms(30, 0) == 1 )
+    assert( numeric.sinc_terms(10, 0, tol=1e-6) < numeric.sinc_terms(10, 0) )
+
+    with pytest.raises(ValueError):
+        numeric.sinc_terms(2, 4)
+    # ...
+
+    # ... near pi, the mass symbol keeps its relative accuracy
+    p  = numeric.SINC_THRESHOLD + 10
+    ts = np.pi - np.logspace(-8, -1, 8)
+
+    expected, promotion = numeric.adaptive_glt_symbol(p, ts, 0, rtol=1e-14)
+    assert( promotion.mpmath > 0 )
+
+    values = Mass.numeric(p, ts)
+    assert( np.max(np.abs(values - expected) / expected) < 1e-13 )
+    assert( np.array_equal(values, numeric.sinc_series(p, ts, 0)) )
+    # ...
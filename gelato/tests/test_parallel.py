@@ -0,0 +1,97 @@
+# coding: utf-8
+
+from sympde.core import Constant
+from sympde.calculus import grad, dot
+from sympde.topology import dx1, dx2
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import Mapping
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+from gelato import gelatize
+from gelato import gelatize_many
+
+DIM = 2
+
+#==============================================================================
+def make_forms():
+    domain = Domain('Omega', dim=DIM)
+    x, y   = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    c = Constant('c')
+
+    exprs = [u*v,
+             dot(grad(v), grad(u)),
+             dot(grad(v), grad(u)) + c*v*u,
+             (1 + x*y)*dx1(u)*dx1(v) + dx2(u)*v,
+             dx1(dx1(u))*dx1(dx1(v)) + dx2(u)*dx2(v)]
+
+    return [BilinearForm((u,v), integral(domain, e)) for e in exprs]
+
+#==============================================================================
+def test_gelatize_many_serial():
+    forms = make_forms()
+
+    expected = [gelatize(a) for a in forms]
+    results  = list(gelatize_many(forms))
+
+    assert( results == expected )
+
+#==============================================================================
+def test_gelatize_many_workers():
+    forms = make_forms()
+
+    for kwargs in [{}, {'degrees': [2,3]}, {'degrees': [2,2], 'n_elements': 8}]:
+        expected = [gelatize(a, **kwargs) for a in forms]
+        results  = list(gelatize_many(forms, workers=2, **kwargs))
+
+        assert( results == expected )
+
+#==============================================================================
+def test_gelatize_many_mapping():
+    domain = Domain('Omega', dim=DIM)
+
+    M = Mapping('M', DIM)
+
+    mapped_domain = M(domain)
+
+    V = ScalarFunctionSpace('V', mapped_domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    forms = [BilinearForm((u,v), integral(mapped_domain, u*v)),
+             BilinearForm((u,v), integral(mapped_domain, dot(grad(v), grad(u))))]
+
+    expected = [gelatize(a, mapping=M, human=True) for a in forms]
+    results  = list(gelatize_many(forms, workers=2, mapping=M, human=True))
+
+    assert( results == expected )
+
+#==============================================================================
+def test_gelatize_many_builders():
+    forms = make_forms()
+
+    builders = [lambda i=i: make_forms()[i] for i in range(len(forms))]
+
+    expected = [gelatize(a, degrees=[2,2]) for a in forms]
+    results  = list(gelatize_many(builders, workers=2, degrees=[2,2]))
+
+    assert( results == expected )
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
@@ -0,0 +1,122 @@
+# coding: utf-8
+
+import pytest
+import numpy as np
+from scipy.sparse.linalg import cg
+
+from sympde.core import Constant
+from sympde.calculus import grad, dot
+from sympde.topology import dx1
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+from gelato import glt_preconditioner
+from gelato import toeplitz_matrix
+from gelato.preconditioner import _dst
+
+DIM = 2
+
+#==============================================================================
+def make_problem(p, n, c=1.):
+    domain = Domain('Omega', dim=DIM)
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    k = Constant('k')
+
+    a = BilinearForm((u,v), integral(domain, dot(grad(v), grad(u)) + k*u*v))
+
+    M = toeplitz_matrix(p, 0, n).toarray() / n
+    S = toeplitz_matrix(p, 2, n).toarray() * n
+    A = np.kron(S, M) + np.kron(M, S) + c * np.kron(M, M)
+
+    return a, A
+
+def cg_iterations(A, b, M=None):
+    iterations = [0]
+    def callback(x):
+        iterations[0] += 1
+
+    x, info = cg(A, b, M=M, callback=callback)
+    assert( info == 0 )
+
+    return iterations[0]
+
+#==============================================================================
+def test_dst():
+    x = np.random.random((7, 5))
+
+    for axis in [0, 1]:
+        assert( np.allclose(_dst(_dst(x, axis), axis), x) )
+
+    # ... the sine vectors are the eigenvectors of the tau matrices
+    n = 7
+    j = np.arange(1, n+1)
+    v = np.sin(np.outer(j, j) * np.pi / (n+1)) * np.sqrt(2. / (n+1))
+    assert( np.allclose(_dst(np.eye(n), 0), v) )
+
+#==============================================================================
+def test_preconditioner_kronecker():
+    a, A = make_problem(3, 16, c=2.)
+
+    P = glt_preconditioner(a, 3, 16, kind='kronecker', k=2.)
+
+    x = np.random.random(A.shape[0])
+    assert( np.allclose(P.matvec(A @ x), x) )
+
+#==============================================================================
+@pytest.mark.parametrize('kind', ['tau', 'circulant'])
+def test_preconditioner_iterations(kind):
+    p = 3
+
+    iterations = []
+    for n in [16, 32, 48]:
+        a, A = make_problem(p, n)
+        b = np.random.random(A.shape[0])
+
+        P = glt_preconditioner(a, p, n, kind=kind, k=1.)
+
+        iterations.append((cg_iterations(A, b), cg_iterations(A, b, M=P)))
+
+    # ... fewer iterations, growing slower than without preconditioner
+    for i, j in iterations:
+        assert( j < i )
+
+    if kind == 'tau':
+        assert( max(j for i,j in iterations) <= 8 )
+    # ...
+
+#==============================================================================
+def test_preconditioner_errors():
+    domain = Domain('Omega', dim=DIM)
+    x, y   = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    a = BilinearForm((u,v), integral(domain, dot(grad(v), grad(u))))
+
+    with pytest.raises(ValueError):
+        glt_preconditioner(a, 2, 8, kind='jacobi')
+
+    b = BilinearForm((u,v), integral(domain, (1 + x*y)*dx1(v)*dx1(u)))
+    with pytest.raises(NotImplementedError):
+        glt_preconditioner(b, 2, 8)
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
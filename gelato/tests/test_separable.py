@@ -0,0 +1,79 @@
+# coding: utf-8
+
+import numpy as np
+from sympy import symbols, lambdify, I
+
+from sympde.core import Constant
+from sympde.calculus import grad, dot
+from sympde.topology import dx1
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+from gelato import gelatize
+from gelato import numeric
+from gelato.separable import glt_terms
+from gelato.separable import sample_fourier_grid_terms
+from gelato.separable import outer_product
+
+#==============================================================================
+def test_fourier_grid_1d():
+
+    for n in [1, 4, 33]:
+        ts = numeric.fourier_grid(n)
+        for p in [1, 3, 9]:
+            for order in range(0, min(2*p, 4)+1):
+                expected = numeric.glt_symbol(p, ts, order)
+                values   = numeric.sample_fourier_grid(p, order, n)
+                assert( np.allclose(values, expected, atol=1e-12) )
+
+#==============================================================================
+def test_fourier_grid_2d():
+    domain = Domain('Omega', dim=2)
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    nx, ny = symbols('nx ny', integer=True)
+    tx, ty = symbols('tx ty')
+    c = Constant('c')
+
+    expr = dot(grad(v), grad(u)) + c*v*u + dx1(u)*v
+    expr = BilinearForm((u,v), integral(domain, expr))
+
+    # ... separable terms
+    terms = glt_terms(gelatize(expr), dim=2)
+    assert( len(terms) == 4 )
+    assert( dict((t.factors, t.coeff) for t in terms)[((1,), (0,))] == I/ny )
+    # ...
+
+    # ... tensor grid
+    degrees = [3, 2]
+    ns      = [16, 8]
+
+    samples = sample_fourier_grid_terms(terms, 2, degrees, ns)
+    samples = [(coeff.subs({nx: 16, ny: 8, c: 2}), fs) for coeff, fs in samples]
+    values  = outer_product(samples, (17, 9), dtype=complex)
+
+    symbol = gelatize(expr, degrees=degrees, n_elements=ns, evaluate=True)
+    f = lambdify([tx, ty], symbol.subs(c, 2), 'numpy')
+
+    x, y = np.meshgrid(numeric.fourier_grid(16), numeric.fourier_grid(8),
+                       indexing='ij')
+    assert( np.allclose(values, f(x, y)) )
+    # ...
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
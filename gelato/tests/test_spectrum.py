@@ -0,0 +1,122 @@
+# coding: utf-8
+
+import numpy as np
+from scipy.linalg import toeplitz, eigvalsh
+
+from sympde.calculus import grad, dot
+from sympde.topology import dx1, dx2
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+from gelato import GltExpr
+from gelato import predict_eigenvalues
+from gelato.tables import series_coefficients
+
+#==============================================================================
+def toeplitz_matrix(p, order, n):
+    # the symmetric Toeplitz matrix of the symbol of an even order
+    c = series_coefficients(p, order)
+
+    column = np.zeros(n)
+    column[:p+1] = c
+    column[1:p+1] /= 2
+
+    return toeplitz(column)
+
+#==============================================================================
+def test_predict_eigenvalues_1d():
+    domain = Domain('Omega', dim=1)
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    a = BilinearForm((u,v), integral(domain, dot(grad(v), grad(u))))
+
+    p = 3
+    n = 200
+
+    values   = predict_eigenvalues(a, p, n)
+    expected = n * eigvalsh(toeplitz_matrix(p, 2, n))
+
+    assert( values.shape == (n,) )
+    assert( np.all(np.diff(values) >= 0) )
+    assert( np.max(abs(values - expected)) < 1e-2 * expected.max() )
+
+#==============================================================================
+def test_predict_eigenvalues_2d():
+    domain = Domain('Omega', dim=2)
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    a = BilinearForm((u,v), integral(domain, dot(grad(v), grad(u)) + u*v))
+    glt = GltExpr(a)
+
+    degrees    = [2,3]
+    n_elements = [30,40]
+
+    # ... sum of Kronecker products of the 1d matrices
+    M1 = toeplitz_matrix(2, 0, 30) / 30 ; S1 = toeplitz_matrix(2, 2, 30) * 30
+    M2 = toeplitz_matrix(3, 0, 40) / 40 ; S2 = toeplitz_matrix(3, 2, 40) * 40
+
+    A = np.kron(S1, M2) + np.kron(M1, S2) + np.kron(M1, M2)
+    expected = eigvalsh(A)
+    # ...
+
+    out    = np.empty(1200)
+    values = predict_eigenvalues(glt, degrees, n_elements, out=out)
+
+    assert( np.shares_memory(values, out) )
+    assert( np.max(abs(values - expected)) < 3e-2 * expected.max() )
+
+    # ... partial spectrum
+    smallest = predict_eigenvalues(glt, degrees, n_elements, k=10)
+    largest  = predict_eigenvalues(glt, degrees, n_elements, k=10, which='largest')
+
+    assert( np.allclose(smallest, values[:10]) )
+    assert( np.allclose(largest,  values[-10:]) )
+    # ...
+
+#==============================================================================
+def test_predict_eigenvalues_variable():
+    domain = Domain('Omega', dim=2)
+    x, y   = domain.coordinates
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    expr = (1 + x*y)*dx1(v)*dx1(u) + (1 + x*y)*dx2(v)*dx2(u)
+    a = BilinearForm((u,v), integral(domain, expr))
+
+    values = predict_eigenvalues(a, 2, 64)
+    assert( values.shape == (64**2,) )
+    assert( np.all(np.diff(values) >= 0) )
+
+    # ... the coefficient is between 1 and 2
+    b = BilinearForm((u,v), integral(domain, dot(grad(v), grad(u))))
+    lower = predict_eigenvalues(b, 2, 64)
+
+    assert( values[-1] <= 2 * lower[-1] * (1 + 1e-12) )
+    assert( values[-1] >= lower[-1] )
+
+    smallest = predict_eigenvalues(a, 2, 64, k=5)
+    assert( np.allclose(smallest, values[:5]) )
+    # ...
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
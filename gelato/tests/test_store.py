@@ -0,0 +1,94 @@
+# coding: utf-8
+
+import os
+import json
+import tempfile
+from multiprocessing import Pool
+
+from gelato.bspline import glt_coefficients
+from gelato.store import TableStore, STORE_VERSION
+
+#==============================================================================
+def _compute(args):
+    directory, p = args
+    TableStore(directory).compute(p, 2)
+
+#==============================================================================
+def test_store_1():
+    with tempfile.TemporaryDirectory() as directory:
+        store = TableStore(directory)
+
+        assert( store.get(10, 0) is None )
+        assert( store.compute(10, 0) == glt_coefficients(10, 0) )
+
+        # ... a new store reads the values from the disk
+        assert( TableStore(directory).get(10, 0) == glt_coefficients(10, 0) )
+        # ...
+
+        # ... one file per derivative order
+        store.compute(10, 2)
+        names = sorted(i for i in os.listdir(directory) if i.endswith('.json'))
+        assert( names == ['glt_order_0.v{}.json'.format(STORE_VERSION),
+                          'glt_order_2.v{}.json'.format(STORE_VERSION)] )
+        # ...
+
+#==============================================================================
+def test_store_versioning():
+    with tempfile.TemporaryDirectory() as directory:
+        store = TableStore(directory)
+        store.compute(9, 1)
+
+        # ... files with another version are ignored
+        with open(store.filename(1), 'r') as f:
+            data = json.load(f)
+
+        data['version'] = STORE_VERSION + 1
+        with open(store.filename(1), 'w') as f:
+            json.dump(data, f)
+
+        assert( TableStore(directory).get(9, 1) is None )
+        # ...
+
+#==============================================================================
+def test_store_concurrent():
+    with tempfile.TemporaryDirectory() as directory:
+        degrees = list(range(9, 21))
+
+        with Pool(4) as pool:
+            pool.map(_compute, [(directory, p) for p in degrees])
+
+        store = TableStore(directory)
+        for p in degrees:
+            assert( store.get(p, 2) == glt_coefficients(p, 2) )
+
+#==============================================================================
+def test_store_warm():
+    with tempfile.TemporaryDirectory() as directory:
+        store = TableStore(directory)
+        store.warm(3, orders=[0, 4])
+
+        assert( store.get(3, 0) == glt_coefficients(3, 0) )
+        assert( store.get(2, 4) == glt_coefficients(2, 4) )
+        assert( store.get(1, 4) is None )
+
+        # ... a single write per derivative order
+        writes = []
+        class CountingStore(TableStore):
+            def _write(self, order, tables):
+                writes.append(order)
+                TableStore._write(self, order, tables)
+
+        CountingStore(directory).warm(8, orders=[0, 4])
+        assert( sorted(writes) == [0, 4] )
+        assert( TableStore(directory).get(8, 4) == glt_coefficients(8, 4) )
+
+        CountingStore(directory).warm(8, orders=[0, 4])
+        assert( sorted(writes) == [0, 4] )
+        # ...
+
+        store.clear()
+        assert( TableStore(directory).get(3, 0) is None )
+
+        # ... the lock files are kept
+        names = os.listdir(directory)
+        assert( names and all(i.endswith('.lock') for i in names) )
@@ -0,0 +1,78 @@
+# coding: utf-8
+
+import pytest
+import numpy as np
+
+from sympde.core import Constant
+from sympde.calculus import grad, dot
+from sympde.topology import dx1, dx2
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+from gelato import assemble
+from gelato import toeplitz_bands, toeplitz_matrix
+from gelato import ToeplitzOperator, toeplitz_operator
+
+#==============================================================================
+def test_toeplitz_operator_1d():
+    for p, orders in [(1, 0), (2, 1), (3, (0, 2))]:
+        a = toeplitz_bands(p, orders)
+
+        for n in [1, 3, 10]:
+            for periodic in [False, True]:
+                A = toeplitz_matrix(p, orders, n, periodic=periodic).toarray()
+                T = ToeplitzOperator([(1., [a])], (n,), periodic=periodic)
+
+                x = np.random.random(n)
+                assert( np.allclose(T @ x, A @ x) )
+                assert( np.allclose(T.H @ x, A.T @ x) )
+
+#==============================================================================
+@pytest.mark.parametrize('periodic', [False, True])
+def test_toeplitz_operator_2d(periodic):
+    domain = Domain('Omega', dim=2)
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    c = Constant('c')
+
+    expr = dot(grad(v), grad(u)) + dx1(u)*v + c*u*v + dx2(dx2(u))*dx2(dx2(v))
+    a = BilinearForm((u,v), integral(domain, expr))
+
+    degrees    = [2,3]
+    n_elements = [12,9]
+
+    A = assemble(a, degrees, n_elements, periodic=periodic, c=2.)
+    T = toeplitz_operator(a, degrees, n_elements, periodic=periodic, c=2.)
+
+    assert( T.shape == A.shape )
+    assert( T.dtype == np.float64 )
+
+    # ... single vectors, batches, complex vectors and adjoint
+    X = np.random.random((A.shape[0], 3))
+    scale = abs(A @ X).max()
+
+    assert( np.allclose(T @ X[:,0], A @ X[:,0], atol=1e-12*scale) )
+    assert( np.allclose(T @ X,      A @ X,      atol=1e-12*scale) )
+    assert( np.allclose(T.H @ X,    A.H @ X,    atol=1e-12*scale) )
+
+    z = X[:,0] + 1j * X[:,1]
+    assert( np.allclose(T @ z, A @ z, atol=1e-12*scale) )
+    # ...
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
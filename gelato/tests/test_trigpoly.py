@@ -0,0 +1,104 @@
+# coding: utf-8
+
+from fractions import Fraction
+
+import pytest
+import numpy as np
+
+from sympde.core import Constant
+from sympde.calculus import grad, dot
+from sympde.topology import dx1
+from sympde.topology import ScalarFunctionSpace
+from sympde.topology import Domain
+from sympde.topology import elements_of
+from sympde.expr import BilinearForm
+from sympde.expr import integral
+
+from gelato import gelatize, GltExpr
+from gelato import TrigPolynomial
+from gelato.numeric import glt_symbol
+
+#==============================================================================
+def test_trig_polynomial_1d():
+    t = np.linspace(-np.pi, np.pi, 9)
+
+    for p in [1, 2, 3]:
+        for order in range(0, 2*p+1):
+            f = TrigPolynomial.symbol(p, order, exact=True)
+
+            assert( f.is_exact and f.is_real )
+            assert( f.degree == (p,) )
+            assert( np.allclose(f(t), glt_symbol(p, t, order)) )
+
+    # ... exact arithmetic
+    m = TrigPolynomial.symbol(2, 0, exact=True)
+    s = TrigPolynomial.symbol(2, 2, exact=True)
+
+    f = 3 * m * s - Fraction(1, 2)
+    assert( f.is_exact and f.degree == (4,) )
+    assert( isinstance(f.real[4], Fraction) )
+    assert( np.allclose(f(t), 3*glt_symbol(2, t, 0)*glt_symbol(2, t, 2) - 0.5) )
+
+    assert( m * s == s * m )
+    assert( (m + s) - s == m )
+    assert( m**2 == m * m )
+    # ...
+
+    # ... the advection symbol is real, i times it is not
+    a = TrigPolynomial.symbol(2, 1)
+    b = 1j * a
+    assert( a.is_real and not b.is_real )
+    assert( np.allclose(b.conjugate()(t), np.conj(b(t))) )
+    assert( np.allclose((b * b.conjugate())(t), a(t)**2) )
+    # ...
+
+#==============================================================================
+def test_trig_polynomial_2d():
+    domain = Domain('Omega', dim=2)
+
+    V = ScalarFunctionSpace('V', domain)
+
+    u,v = elements_of(V, names='u,v')
+
+    c = Constant('c')
+
+    a = BilinearForm((u,v), integral(domain, dot(grad(v), grad(u)) + dx1(u)*v + c*u*v))
+
+    degrees    = [2,3]
+    n_elements = [8,10]
+
+    tx = np.linspace(0., np.pi, 7)
+    ty = np.linspace(0., np.pi, 6)
+
+    f = GltExpr(a).compile(degrees=degrees, n_elements=n_elements)
+    expected = f(tx=tx[:,None], ty=ty[None,:], c=2.)
+
+    g = GltExpr(a).trig_polynomial(degrees, n_elements, c=2.)
+    assert( g.degree == (2, 3) and not g.is_exact )
+    assert( not g.is_real )
+
+    assert( np.allclose(g(tx[:,None], ty[None,:]), expected) )
+    assert( np.allclose(g.grid([tx, ty]), expected) )
+
+    # ... gelatize gives the exact polynomial, without constants
+    b = BilinearForm((u,v), integral(domain, dot(grad(v), grad(u)) + dx1(u)*v))
+    h = gelatize(b, degrees=degrees, n_elements=n_elements, output='trigpoly')
+    assert( h.is_exact )
+
+    f = GltExpr(b).compile(degrees=degrees, n_elements=n_elements)
+    assert( np.allclose(h.grid([tx, ty]), f(tx=tx[:,None], ty=ty[None,:])) )
+
+    with pytest.raises(NotImplementedError):
+        gelatize(a, degrees=degrees, n_elements=n_elements, output='trigpoly')
+
+#==============================================================================
+# CLEAN UP SYMPY NAMESPACE
+#==============================================================================
+
+def teardown_module():
+    from sympy import cache
+    cache.clear_cache()
+
+def teardown_function():
+    from sympy import cache
+    cache.clear_cache()
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module applies the operator of a gelatized form without any matrix.
+
+Every term of the operator is a Kronecker product of banded Toeplitz
+matrices (see gelato.assembly). A Toeplitz matrix of size n and half
+bandwidth m is the leading block of a circulant matrix of size L >= n + m,
+which is diagonalized by the FFT. The operator is then
+
+    y = R F^{-1} (Lambda * F (P x))
+
+where P pads every axis with zeros up to L, F is the multi-dimensional real
+FFT, R restricts to the leading block and Lambda, the sum over the terms of
+the tensor products of the 1d eigenvalues, is computed once. A product costs
+one forward and one backward FFT, whatever the number of terms, hence
+O(N log N) operations and O(N) memory for N unknowns.
+"""
+
+import numpy as np
+
+from scipy.fftpack import next_fast_len
+from scipy.sparse.linalg import LinearOperator
+
+from .assembly import toeplitz_bands, _operator_terms
+
+__all__ = ('ToeplitzOperator',
+           'toeplitz_operator')
+
+#==============================================================================
+def _embedding(bands, length):
+    """
+    Returns the first column of the circulant matrix of the given size whose
+    leading block is the Toeplitz matrix of the bands (a_{-m}, ..., a_m).
+    Bands longer than the size are wrapped around.
+    """
+    m = len(bands) // 2
+
+    column = np.zeros(length, dtype=bands.dtype)
+    np.add.at(column, np.arange(-m, m+1) % length, bands)
+
+    return column
+
+#==============================================================================
+class ToeplitzOperator(LinearOperator):
+    """
+    A sum of Kronecker products of Toeplitz matrices, applied by FFTs, as a
+    LinearOperator. The unknowns are ordered as in numpy.kron, the last axis
+    being the fastest.
+
+    terms: list
+        list of (coeff, [a_1, ..., a_d]), a_i being the bands
+        (a_{-m}, ..., a_m) of the Toeplitz matrix of the axis i, see
+        gelato.assembly.toeplitz_bands, or None for the identity
+
+    grid_shape: tuple
+        number of unknowns per axis
+
+    periodic: bool
+        if True, the matrices are circulant and no padding is needed
+    """
+
+    def __init__(self, terms, grid_shape, periodic=False):
+        grid_shape = tuple(int(n) for n in grid_shape)
+        dim = len(grid_shape)
+
+        terms = [(c, [None if a is None else np.asarray(a) for a in bands])
+                 for c,bands in terms]
+        if not terms:
+            raise ValueError('> Expecting at least one term')
+
+        # ... padded sizes, enough to avoid the wrap around of the bands
+        if periodic:
+            lengths = grid_shape
+
+        else:
+            widths = [0]*dim
+            for c, bands in terms:
+                for axis, a in enumerate(bands):
+                    if not( a is None ):
+                        widths[axis] = max(widths[axis], len(a) // 2)
+
+            lengths = tuple(next_fast_len(n + m) for n,m in zip(grid_shape, widths))
+        # ...
+
+        is_complex = any(np.iscomplexobj(np.asarray(c)) for c,bands in terms)
+        dtype = np.dtype(complex if is_complex else float)
+
+        self._grid     = grid_shape
+        self._lengths  = lengths
+        self._terms    = terms
+        self._periodic = periodic
+        self._real     = not is_complex
+
+        # ... eigenvalues of every distinct circulant matrix, computed once
+        def transform(column, axis):
+            if self._real and axis == dim - 1:
+                return np.fft.rfft(column)
+
+            return np.fft.fft(column)
+
+        eigenvalues = {}
+        def _eigenvalues(axis, a):
+            key = (axis, a.tobytes())
+            if not( key in eigenvalues ):
+                column = _embedding(a, lengths[axis])
+                eigenvalues[key] = transform(column, axis)
+            return eigenvalues[key]
+
+        shape = list(lengths)
+        if self._real:
+            shape[-1] = lengths[-1] // 2 + 1
+
+        symbol = np.zeros(tuple(shape), dtype=complex)
+        for c, bands in terms:
+            value = np.asarray(c, dtype=complex)
+            for axis, a in enumerate(bands):
+                if a is None:
+                    continue
+
+                index = [None]*dim
+                index[axis] = slice(None)
+                value = value * _eigenvalues(axis, a)[tuple(index)]
+
+            symbol += value
+
+        self._symbol = symbol
+        # ...
+
+        size = int(np.prod(grid_shape))
+        super().__init__(dtype, (size, size))
+
+    @property
+    def terms(self):
+        return self._terms
+
+    @property
+    def grid_shape(self):
+        """Number of unknowns per axis."""
+        return self._grid
+
+    @property
+    def padded_shape(self):
+        """Sizes of the circulant embeddings."""
+        return self._lengths
+
+    def _apply(self, x):
+        """x has the shape of the grid, plus a trailing batch axis."""
+        dim  = len(self._grid)
+        axes = list(range(dim))
+
+        # ... zero padding
+        if self._lengths == self._grid:
+            z = x
+
+        else:
+            z = np.zeros(self._lengths + x.shape[-1:], dtype=x.dtype)
+            z[tuple(slice(0, n) for n in self._grid)] = x
+        # ...
+
+        symbol = self._symbol[..., None]
+        restrict = tuple(slice(0, n) for n in self._grid)
+
+        if self._real and not np.iscomplexobj(x):
+            z = np.fft.rfftn(z, axes=axes)
+            z *= symbol
+            z = np.fft.irfftn(z, s=self._lengths, axes=axes)
+
+            return z[restrict]
+
+        if self._real:
+            return self._apply(x.real) + 1j * self._apply(x.imag)
+
+        z = np.fft.fftn(z, axes=axes)
+        z *= symbol
+        z = np.fft.ifftn(z, axes=axes)
+
+        return z[restrict]
+
+    def _matmat(self, X):
+        X = np.asarray(X)
+        k = X.shape[1]
+
+        Y = self._apply(X.reshape(self._grid + (k,)))
+
+        return Y.reshape((self.shape[0], k))
+
+    def _matvec(self, x):
+        x = np.asarray(x)
+
+        return self._matmat(x.reshape((-1, 1))).reshape(x.shape)
+
+    def _adjoint(self):
+        terms = [(np.conj(c), [None if a is None else np.conj(a[::-1])
+                               for a in bands])
+                 for c,bands in self._terms]
+
+        return ToeplitzOperator(terms, self._grid, periodic=self._periodic)
+
+#==============================================================================
+def toeplitz_operator(glt, degrees, n_elements, periodic=False, **values):
+    """
+    Returns the matrix-free operator whose symbol is the gelatized form, as
+    a ToeplitzOperator. It is the operator of gelato.assembly.assemble,
+    applied with FFTs in O(N log N) operations, for N unknowns.
+
+    glt: GltExpr, BilinearForm
+        the form, with constant coefficients
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    n_elements: int, list, tuple
+        number of elements for every axis
+
+    periodic: bool
+        if True, the 1d matrices are circulant
+
+    values: dict
+        values of the constants, given by name
+
+    Examples
+
+    >>> A = toeplitz_operator(a, degrees=[3,3,3], n_elements=[256,256,256])
+    >>> Y = A @ X
+    """
+    degrees, n_elements, terms = _operator_terms(glt, degrees, n_elements,
+                                                 values)
+
+    bands = {}
+    def _bands(p, orders):
+        key = (p, orders)
+        if not( key in bands ):
+            bands[key] = toeplitz_bands(p, orders)
+        return bands[key]
+
+    operators = []
+    for c, factors in terms:
+        operators.append((c, [_bands(p, orders) if orders else None
+                              for p, orders in zip(degrees, factors)]))
+
+    return ToeplitzOperator(operators, n_elements, periodic=periodic)
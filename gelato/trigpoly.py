@@ -0,0 +1,457 @@
+# -*- coding: utf-8 -*-
+#
+#
+
+"""This module contains a compact representation of the GLT symbols as
+multivariate trigonometric polynomials.
+
+A polynomial of degree (m_1, ..., m_d) is stored as the dense tensor of its
+Fourier coefficients
+
+    f(t) = sum_k c_k exp(i k.t),    -m_j <= k_j <= m_j
+
+given by two arrays, the real and imaginary parts of c, of shape
+(2 m_1 + 1, ..., 2 m_d + 1). The cosine part of f corresponds to the even
+part of the real array and the sine part to the odd part of the imaginary
+array. The arrays are either exact, as object arrays of Fractions, or
+float64. Sums pad the arrays, products are convolutions of the coefficients
+and the conjugate reverses the arrays; no sympy expression is built.
+"""
+
+from fractions import Fraction
+from numbers import Number, Rational as RationalNumber
+
+import numpy as np
+
+from sympy import Rational
+from sympy import Basic
+
+from .tables    import check_order, exact_table
+from .separable import glt_terms, _as_list
+
+__all__ = ('TrigPolynomial',
+           'trig_polynomial')
+
+#==============================================================================
+def _as_number(v, exact):
+    """Converts a real number to a Fraction if exact, otherwise to a float."""
+    if isinstance(v, Basic):
+        if exact and isinstance(v, Rational):
+            return Fraction(int(v.p), int(v.q))
+
+        v = float(v)
+
+    if exact and isinstance(v, RationalNumber):
+        return Fraction(v)
+
+    return float(v)
+
+def _split(v):
+    """Returns the real and imaginary parts of a python or sympy number."""
+    if isinstance(v, Basic):
+        re, im = v.as_real_imag()
+        if re.free_symbols or im.free_symbols:
+            raise ValueError('> Expecting a number, given {}'.format(v))
+
+        return re, im
+
+    if isinstance(v, complex):
+        return v.real, v.imag
+
+    if not isinstance(v, Number):
+        raise TypeError('> Expecting a number, given {}'.format(type(v)))
+
+    return v, 0
+
+def _is_exact(v):
+    return isinstance(v, (RationalNumber, Rational))
+
+def _array(a, exact):
+    if exact:
+        a = np.asarray(a, dtype=object)
+        return np.vectorize(lambda v: _as_number(v, True), otypes=[object])(a)
+
+    return np.asarray(a, dtype=float)
+
+def _convolve(a, b):
+    """Full n-dimensional convolution of two coefficient arrays."""
+    shape = tuple(i + j - 1 for i,j in zip(a.shape, b.shape))
+    dtype = object if object in (a.dtype, b.dtype) else float
+
+    out = np.zeros(shape, dtype=dtype)
+    if dtype == object:
+        out[...] = Fraction(0)
+
+    # ... loop over the nonzero entries of the smallest array
+    if a.size > b.size:
+        a, b = b, a
+
+    for index in zip(*np.nonzero(a != 0)):
+        window = tuple(slice(i, i + n) for i,n in zip(index, b.shape))
+        out[window] += a[index] * b
+    # ...
+
+    return out
+
+def _pad(a, shape):
+    """Pads a coefficient array symmetrically to a larger shape."""
+    if a.shape == tuple(shape):
+        return a
+
+    widths = [((n - m) // 2,)*2 for m,n in zip(a.shape, shape)]
+    if a.dtype == object:
+        return np.pad(a, widths, constant_values=Fraction(0))
+
+    return np.pad(a, widths)
+
+def _powers(z, m):
+    """
+    Returns the list of z**j for j = -m, ..., m, by products, for |z| = 1.
+    """
+    powers = [np.ones_like(z)]
+    for j in range(m):
+        powers.append(powers[-1] * z)
+
+    return [np.conj(w) for w in powers[:0:-1]] + powers
+
+#==============================================================================
+class TrigPolynomial(object):
+    """
+    A multivariate trigonometric polynomial, given by the real and imaginary
+    parts of its Fourier coefficients.
+
+    real: numpy.ndarray
+        the real parts of the coefficients, whose shape is odd along every
+        axis, the coefficient of k = 0 being at the center
+
+    imag: numpy.ndarray
+        the imaginary parts of the coefficients, zero if None
+
+    exact: bool
+        if True, the coefficients are stored as Fractions, otherwise as
+        float64
+    """
+    __slots__ = ('_real', '_imag')
+
+    def __init__(self, real, imag=None, exact=False):
+        if imag is None:
+            imag = np.zeros(np.shape(real), dtype=int)
+
+        real = _array(real, exact)
+        imag = _array(imag, exact)
+
+        if not( real.shape == imag.shape ):
+            raise ValueError('> real and imag must have the same shape')
+
+        if not all(n % 2 == 1 for n in real.shape):
+            raise ValueError('> Expecting odd sizes, given {}'.format(real.shape))
+
+        self._real = real
+        self._imag = imag
+
+    @classmethod
+    def _new(cls, real, imag):
+        obj = cls.__new__(cls)
+        obj._real = real
+        obj._imag = imag
+        return obj
+
+    @classmethod
+    def constant(cls, value, dim=1, exact=False):
+        """Returns the constant polynomial of the given dimension."""
+        re, im = _split(value)
+        shape  = (1,)*dim
+
+        return cls(np.full(shape, _as_number(re, exact), dtype=object if exact else float),
+                   np.full(shape, _as_number(im, exact), dtype=object if exact else float),
+                   exact=exact)
+
+    @classmethod
+    def symbol(cls, p, order, axis=0, dim=1, exact=False):
+        """
+        Returns the 1d GLT symbol of degree p and a derivative order, as a
+        polynomial of dim variables depending on the given axis only.
+        """
+        p, order = check_order(p, order)
+
+        phi  = exact_table(p, order)
+        sign = (-1)**((order + 1) // 2)
+
+        real = [Fraction(0)] * (2*p + 1)
+        imag = [Fraction(0)] * (2*p + 1)
+
+        # ... 2 phi_i cos(i t) = phi_i (e^{it} + e^{-it})
+        #     2 phi_i sin(i t) = -i phi_i (e^{it} - e^{-it})
+        if order % 2 == 0:
+            real[p] = sign * phi[0]
+            for i in range(1, p+1):
+                real[p+i] = real[p-i] = sign * phi[i]
+
+        else:
+            for i in range(1, p+1):
+                imag[p+i] = - sign * phi[i]
+                imag[p-i] =   sign * phi[i]
+        # ...
+
+        shape = [1]*dim
+        shape[axis] = 2*p + 1
+
+        real = np.array(real, dtype=object).reshape(shape)
+        imag = np.array(imag, dtype=object).reshape(shape)
+
+        return cls(real, imag, exact=exact)
+
+    @property
+    def dim(self):
+        return self._real.ndim
+
+    @property
+    def shape(self):
+        return self._real.shape
+
+    @property
+    def degree(self):
+        """Degree of the polynomial in every variable."""
+        return tuple(n // 2 for n in self._real.shape)
+
+    @property
+    def real(self):
+        """Real parts of the coefficients."""
+        return self._real
+
+    @property
+    def imag(self):
+        """Imaginary parts of the coefficients."""
+        return self._imag
+
+    @property
+    def coefficients(self):
+        """The coefficients, as a complex array."""
+        return self._real.astype(float) + 1j * self._imag.astype(float)
+
+    @property
+    def is_exact(self):
+        return self._real.dtype == object
+
+    @property
+    def is_real(self):
+        """True if the polynomial takes real values."""
+        flip = tuple(slice(None, None, -1) for i in range(self.dim))
+
+        return (np.all(self._real == self._real[flip]) and
+                np.all(self._imag == - self._imag[flip]))
+
+    def evalf(self):
+        """Returns the polynomial with float64 coefficients."""
+        return TrigPolynomial._new(self._real.astype(float),
+                                   self._imag.astype(float))
+
+    # ... arithmetic
+    def _check(self, other):
+        if not( other.dim == self.dim ):
+            raise ValueError('> Expecting polynomials of dimension {}, '
+                             'given {}'.format(self.dim, other.dim))
+
+    def _scale(self, value):
+        re, im = _split(value)
+        exact  = self.is_exact and _is_exact(re) and _is_exact(im)
+
+        re = _as_number(re, exact)
+        im = _as_number(im, exact)
+
+        real, imag = (self._real, self._imag) if exact else (self._real.astype(float),
+                                                             self._imag.astype(float))
+
+        return TrigPolynomial._new(re * real - im * imag, re * imag + im * real)
+
+    def _cast(self, other):
+        # exact arithmetic only between exact polynomials
+        if self.is_exact and not other.is_exact:
+            return self.evalf(), other
+
+        if other.is_exact and not self.is_exact:
+            return self, other.evalf()
+
+        return self, other
+
+    def __add__(self, other):
+        if not isinstance(other, TrigPolynomial):
+            other = TrigPolynomial.constant(other, self.dim, exact=self.is_exact)
+
+        self._check(other)
+        a, b = self._cast(other)
+
+        shape = tuple(max(i, j) for i,j in zip(a.shape, b.shape))
+
+        return TrigPolynomial._new(_pad(a._real, shape) + _pad(b._real, shape),
+                                   _pad(a._imag, shape) + _pad(b._imag, shape))
+
+    __radd__ = __add__
+
+    def __neg__(self):
+        return TrigPolynomial._new(- self._real, - self._imag)
+
+    def __sub__(self, other):
+        return self + (- other)
+
+    def __rsub__(self, other):
+        return (- self) + other
+
+    def __mul__(self, other):
+        if not isinstance(other, TrigPolynomial):
+            return self._scale(other)
+
+        self._check(other)
+        a, b = self._cast(other)
+
+        # ... (a + ib)(c + id) = (ac - bd) + i(ad + bc)
+        real = _convolve(a._real, b._real) - _convolve(a._imag, b._imag)
+        imag = _convolve(a._real, b._imag) + _convolve(a._imag, b._real)
+        # ...
+
+        return TrigPolynomial._new(real, imag)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, TrigPolynomial):
+            return NotImplemented
+
+        re, im = _split(other)
+        if self.is_exact and _is_exact(re) and im == 0:
+            return self._scale(1 / _as_number(re, True))
+
+        return self._scale(1 / complex(other) if im else 1 / float(re))
+
+    def __pow__(self, n):
+        if not( isinstance(n, int) and n >= 0 ):
+            raise ValueError('> Expecting a nonnegative integer power')
+
+        result = TrigPolynomial.constant(1, self.dim, exact=self.is_exact)
+        for i in range(n):
+            result = result * self
+
+        return result
+
+    def conjugate(self):
+        """Returns the complex conjugate, c_k -> conj(c_{-k})."""
+        flip = tuple(slice(None, None, -1) for i in range(self.dim))
+
+        return TrigPolynomial._new(self._real[flip].copy(), - self._imag[flip])
+
+    def __eq__(self, other):
+        if not isinstance(other, TrigPolynomial) or not( other.dim == self.dim ):
+            return False
+
+        shape = tuple(max(i, j) for i,j in zip(self.shape, other.shape))
+
+        return (np.all(_pad(self._real, shape) == _pad(other._real, shape)) and
+                np.all(_pad(self._imag, shape) == _pad(other._imag, shape)))
+
+    __hash__ = None
+    # ...
+
+    # ... evaluation
+    def __call__(self, *ts):
+        """
+        Evaluates the polynomial on arrays of Fourier variables, broadcast
+        together. The values are real if the polynomial is real.
+        """
+        if not( len(ts) == self.dim ):
+            raise ValueError('> Expecting {} arrays, given {}'.format(self.dim, len(ts)))
+
+        ts = [np.asarray(t, dtype=float) for t in ts]
+        c  = self.coefficients
+
+        # ... exp(i k t) for every variable, by powers of exp(i t)
+        powers = [_powers(np.exp(1j * t), m) for t, m in zip(ts, self.degree)]
+
+        result = 0
+        for index in zip(*np.nonzero(c)):
+            value = c[index]
+            for z, k, m in zip(powers, index, self.degree):
+                if not( k == m ):
+                    value = value * z[k]
+
+            result = result + value
+        # ...
+
+        result = np.asarray(result, dtype=complex) + np.zeros(np.broadcast(*ts).shape)
+
+        return result.real if self.is_real else result
+
+    def grid(self, ts):
+        """
+        Evaluates the polynomial on the tensor product of 1d arrays of
+        Fourier variables, contracting the coefficients one axis at a time.
+        """
+        ts = _as_list(ts, self.dim)
+        if not( len(ts) == self.dim ):
+            raise ValueError('> Expecting {} arrays, given {}'.format(self.dim, len(ts)))
+
+        values = self.coefficients
+        for t, m in zip(ts, self.degree):
+            # ... the current first axis is contracted and moved last
+            e = np.exp(1j * np.outer(np.arange(-m, m+1), np.asarray(t, dtype=float)))
+            values = np.tensordot(values, e, axes=([0], [0]))
+
+        return values.real if self.is_real else values
+    # ...
+
+    def __repr__(self):
+        return 'TrigPolynomial(degree={}, exact={})'.format(self.degree,
+                                                            self.is_exact)
+
+#==============================================================================
+def trig_polynomial(expr, dim, degrees, exact=False, **values):
+    """
+    Returns the TrigPolynomial of a gelatized symbol, whose coefficients must
+    be numbers once the constants are given.
+
+    expr: sympy.Expr, list
+        the output of gelatize computed without degrees, with the numbers of
+        elements substituted, or its GltTerm
+
+    dim: int
+        the dimension of the form
+
+    degrees: int, list, tuple
+        spline degree for every axis
+
+    exact: bool
+        if True, the coefficients are Fractions
+
+    values: dict
+        values of the constants, given by name
+    """
+    terms   = expr if isinstance(expr, (list, tuple)) else glt_terms(expr, dim)
+    degrees = [int(i) for i in _as_list(degrees, dim)]
+
+    values  = {str(k): v for k,v in values.items()}
+
+    symbols = {}
+    def _symbol(axis, order):
+        key = (axis, order)
+        if not( key in symbols ):
+            symbols[key] = TrigPolynomial.symbol(degrees[axis], order, axis=axis,
+                                                 dim=dim, exact=exact)
+        return symbols[key]
+
+    result = TrigPolynomial.constant(0, dim, exact=exact)
+    for term in terms:
+        coeff = term.coeff.subs({s: values[str(s)]
+                                 for s in term.coeff.free_symbols
+                                 if str(s) in values})
+
+        if coeff.free_symbols:
+            raise NotImplementedError('Cannot convert {}, unknown symbols '
+                                      '{}'.format(term.coeff, coeff.free_symbols))
+
+        value = TrigPolynomial.constant(1, dim, exact=exact)
+        for axis, orders in enumerate(term.factors):
+            for order in orders:
+                value = value * _symbol(axis, order)
+
+        result = result + value * coeff.expand()
+
+    return result
@@ -1,14 +1,13 @@
 # -*- coding: utf-8 -*-
 #
 
-from sympy.core import Symbol
-from sympy import lambdify
-
 from numpy import linspace, pi
 from matplotlib import pyplot as plt
 
 from .glt import Stiffness
 
+__all__ = ('plot_stiffness_symbols',)
+
 
 def plot_stiffness_symbols(degrees=[2, 3], nx=100):
     """
@@ -25,18 +24,12 @@ def plot_stiffness_symbols(degrees=[2, 3], nx=100):
 
     for i,p in enumerate(degrees):
 
-        t = Symbol('t')
-
-        symbol = Stiffness(p, t)
-
-        # ... make the symbol a numeric function, that can be evaluated
-        f = lambdify(t, symbol, "numpy")
-
+        # ...
         t1 = linspace(-pi,pi, nx)
-        w = f(t1)
+        w = Stiffness.numeric(p, t1)
         # ...
 
-        plt.plot(t1, w.real, "-"+colors[i], label="$p=" + str(p) + "$")
+        plt.plot(t1, w, "-"+colors[i], label="$p=" + str(p) + "$")
 
     plt.xlabel('fequencies')
     plt.ylabel('$\mathfrak{s}_p$')
@@ -44,6 +44,10 @@ install_requires = [
     'sympde>=0.10',
 ]
 
+# ...
+entry_points = {'console_scripts': ['gelato-tables = gelato.store:main']}
+# ...
+
 # ...
 packages = find_packages(exclude=["*.tests", "*.tests.*", "tests.*", "tests"])
 # ...
@@ -53,6 +57,7 @@ def setup_package():
     setup(packages = packages,
           include_package_data = True,
           install_requires = install_requires,
+          entry_points = entry_points,
           zip_safe = True,
           **setup_args)
 